@@ -43,12 +43,31 @@ def create_app(config_name=None):
     # Apply security headers
     apply_security_headers(app)
 
+    # Request-scoped computation memo
+    from app.core.request_memo import init_request_memo
+    init_request_memo(app)
+
+    # Calculation history writer (sync, or batched write-behind)
+    from app.core.write_behind import calculation_recorder, comparison_recorder
+    from app.services.calculation_store import CalculationStore
+    calculation_recorder.init_app(app, CalculationStore.save_calculations)
+    comparison_recorder.init_app(app, CalculationStore.save_comparisons)
+
     # Register Blueprints
     register_blueprints(app)
 
     # Register Error Handlers
     register_error_handlers(app)
 
+    # Register CLI Commands
+    from app.cli import register_cli
+    register_cli(app)
+
+    # Precomputed annuity factors (shared copy-on-write after fork)
+    if app.config.get("ANNUITY_TABLE_PRELOAD"):
+        from app.services.annuity_table import AnnuityTable
+        AnnuityTable.load(app)
+
     # Setup Logging (Production Safe)
     configure_logging(app)
 
@@ -73,6 +92,11 @@ def register_blueprints(app):
     from app.routes.api.prepayment_api import prepayment_api_bp
     from app.routes.api.comparison_api import comparison_api_bp
     from app.routes.api.history_api import history_api_bp
+    from app.routes.api.schedule_api import schedule_api_bp
+    from app.routes.api.solver_api import solver_api_bp
+    from app.routes.api.stress_api import stress_api_bp
+    from app.routes.api.what_if_api import what_if_api_bp
+    from app.routes.api.analytics_api import analytics_api_bp
     from app.core.caching import init_cache
     
     init_cache(app)
@@ -88,6 +112,14 @@ def register_blueprints(app):
     app.register_blueprint(prepayment_api_bp, url_prefix="/api")
     app.register_blueprint(comparison_api_bp, url_prefix="/api")
     app.register_blueprint(history_api_bp, url_prefix="/api")
+    app.register_blueprint(schedule_api_bp, url_prefix="/api")
+    app.register_blueprint(solver_api_bp, url_prefix="/api")
+    app.register_blueprint(stress_api_bp, url_prefix="/api")
+
+    if app.config.get("ENABLE_WHAT_IF_SESSIONS", True):
+        app.register_blueprint(what_if_api_bp, url_prefix="/api")
+
+    app.register_blueprint(analytics_api_bp, url_prefix="/api")
 
 
 # ==========================================
@@ -0,0 +1,199 @@
+"""
+CLI Commands
+-------------
+Flask CLI commands for operational tasks.
+
+Usage:
+    flask annuity-table build [--path PATH]
+    flask offers load OFFERS.csv [--replace]
+    flask rollups rebuild [--days N]
+    flask rollups prune [--days N]
+"""
+
+import csv
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+
+annuity_table_cli = AppGroup("annuity-table", help="Precomputed annuity factor table.")
+
+
+@annuity_table_cli.command("build")
+@click.option("--path", default=None, help="Output .npy file (defaults to ANNUITY_TABLE_PATH).")
+def build_annuity_table(path):
+    """
+    Build the annuity factor table and save it for memory-mapping.
+    """
+    from app.services.annuity_table import AnnuityTable
+
+    path = path or current_app.config.get("ANNUITY_TABLE_PATH")
+
+    if not path:
+        raise click.UsageError("Set ANNUITY_TABLE_PATH or pass --path.")
+
+    shape = AnnuityTable.save(
+        path,
+        current_app.config["MAX_INTEREST_RATE"],
+        current_app.config["MAX_TENURE_MONTHS"]
+    )
+
+    click.echo(f"Wrote {shape[0]} x {shape[1]} annuity table to {path}")
+
+
+offers_cli = AppGroup("offers", help="Lender offer catalog.")
+
+OFFER_CSV_COLUMNS = (
+    "lender_name", "product_name", "min_amount", "max_amount",
+    "min_tenure_months", "max_tenure_months", "annual_interest_rate",
+    "processing_fee_percent", "processing_fee_flat",
+)
+
+
+def _parse_offer(row, max_rate, max_tenure):
+    """
+    One CSV row -> LenderOffer column dict. Raises ValueError.
+    """
+
+    lender_name = (row.get("lender_name") or "").strip()
+
+    if not lender_name:
+        raise ValueError("lender_name is required")
+
+    offer = {
+        "lender_name": lender_name,
+        "product_name": (row.get("product_name") or "").strip() or None,
+        "min_amount": round(float(row["min_amount"]), 2),
+        "max_amount": round(float(row["max_amount"]), 2),
+        "min_tenure_months": int(row["min_tenure_months"]),
+        "max_tenure_months": int(row["max_tenure_months"]),
+        "annual_interest_rate": round(float(row["annual_interest_rate"]), 2),
+        "processing_fee_percent": round(float(row.get("processing_fee_percent") or 0), 2),
+        "processing_fee_flat": round(float(row.get("processing_fee_flat") or 0), 2),
+        "currency": (row.get("currency") or "USD").strip().upper(),
+        "is_active": True,
+    }
+
+    if not 0 < offer["min_amount"] <= offer["max_amount"]:
+        raise ValueError("amount range is invalid")
+
+    if not 1 <= offer["min_tenure_months"] <= offer["max_tenure_months"] <= max_tenure:
+        raise ValueError("tenure range is invalid")
+
+    if not 0 <= offer["annual_interest_rate"] <= max_rate:
+        raise ValueError("annual_interest_rate is out of range")
+
+    if offer["processing_fee_percent"] < 0 or offer["processing_fee_flat"] < 0:
+        raise ValueError("fees must be zero or positive")
+
+    return offer
+
+
+@offers_cli.command("load")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--replace", is_flag=True, help="Deactivate all existing offers first.")
+def load_offers(path, replace):
+    """
+    Bulk-load lender offers from a CSV file (one insert).
+    """
+    from sqlalchemy import insert, update
+    from app.core.extensions import db
+    from app.models.lender_offer import LenderOffer
+    from app.services.offer_index import OfferIndex
+
+    config = current_app.config
+    offers, errors = [], []
+
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+
+        missing = set(OFFER_CSV_COLUMNS) - {"product_name", "processing_fee_percent",
+                                            "processing_fee_flat"} - set(reader.fieldnames or [])
+
+        if missing:
+            raise click.UsageError(f"Missing CSV columns: {', '.join(sorted(missing))}")
+
+        for line, row in enumerate(reader, start=2):
+            try:
+                offers.append(_parse_offer(
+                    row, config["MAX_INTEREST_RATE"], config["MAX_TENURE_MONTHS"]
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append(f"line {line}: {e}")
+
+    if errors:
+        raise click.ClickException(
+            f"{len(errors)} invalid rows, nothing loaded:\n" + "\n".join(errors[:20])
+        )
+
+    if replace:
+        db.session.execute(update(LenderOffer).values(is_active=False))
+
+    if offers:
+        db.session.execute(insert(LenderOffer), offers)
+
+    db.session.commit()
+    OfferIndex.invalidate()
+
+    click.echo(f"Loaded {len(offers)} offers from {path}")
+
+
+rollups_cli = AppGroup("rollups", help="Calculation analytics rollups and retention.")
+
+
+@rollups_cli.command("rebuild")
+@click.option("--days", type=int, default=None,
+              help="Days back to recompute (defaults to CALCULATION_RETENTION_DAYS).")
+def rebuild_rollups(days):
+    """
+    Recompute recent daily rollups from the raw calculation rows
+    (days already pruned are left as they are).
+    """
+    from datetime import datetime, timedelta
+    from app.services.rollup_service import RollupService
+
+    if days is None:
+        days = current_app.config["CALCULATION_RETENTION_DAYS"]
+    since = datetime.utcnow().date() - timedelta(days=days)
+
+    # Pruned days keep their rollups; rebuild starts at the first retained day
+    retained = RollupService.retained_since()
+
+    if retained is None:
+        click.echo("No raw calculation rows to rebuild from")
+        return
+
+    since = max(since, retained)
+    written = RollupService.rebuild(since)
+
+    click.echo(f"Rebuilt {written} rollup rows since {since.isoformat()}")
+
+
+@rollups_cli.command("prune")
+@click.option("--days", type=int, default=None,
+              help="Keep this many days of raw rows (defaults to CALCULATION_RETENTION_DAYS).")
+def prune_calculations(days):
+    """
+    Delete raw calculation rows past the retention window, and the
+    loan configurations no remaining row references.
+    """
+    from app.services.rollup_service import RollupService
+
+    if days is None:
+        days = current_app.config["CALCULATION_RETENTION_DAYS"]
+
+    try:
+        deleted = RollupService.prune(days)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    click.echo(f"Pruned {deleted} calculation rows older than {days} days")
+
+
+# ===============================
+# REGISTRATION
+# ===============================
+def register_cli(app):
+    app.cli.add_command(annuity_table_cli)
+    app.cli.add_command(offers_cli)
+    app.cli.add_command(rollups_cli)
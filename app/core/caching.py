@@ -8,19 +8,61 @@ Supports:
 - RedisCache (Production)
 - Config-driven setup
 - Utility decorator for manual caching
+- Canonical cache keys for numeric inputs
+- Bounded in-process LRU result caches with hit/miss counters
+- Bounded in-process LRU stores (configuration ids), with an
+  optional maximum entry age
+- Both share one LRUStore core
+- Session stores in the shared cache, so any worker can serve a
+  session (what-if sessions); production refuses to start on a
+  per-process backend
 """
 
+import threading
+import time
+from collections import OrderedDict
 from flask import current_app
 from app.core.extensions import cache
 
 
+# Backends that keep entries inside one process
+PER_PROCESS_CACHES = ("SimpleCache", "NullCache", "null", "simple")
+
+
+def check_session_backend(app):
+    """
+    Refuse to start when what-if sessions would live in a per-process
+    cache but REQUIRE_SHARED_SESSION_CACHE is set (production, where
+    several workers serve the same sessions).
+    """
+
+    config = app.config
+
+    if not (config.get("REQUIRE_SHARED_SESSION_CACHE") and config.get("ENABLE_WHAT_IF_SESSIONS")):
+        return
+
+    if config.get("CACHE_TYPE", "SimpleCache") in PER_PROCESS_CACHES:
+        raise RuntimeError(
+            f"CACHE_TYPE={config.get('CACHE_TYPE', 'SimpleCache')} keeps what-if sessions in "
+            "one worker. Use a shared backend (CACHE_TYPE=RedisCache with REDIS_URL, or "
+            "FileSystemCache with CACHE_DIR) or set ENABLE_WHAT_IF_SESSIONS=False."
+        )
+
+
 def init_cache(app):
     """
     Initialize cache with app config.
     """
 
+    check_session_backend(app)
     cache.init_app(app)
 
+    calculation_cache.resize(app.config.get("RESULT_CACHE_MAX_ENTRIES", 1024))
+    schedule_cache.resize(app.config.get("SCHEDULE_CACHE_MAX_ENTRIES", 256))
+    what_if_sessions.timeout = app.config.get("WHAT_IF_SESSION_TTL", 1800)
+    configuration_ids.resize(app.config.get("CONFIGURATION_ID_CACHE_ENTRIES", 10000))
+    configuration_ids.max_age = app.config.get("CONFIGURATION_ID_CACHE_SECONDS", 3600)
+
     app.logger.info("Caching system initialized.")
 
 
@@ -35,11 +77,45 @@ def cache_key_builder(*args, **kwargs):
     return "emi_cache:" + "|".join(key_parts)
 
 
+def canonical_number(value):
+    """
+    Canonical text for a numeric input, so that 1e6, 1000000
+    and "1000000.0" all produce the same cache key.
+    """
+    number = float(value)
+
+    if number.is_integer():
+        return str(int(number))
+
+    return repr(number)
+
+
+def canonical_key(namespace, *args, **kwargs):
+    """
+    cache_key_builder over canonicalized numeric arguments.
+    """
+
+    def canonical(value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return canonical_number(value)
+        return value
+
+    return cache_key_builder(
+        namespace,
+        *[canonical(arg) for arg in args],
+        **{k: canonical(v) for k, v in kwargs.items()}
+    )
+
+
 def clear_cache():
     """
     Clear all cache (admin usage).
     """
     cache.clear()
+    calculation_cache.clear()
+    schedule_cache.clear()
+    what_if_sessions.clear()
+    configuration_ids.clear()
 
 
 def get_cached_value(key):
@@ -54,4 +130,227 @@ def set_cached_value(key, value, timeout=None):
     Set cache value manually.
     """
     default_timeout = current_app.config.get("CACHE_DEFAULT_TIMEOUT", 300)
-    cache.set(key, value, timeout or default_timeout)
\ No newline at end of file
+    cache.set(key, value, timeout or default_timeout)
+
+
+_MISSING = object()
+
+
+class LRUStore:
+    """
+    Bounded in-process LRU, thread-safe; the core of ResultCache and
+    SessionStore. With max_age (seconds), entries older than that are
+    treated as missing.
+    """
+
+    def __init__(self, name, max_entries, max_age=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def resize(self, max_entries):
+        with self._lock:
+            self.max_entries = max_entries
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup(self, key):
+        """
+        Value for key (marked most recently used), or _MISSING.
+        Call with the lock held.
+        """
+
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return _MISSING
+
+        stored_at, value = entry
+
+        if self.max_age is not None and time.monotonic() - stored_at > self.max_age:
+            del self._entries[key]
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry[1] if entry is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ResultCache(LRUStore):
+    """
+    Bounded in-process LRU in front of the shared Flask-Caching store.
+
+    Lookups go local LRU -> shared cache -> compute. Computed values
+    are written to both tiers. Exceptions are never cached.
+    """
+
+    def __init__(self, name, max_entries):
+        super().__init__(name, max_entries)
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute, timeout=None):
+        with self._lock:
+            value = self._lookup(key)
+
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+
+        value = get_cached_value(key)
+
+        if value is not None:
+            with self._lock:
+                self.shared_hits += 1
+            self._store(key, value)
+            return value
+
+        with self._lock:
+            self.misses += 1
+
+        value = compute()
+
+        self._store(key, value)
+        set_cached_value(key, value, timeout)
+
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+class SessionStore(LRUStore):
+    """
+    Bounded in-process LRU of per-user state.
+
+    Unlike ResultCache, entries are never written to the shared
+    cache: they hold live objects and belong to this process only.
+    """
+
+    def __init__(self, name, max_entries, max_age=None):
+        super().__init__(name, max_entries, max_age)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._lookup(key)
+
+            if value is _MISSING:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        self._store(key, value)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class SharedSessionStore:
+    """
+    Per-user state kept in the shared Flask-Caching store.
+
+    Every worker sees every session, so requests need no sticky
+    routing (with a per-process backend such as SimpleCache, only
+    one worker does). Entries expire `timeout` seconds after their
+    last write; the backend's own limit (CACHE_THRESHOLD, Redis
+    maxmemory) bounds how many are kept.
+    """
+
+    def __init__(self, name, timeout):
+        self.name = name
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key):
+        return cache_key_builder("session", self.name, key)
+
+    def get(self, key):
+        value = cache.get(self._key(key))
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return value
+
+    def put(self, key, value):
+        cache.set(self._key(key), value, self.timeout)
+
+    def pop(self, key):
+        value = cache.get(self._key(key))
+        cache.delete(self._key(key))
+        return value
+
+    def clear(self):
+        # Entries are namespaced in the shared store; clear_cache()
+        # empties it as a whole
+        pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "timeout": self.timeout,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# ==============================
+# RESULT CACHES
+# ==============================
+calculation_cache = ResultCache("calculation", 1024)
+schedule_cache = ResultCache("schedule", 256)
+what_if_sessions = SharedSessionStore("what_if", 1800)
+configuration_ids = SessionStore("configuration_ids", 10000, max_age=3600)
@@ -0,0 +1,174 @@
+"""
+Money Core
+-----------
+Shared minor-unit (paise / cents) arithmetic for all services.
+
+Provides:
+- Precomputed per-currency quantizers (incl. 0 and 3 decimal currencies)
+- Exact ROUND_HALF_UP from float to integer minor units
+- Exact rounding up (ceiling) for level payments, which must never
+  fall short of the exact annuity
+- Vectorized rounding for whole NumPy columns
+- Last-row residual adjustment so schedules reconcile exactly
+
+Rounding matches Decimal(value).quantize(..., ROUND_HALF_UP) on the
+exact binary value of the float, without allocating a Decimal.
+"""
+
+import numpy as np
+from flask import current_app
+
+
+# ISO 4217 minor-unit exponents that differ from the default of 2
+CURRENCY_EXPONENTS = {
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0,
+    "KMF": 0, "KRW": 0, "PYG": 0, "RWF": 0, "UGX": 0, "UYI": 0,
+    "VND": 0, "VUV": 0, "XAF": 0, "XOF": 0, "XPF": 0,
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3,
+    "TND": 3,
+}
+
+DEFAULT_EXPONENT = 2
+
+
+class Quantizer:
+    """
+    Converts between float amounts and integer minor units
+    for a fixed number of decimal places.
+    """
+
+    __slots__ = ("exponent", "scale", "_scale_float")
+
+    def __init__(self, exponent):
+        self.exponent = exponent
+        self.scale = 10 ** exponent
+        self._scale_float = float(self.scale)
+
+    # ===============================
+    # SCALAR
+    # ===============================
+    def to_minor_scalar(self, value):
+        """
+        Exact ROUND_HALF_UP of one float to integer minor units.
+        """
+        numerator, denominator = float(value).as_integer_ratio()
+        magnitude = (2 * abs(numerator) * self.scale + denominator) // (2 * denominator)
+        return magnitude if numerator >= 0 else -magnitude
+
+    def to_minor_ceil_scalar(self, value):
+        """
+        Exact ceiling of one float in integer minor units.
+        """
+        numerator, denominator = float(value).as_integer_ratio()
+        return -((-numerator * self.scale) // denominator)
+
+    def round(self, value):
+        """
+        Round one float, returning a float.
+        """
+        return self.to_minor_scalar(value) / self.scale
+
+    # ===============================
+    # VECTORIZED
+    # ===============================
+    def to_minor(self, values):
+        """
+        Exact ROUND_HALF_UP of a float array to int64 minor units.
+
+        The scaled product is split into hi + lo parts (Dekker) so that
+        values like 3.755 (stored as 3.75499...) are not rounded up.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        magnitude = np.abs(values)
+        scale = self._scale_float
+
+        scaled = magnitude * scale
+        split = 134217729.0 * magnitude
+        m_hi = split - (split - magnitude)
+        m_lo = magnitude - m_hi
+        error = (m_hi * scale - scaled) + m_lo * scale
+
+        whole = np.floor(scaled)
+        fraction = scaled - whole
+        round_up = (fraction > 0.5) | ((fraction == 0.5) & (error >= 0))
+
+        minor = (whole + round_up).astype(np.int64)
+        return np.where(values < 0, -minor, minor)
+
+    def to_minor_ceil(self, values):
+        """
+        Exact ceiling of a float array in int64 minor units.
+
+        Same hi + lo split as to_minor: a scaled product that lands on a
+        whole number only by rounding (exact value just above it) still
+        rounds up.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        scale = self._scale_float
+
+        scaled = values * scale
+        split = 134217729.0 * values
+        v_hi = split - (split - values)
+        v_lo = values - v_hi
+        error = (v_hi * scale - scaled) + v_lo * scale
+
+        whole = np.ceil(scaled)
+        return (whole + ((whole == scaled) & (error > 0))).astype(np.int64)
+
+    def from_minor(self, minor):
+        """
+        Integer minor units back to float amounts.
+        """
+        return np.asarray(minor, dtype=np.int64) / self._scale_float
+
+    def round_array(self, values):
+        """
+        Round a float array, returning floats.
+        """
+        return self.from_minor(self.to_minor(values))
+
+    def __repr__(self):
+        return f"<Quantizer 10^-{self.exponent}>"
+
+
+# ===============================
+# PRECOMPUTED QUANTIZERS
+# ===============================
+_BY_EXPONENT = {exponent: Quantizer(exponent) for exponent in range(0, 9)}
+
+_BY_CURRENCY = {
+    currency: _BY_EXPONENT[exponent]
+    for currency, exponent in CURRENCY_EXPONENTS.items()
+}
+
+
+def get_quantizer(currency=None):
+    """
+    Quantizer for a currency code.
+
+    Without a currency, uses the config DECIMAL_PRECISION.
+    """
+
+    if currency is None:
+        precision = current_app.config.get("DECIMAL_PRECISION", DEFAULT_EXPONENT)
+        return _BY_EXPONENT.get(precision) or Quantizer(precision)
+
+    return _BY_CURRENCY.get(currency.upper(), _BY_EXPONENT[DEFAULT_EXPONENT])
+
+
+def round_money(value, currency=None):
+    """
+    Round a single amount for display / storage.
+    """
+    return get_quantizer(currency).round(value)
+
+
+def reconcile_residual(column, total):
+    """
+    Fold the rounding residual into the last element so that
+    column.sum() == total exactly. Modifies and returns column.
+    """
+    if len(column):
+        column[-1] += total - int(column.sum())
+    return column
+
@@ -0,0 +1,94 @@
+"""
+Request Memo
+-------------
+Request-scoped memoization of pure engine calls.
+
+Within one request, identical sub-computations (the same EMI
+calculation requested by a route and again by a service) run once.
+
+Features:
+- Keys built from normalized arguments (canonical numbers, defaults
+  applied), so positional / keyword / 1e6-vs-1000000 calls collide
+- Stored on flask.g and reset at the start of every request
+- No-op outside a request (CLI, benchmarks)
+- Per-request counters, optionally echoed in an X-Compute-Memo header
+"""
+
+import functools
+import inspect
+from flask import g, has_request_context
+from app.core.caching import canonical_key
+
+
+def init_request_memo(app):
+    """
+    Reset the memo per request and optionally report its counters.
+    """
+
+    @app.before_request
+    def reset_request_memo():
+        g._request_memo = {}
+        g._request_memo_stats = {"computed": 0, "deduplicated": 0}
+
+    @app.after_request
+    def report_request_memo(response):
+        stats = memo_stats()
+
+        if stats and app.config.get("REQUEST_MEMO_HEADER"):
+            response.headers["X-Compute-Memo"] = \
+                f"computed={stats['computed']}; deduplicated={stats['deduplicated']}"
+
+        return response
+
+
+def memo_stats():
+    """
+    Counters for the current request (None outside a request).
+    """
+    if not has_request_context():
+        return None
+
+    return getattr(g, "_request_memo_stats", None)
+
+
+def request_memoized(namespace, copy=None):
+    """
+    Decorator: memoize a pure function for the current request.
+
+    Functions sharing a namespace must share a signature; they are
+    treated as the same computation. copy (e.g. dict) is applied to
+    every returned value so callers can mutate their result.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            memo = getattr(g, "_request_memo", None) if has_request_context() else None
+
+            if memo is None:
+                return fn(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = canonical_key(namespace, *bound.arguments.values())
+
+            stats = g._request_memo_stats
+
+            if key in memo:
+                stats["deduplicated"] += 1
+            else:
+                value = fn(*args, **kwargs)
+
+                # A nested call with the same namespace may have stored it
+                if key not in memo:
+                    memo[key] = value
+                    stats["computed"] += 1
+
+            value = memo[key]
+            return copy(value) if copy else value
+
+        return wrapper
+
+    return decorator
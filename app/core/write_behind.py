@@ -0,0 +1,259 @@
+"""
+Write-Behind Recorder
+----------------------
+Takes analytics rows (calculation history) off the request path.
+
+Features:
+- Optional (WRITE_BEHIND_ENABLED); when off, rows are inserted and
+  committed in the request exactly as before
+- Bounded in-process queue; a background thread hands it to the
+  writer one batch (multi-row INSERTs) at a time, on a size
+  (WRITE_BEHIND_BATCH_SIZE) or time (WRITE_BEHIND_FLUSH_SECONDS)
+  trigger
+- Remaining rows are drained at interpreter shutdown
+- Sampling (CALCULATION_SAMPLE_RATE, sampled recorders only): the
+  share of calls whose rows are persisted; a call's rows are kept or
+  dropped together, and kept rows carry sample_weight = 1 / rate so
+  counts can be scaled back up. Comparisons are never sampled: their
+  comparison_group_id is returned to the caller
+- A full queue falls back to a synchronous insert: rows are never
+  silently dropped
+- A failed batch is logged and counted; the worker keeps running
+
+The worker thread is started lazily in the process that records, so
+it survives gunicorn's fork after preload_app. Rows are stamped with
+created_at when recorded, not when flushed.
+"""
+
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from app.core.extensions import db
+
+
+class WriteBehindRecorder:
+
+    def __init__(self, name, sampled=True):
+        self.name = name
+        self.sampled = sampled
+        self.app = None
+        self.writer = None
+
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.batch_size = 500
+        self.flush_seconds = 2.0
+        self.queue_size = 10000
+
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+
+        self.recorded = 0
+        self.sampled_out = 0
+        self.flushed = 0
+        self.batches = 0
+        self.failed = 0
+        self.overflow = 0
+
+    def init_app(self, app, writer):
+        """
+        Bind to an app and a writer: a callable that persists a list
+        of row dicts and commits.
+        """
+
+        config = app.config
+
+        self.app = app
+        self.writer = writer
+
+        self.enabled = bool(config.get("WRITE_BEHIND_ENABLED", False))
+        self.sample_rate = float(config.get("CALCULATION_SAMPLE_RATE", 1.0)) if self.sampled else 1.0
+        self.batch_size = int(config.get("WRITE_BEHIND_BATCH_SIZE", 500))
+        self.flush_seconds = float(config.get("WRITE_BEHIND_FLUSH_SECONDS", 2.0))
+        self.queue_size = int(config.get("WRITE_BEHIND_QUEUE_SIZE", 10000))
+
+        if not 0 <= self.sample_rate <= 1:
+            raise ValueError("CALCULATION_SAMPLE_RATE must be between 0 and 1")
+
+        # One drain per recorder, however many apps are created
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    # ===============================
+    # RECORDING (request path)
+    # ===============================
+    def record(self, rows):
+        """
+        Persist rows (column dicts), now or in the background.
+
+        Returns the number of rows kept after sampling.
+        """
+
+        if not rows:
+            return 0
+
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            with self._lock:
+                self.sampled_out += len(rows)
+            return 0
+
+        # Each kept row stands for 1 / sample_rate calls
+        now = datetime.utcnow()
+        weight = 1 / self.sample_rate
+        rows = [{"created_at": now, "sample_weight": weight, **row} for row in rows]
+
+        with self._lock:
+            self.recorded += len(rows)
+
+        if not self.enabled:
+            self.writer(rows)
+            return len(rows)
+
+        self._ensure_worker()
+
+        for index, row in enumerate(rows):
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                # Back-pressure: write the rest in the request
+                with self._lock:
+                    self.overflow += len(rows) - index
+                self.writer(rows[index:])
+                break
+
+        return len(rows)
+
+    # ===============================
+    # BACKGROUND FLUSHING
+    # ===============================
+    def _ensure_worker(self):
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+
+            # A queue inherited through fork belongs to the parent
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                self._pid = os.getpid()
+
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=f"{self.name}-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def _take(self):
+        """
+        Next batch: up to batch_size rows, or whatever arrived within
+        flush_seconds of the first one.
+        """
+
+        try:
+            batch = [self._queue.get(timeout=self.flush_seconds)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_seconds
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                break
+
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take()
+
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        with self.app.app_context():
+            try:
+                self.writer(batch)
+            except Exception as e:
+                # Any error (not only SQLAlchemyError) must not kill the worker thread
+                db.session.rollback()
+                self.app.logger.exception(f"Write-behind flush failed ({len(batch)} rows): {str(e)}")
+
+                with self._lock:
+                    self.failed += len(batch)
+                return
+
+        with self._lock:
+            self.flushed += len(batch)
+            self.batches += 1
+
+    def flush(self):
+        """
+        Write everything queued so far, in the calling thread.
+        """
+
+        if self._queue is None or self._pid != os.getpid():
+            return
+
+        while True:
+            batch = []
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not batch:
+                return
+
+            self._flush(batch)
+
+    def shutdown(self):
+        """
+        Stop the worker and drain the queue (registered with atexit).
+        """
+
+        self._stop.set()
+
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_seconds + 5)
+
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "enabled": self.enabled,
+                "sampled": self.sampled,
+                "sample_rate": self.sample_rate,
+                "queued": self._queue.qsize() if self._queue is not None else 0,
+                "recorded": self.recorded,
+                "sampled_out": self.sampled_out,
+                "flushed": self.flushed,
+                "batches": self.batches,
+                "failed": self.failed,
+                "overflow": self.overflow,
+            }
+
+
+calculation_recorder = WriteBehindRecorder("calculations")
+comparison_recorder = WriteBehindRecorder("comparisons", sampled=False)
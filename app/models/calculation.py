@@ -1,18 +1,22 @@
 """
 Calculation Model
 ------------------
-Stores EMI calculations for:
+One row per EMI calculation event (thin event table).
 
+The loan itself lives once in loan_configurations; each event only
+records which configuration was calculated, by whom and when.
+Comparisons are stored once per comparison in loan_comparisons.
+
+Used for:
 - History tracking
 - User saved reports
 - Analytics
 - Future SaaS subscriptions
-- Loan comparison logging
 """
 
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import JSON
 from app.core.extensions import db
+from app.models.loan_configuration import LoanConfiguration
 
 
 class Calculation(db.Model):
@@ -24,25 +28,16 @@ class Calculation(db.Model):
     id = db.Column(db.Integer, primary_key=True)
 
     # ===============================
-    # LOAN DETAILS
-    # ===============================
-    principal = db.Column(db.Numeric(15, 2), nullable=False)
-    annual_interest_rate = db.Column(db.Numeric(5, 2), nullable=False)
-    tenure_months = db.Column(db.Integer, nullable=False)
-
-    emi = db.Column(db.Numeric(15, 2), nullable=False)
-    total_interest = db.Column(db.Numeric(15, 2), nullable=False)
-    total_payment = db.Column(db.Numeric(15, 2), nullable=False)
-
-    # ===============================
-    # OPTIONAL FEATURES
+    # LOAN CONFIGURATION
     # ===============================
-    currency = db.Column(db.String(10), default="USD")
-
-    prepayment_used = db.Column(db.Boolean, default=False)
-    prepayment_data = db.Column(JSON, nullable=True)
+    configuration_id = db.Column(
+        db.Integer,
+        db.ForeignKey("loan_configurations.id"),
+        nullable=False,
+        index=True
+    )
 
-    comparison_group_id = db.Column(db.String(50), nullable=True)
+    configuration = db.relationship(LoanConfiguration, lazy="joined")
 
     # ===============================
     # USER TRACKING
@@ -54,14 +49,19 @@ class Calculation(db.Model):
     # ===============================
     # METADATA
     # ===============================
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Calls this row stands for (1 / CALCULATION_SAMPLE_RATE when sampled)
+    sample_weight = db.Column(db.Float, nullable=False, default=1.0, server_default="1")
 
     # ===============================
     # INDEXES (Performance Boost)
     # ===============================
     __table_args__ = (
-        db.Index("idx_principal_rate", "principal", "annual_interest_rate"),
-        db.Index("idx_created_at", "created_at"),
+        # Keyset pagination order (newest first, id breaks ties)
+        db.Index("idx_created_at_id", "created_at", "id"),
+        # History filtered by IP, same order
+        db.Index("idx_ip_created_id", "ip_address", "created_at", "id"),
     )
 
     # ===============================
@@ -69,17 +69,11 @@ class Calculation(db.Model):
     # ===============================
     def to_dict(self):
         return {
+            **self.configuration.to_dict(),
             "id": self.id,
-            "principal": float(self.principal),
-            "annual_interest_rate": float(self.annual_interest_rate),
-            "tenure_months": self.tenure_months,
-            "emi": float(self.emi),
-            "total_interest": float(self.total_interest),
-            "total_payment": float(self.total_payment),
-            "currency": self.currency,
-            "prepayment_used": self.prepayment_used,
+            "configuration_id": self.configuration_id,
             "created_at": self.created_at.strftime("%d %b %Y"),
         }
 
     def __repr__(self):
-        return f"<Calculation {self.id} | EMI {self.emi}>"
\ No newline at end of file
+        return f"<Calculation {self.id} | configuration {self.configuration_id}>"
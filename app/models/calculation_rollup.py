@@ -0,0 +1,64 @@
+"""
+Calculation Rollup Model
+-------------------------
+Daily counts of calculations per dimension bucket, kept up to date as
+calculation events are written.
+
+One row per (day, dimension, bucket), e.g.
+    (2026-10-17, "tenure_months", "240") -> 1532 calculations
+
+Supports:
+- Popular amounts / rates / tenures / currencies per day or range
+- Daily totals (dimension "all")
+- Survives retention pruning of raw calculation rows
+- Counts scaled back up by the sampling weight of each event
+- SQLite + PostgreSQL compatible
+"""
+
+from app.core.extensions import db
+
+
+class CalculationRollup(db.Model):
+    __tablename__ = "calculation_rollups"
+
+    # ===============================
+    # PRIMARY KEY
+    # ===============================
+    id = db.Column(db.Integer, primary_key=True)
+
+    # ===============================
+    # GROUPING
+    # ===============================
+    day = db.Column(db.Date, nullable=False)
+    dimension = db.Column(db.String(20), nullable=False)
+    bucket = db.Column(db.String(32), nullable=False)
+
+    # ===============================
+    # AGGREGATES
+    # ===============================
+    # Estimated when sampling: the sum of the events' sample weights
+    calculations = db.Column(db.Numeric(20, 2), nullable=False, default=0)
+    principal_total = db.Column(db.Numeric(20, 2), nullable=False, default=0)
+
+    # ===============================
+    # INDEXES
+    # ===============================
+    __table_args__ = (
+        db.UniqueConstraint("day", "dimension", "bucket", name="uq_rollup_day_dimension_bucket"),
+        db.Index("idx_rollup_dimension_day", "dimension", "day"),
+    )
+
+    # ===============================
+    # SERIALIZATION METHOD
+    # ===============================
+    def to_dict(self):
+        return {
+            "day": self.day.isoformat(),
+            "dimension": self.dimension,
+            "bucket": self.bucket,
+            "calculations": round(float(self.calculations)),
+            "principal_total": float(self.principal_total),
+        }
+
+    def __repr__(self):
+        return f"<CalculationRollup {self.day} {self.dimension}={self.bucket} x{float(self.calculations):g}>"
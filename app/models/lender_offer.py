@@ -0,0 +1,76 @@
+"""
+Lender Offer Model
+-------------------
+Stores the catalog of lender offers used for offer matching.
+
+Each offer is eligible for an amount range and a tenure range,
+at a fixed annual rate plus processing fees.
+
+Supports:
+- Bulk loading from CSV (flask offers load)
+- Active / inactive offers
+- SQLite + PostgreSQL compatible
+"""
+
+from datetime import datetime
+from app.core.extensions import db
+
+
+class LenderOffer(db.Model):
+    __tablename__ = "lender_offers"
+
+    # ===============================
+    # PRIMARY KEY
+    # ===============================
+    id = db.Column(db.Integer, primary_key=True)
+
+    # ===============================
+    # LENDER
+    # ===============================
+    lender_name = db.Column(db.String(120), nullable=False, index=True)
+    product_name = db.Column(db.String(120), nullable=True)
+
+    # ===============================
+    # ELIGIBILITY RANGES
+    # ===============================
+    min_amount = db.Column(db.Numeric(15, 2), nullable=False)
+    max_amount = db.Column(db.Numeric(15, 2), nullable=False)
+    min_tenure_months = db.Column(db.Integer, nullable=False)
+    max_tenure_months = db.Column(db.Integer, nullable=False)
+
+    # ===============================
+    # PRICING
+    # ===============================
+    annual_interest_rate = db.Column(db.Numeric(5, 2), nullable=False)
+    processing_fee_percent = db.Column(db.Numeric(5, 2), nullable=False, default=0)
+    processing_fee_flat = db.Column(db.Numeric(15, 2), nullable=False, default=0)
+
+    currency = db.Column(db.String(10), default="USD")
+    is_active = db.Column(db.Boolean, nullable=False, default=True, index=True)
+
+    # ===============================
+    # METADATA
+    # ===============================
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # ===============================
+    # SERIALIZATION METHOD
+    # ===============================
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "lender_name": self.lender_name,
+            "product_name": self.product_name,
+            "min_amount": float(self.min_amount),
+            "max_amount": float(self.max_amount),
+            "min_tenure_months": self.min_tenure_months,
+            "max_tenure_months": self.max_tenure_months,
+            "annual_interest_rate": float(self.annual_interest_rate),
+            "processing_fee_percent": float(self.processing_fee_percent),
+            "processing_fee_flat": float(self.processing_fee_flat),
+            "currency": self.currency,
+            "is_active": self.is_active,
+        }
+
+    def __repr__(self):
+        return f"<LenderOffer {self.id} | {self.lender_name} {self.annual_interest_rate}%>"
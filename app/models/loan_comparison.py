@@ -4,7 +4,7 @@ Loan Comparison Model
 Stores structured loan comparison sessions.
 
 Supports:
-- Up to 3 loans per comparison
+- One row per comparison (ranked loans stored as JSON)
 - User tracking
 - IP tracking
 - Analytics-ready structure
@@ -72,5 +72,27 @@ class LoanComparison(db.Model):
             "created_at": self.created_at.strftime("%d %b %Y")
         }
 
+    def loan_rows(self):
+        """
+        Ranked loans in the calculation history format.
+        """
+        created_at = self.created_at.strftime("%d %b %Y")
+
+        return [
+            {
+                "loan_id": loan["loan_id"],
+                "principal": loan["principal"],
+                "annual_interest_rate": loan["rate"],
+                "tenure_months": loan["tenure"],
+                "emi": loan["emi"],
+                "total_interest": loan["total_interest"],
+                "total_payment": loan["total_payment"],
+                "currency": loan.get("currency", "USD"),
+                "prepayment_used": False,
+                "created_at": created_at,
+            }
+            for loan in self.loans_data
+        ]
+
     def __repr__(self):
         return f"<LoanComparison {self.comparison_group_id}>"
\ No newline at end of file
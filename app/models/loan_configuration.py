@@ -0,0 +1,120 @@
+"""
+Loan Configuration Model
+-------------------------
+Stores each distinct calculated loan once, keyed by a hash of its
+content. Calculation events reference a configuration instead of
+repeating the loan on every row.
+
+Supports:
+- Content-addressed deduplication (config_hash, unique)
+- Level and structured loans (normalized structure in the hash)
+- Plain and prepayment calculations (prepayment inputs in the hash;
+  prepayment_data keeps the simulated result, which they determine)
+- SQLite + PostgreSQL compatible
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from sqlalchemy import JSON
+from app.core.extensions import db
+
+
+class LoanConfiguration(db.Model):
+    __tablename__ = "loan_configurations"
+
+    # ===============================
+    # PRIMARY KEY
+    # ===============================
+    id = db.Column(db.Integer, primary_key=True)
+
+    # ===============================
+    # CONTENT HASH
+    # ===============================
+    config_hash = db.Column(db.String(64), nullable=False, unique=True)
+
+    # ===============================
+    # LOAN DETAILS
+    # ===============================
+    principal = db.Column(db.Numeric(15, 2), nullable=False)
+    annual_interest_rate = db.Column(db.Numeric(5, 2), nullable=False)
+    tenure_months = db.Column(db.Integer, nullable=False)
+    currency = db.Column(db.String(10), nullable=False, default="USD")
+
+    # Normalized repayment structure (None: level EMI)
+    structure = db.Column(JSON(none_as_null=True), nullable=True)
+
+    emi = db.Column(db.Numeric(15, 2), nullable=False)
+    total_interest = db.Column(db.Numeric(15, 2), nullable=False)
+    total_payment = db.Column(db.Numeric(15, 2), nullable=False)
+
+    # ===============================
+    # PREPAYMENT
+    # ===============================
+    prepayment_used = db.Column(db.Boolean, nullable=False, default=False)
+    prepayment_data = db.Column(JSON(none_as_null=True), nullable=True)
+
+    # ===============================
+    # METADATA
+    # ===============================
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # ===============================
+    # CONTENT HASH
+    # ===============================
+    @staticmethod
+    def content_hash(principal, annual_interest_rate, tenure_months,
+                     currency="USD", structure=None, prepayment=None):
+        """
+        SHA-256 of the canonical loan inputs.
+
+        Amounts are hashed as the exact float the engine computes with
+        (never rounded), so 1e6, 1000000 and Decimal("1000000.00") hash
+        alike while 8.125 and 8.13 do not: inputs that give different
+        results never share a configuration. structure is the
+        normalized structure, prepayment the simulation inputs (never
+        its results).
+
+        The "v2" prefix keeps these hashes apart from the 2-decimal
+        ones of older rows, which are simply no longer matched.
+        """
+
+        def amount(value):
+            return repr(float(value))
+
+        extra = {
+            key: value
+            for key, value in (("structure", structure), ("prepayment", prepayment))
+            if value is not None
+        }
+
+        payload = "|".join([
+            "v2",
+            amount(principal),
+            amount(annual_interest_rate),
+            str(int(tenure_months)),
+            currency or "USD",
+            json.dumps(extra, sort_keys=True, separators=(",", ":")) if extra else "",
+        ])
+
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    # ===============================
+    # SERIALIZATION METHOD
+    # ===============================
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "principal": float(self.principal),
+            "annual_interest_rate": float(self.annual_interest_rate),
+            "tenure_months": self.tenure_months,
+            "emi": float(self.emi),
+            "total_interest": float(self.total_interest),
+            "total_payment": float(self.total_payment),
+            "currency": self.currency,
+            "structure": self.structure,
+            "prepayment_used": self.prepayment_used,
+        }
+
+    def __repr__(self):
+        return f"<LoanConfiguration {self.id} | {self.config_hash[:12]}>"
@@ -0,0 +1,90 @@
+"""
+Analytics API Route
+--------------------
+Handles:
+
+GET /api/analytics/popular?dimension=principal&days=30&limit=10
+GET /api/analytics/daily?days=30
+
+Dimensions: principal (1-2-5 amount bands), annual_interest_rate
+(0.25% bands), tenure_months, currency.
+
+Both read the daily rollup table only, never the raw calculations,
+so the cost depends on the number of days asked for, not on how many
+calculations were recorded.
+"""
+
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.extensions import db, limiter
+from app.services.rollup_service import RollupService
+
+analytics_api_bp = Blueprint("analytics_api", __name__)
+
+MAX_DAYS = 366
+
+
+def _day_range():
+    """
+    (since, until) for the trailing ?days= window, today included.
+    """
+
+    days = int(request.args.get("days", 30))
+
+    if days < 1 or days > MAX_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_DAYS}")
+
+    until = datetime.utcnow().date()
+    return until - timedelta(days=days - 1), until
+
+
+@analytics_api_bp.route("/analytics/popular", methods=["GET"])
+@limiter.limit("30 per minute")
+def popular():
+    try:
+        since, until = _day_range()
+        dimension = request.args.get("dimension", "principal")
+        limit = min(max(int(request.args.get("limit", 10)), 1), 100)
+
+        return jsonify({
+            "dimension": dimension,
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+            "results": RollupService.popular(dimension, since, until, limit)
+        }), 200
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({"error": "Database error"}), 500
+
+    except Exception as e:
+        current_app.logger.error(f"Analytics API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+@analytics_api_bp.route("/analytics/daily", methods=["GET"])
+@limiter.limit("30 per minute")
+def daily():
+    try:
+        since, until = _day_range()
+
+        return jsonify({
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+            "results": RollupService.daily_totals(since, until)
+        }), 200
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({"error": "Database error"}), 500
+
+    except Exception as e:
+        current_app.logger.error(f"Analytics API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
@@ -10,17 +10,33 @@ Accepts:
     "loans": [
         {"principal": 1000000, "rate": 8.5, "tenure": 240},
         {"principal": 1000000, "rate": 8.2, "tenure": 240}
-    ]
+    ],
+    "top_k": 10,                  (optional, default: all)
+    "sort_by": "total_payment"    (optional: total_interest, emi)
 }
 
-Returns ranked comparison result.
+Returns ranked comparison result (2 up to MAX_COMPARISON_LOANS offers).
+
+POST /api/offers/match
+
+Accepts:
+{
+    "principal": 1000000,
+    "tenure": 240,
+    "currency": "USD",            (optional, default: USD)
+    "top_k": 10                   (optional, default: 10)
+}
+
+Returns catalog offers in that currency eligible for the loan, ranked
+by total cost (total payment + processing fees). apr is null when the
+fees are at least the principal.
 """
 
 import uuid
 from flask import Blueprint, request, jsonify, current_app
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.extensions import db, limiter
-from app.models.calculation import Calculation
+from app.core.write_behind import comparison_recorder
 from app.services.comparison_service import LoanComparisonService
 
 comparison_api_bp = Blueprint("comparison_api", __name__)
@@ -40,13 +56,24 @@ def compare_loans():
         if not isinstance(loans, list):
             return jsonify({"error": "Loans must be a list"}), 400
 
-        if len(loans) < 2 or len(loans) > 3:
-            return jsonify({"error": "Compare between 2 and 3 loans only"}), 400
+        max_loans = current_app.config.get("MAX_COMPARISON_LOANS", 3)
+
+        if len(loans) < 2 or len(loans) > max_loans:
+            return jsonify({"error": f"Compare between 2 and {max_loans} loans only"}), 400
+
+        if not all(isinstance(loan, dict) for loan in loans):
+            return jsonify({"error": "Each loan must be an object"}), 400
+
+        top_k = data.get("top_k")
 
         # ===============================
         # RUN COMPARISON ENGINE
         # ===============================
-        results = LoanComparisonService.compare(loans)
+        results = LoanComparisonService.compare(
+            loans,
+            top_k=int(top_k) if top_k is not None else None,
+            sort_by=data.get("sort_by", "total_payment")
+        )
 
         # ===============================
         # CREATE GROUP ID
@@ -54,30 +81,22 @@ def compare_loans():
         comparison_group_id = str(uuid.uuid4())
 
         # ===============================
-        # SAVE EACH LOAN RECORD
+        # SAVE COMPARISON
+        # (one loan_comparisons row per comparison)
         # ===============================
-        for r in results:
-            record = Calculation(
-                principal=r["principal"],
-                annual_interest_rate=r["rate"],
-                tenure_months=r["tenure"],
-                emi=r["emi"],
-                total_interest=r["total_interest"],
-                total_payment=r["total_payment"],
-                currency="USD",
-                comparison_group_id=comparison_group_id,
-                ip_address=request.remote_addr
-            )
-
-            db.session.add(record)
-
-        db.session.commit()
+        comparison_recorder.record([{
+            "comparison_group_id": comparison_group_id,
+            "loans_data": results,
+            "best_loan_id": results[0]["loan_id"] if results else None,
+            "ip_address": request.remote_addr
+        }])
 
         # ===============================
         # RESPONSE
         # ===============================
         return jsonify({
             "comparison_group_id": comparison_group_id,
+            "count": len(loans),
             "results": results
         }), 200
 
@@ -90,4 +109,43 @@ def compare_loans():
 
     except Exception as e:
         current_app.logger.error(f"Comparison API Error: {str(e)}")
-        return jsonify({"error": "Something went wrong"}), 500
\ No newline at end of file
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+@comparison_api_bp.route("/offers/match", methods=["POST"])
+@limiter.limit("30 per minute")
+def match_offers():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON body"}), 400
+
+        principal = float(data.get("principal", 0))
+        tenure = int(data.get("tenure", 0))
+        top_k = int(data.get("top_k", 10))
+        currency = str(data.get("currency", "USD")).upper()
+
+        if top_k < 1:
+            return jsonify({"error": "top_k must be at least 1"}), 400
+
+        offers, eligible = LoanComparisonService.match_offers(principal, tenure, top_k, currency)
+
+        return jsonify({
+            "principal": principal,
+            "tenure": tenure,
+            "currency": currency,
+            "eligible_count": eligible,
+            "offers": offers
+        }), 200
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({"error": "Database error"}), 500
+
+    except Exception as e:
+        current_app.logger.error(f"Offer Match API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
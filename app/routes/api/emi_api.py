@@ -3,24 +3,41 @@ EMI API Route
 --------------
 Handles:
 
-POST /api/calculate-emi
+POST /api/calculate-emi             (optional "structure": step-up, balloon, ...)
+POST /api/calculate-emi/stream?format=ndjson|csv  (honors "structure"; USD only)
+POST /api/calculate-emi/batch
+POST /api/calculate-emi/floating
+GET  /api/calculate-emi/cache-stats  (debug mode only)
 
 Responsibilities:
 - Validate inputs
 - Perform EMI calculation
 - Generate amortization schedule
 - Optional currency conversion
-- Save to database
+- Save to database (directly, or batched write-behind)
 - Return structured JSON
+- Stream schedule rows (NDJSON / CSV) in constant memory
+- Reuse cached results for repeated loan inputs
+- Price many loans per request with one multi-row insert
+- Floating-rate schedules from a rate path:
+  {"principal", "rate", "tenure", "rate_path": [[12, 9.0], [36, 8.25]],
+   "recompute": "emi" | "tenure", "max_tenure": 360, "include_schedule": true}
 """
 
-from flask import Blueprint, request, jsonify, current_app
+import json
+from flask import Blueprint, abort, request, jsonify, current_app, stream_with_context
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.extensions import db, limiter
-from app.models.calculation import Calculation
-from app.services.emi_engine import EMIEngine
+from app.core.write_behind import calculation_recorder
 from app.services.amortization_service import AmortizationService
+from app.services.amortization_schedule import AmortizationSchedule
+from app.services.batch_pricing_service import BatchPricingService
+from app.services.calculation_cache import CalculationCache
 from app.services.currency_service import CurrencyService
+from app.services.floating_rate_service import FloatingRateService
+from app.services.schedule_query import ScheduleQuery
+from app.services.structured_repayment import StructuredRepayment
+from app.utils.helpers import raw_json_response
 
 emi_api_bp = Blueprint("emi_api", __name__)
 
@@ -38,18 +55,29 @@ def calculate_emi():
         rate = float(data.get("rate", 0))
         tenure = int(data.get("tenure", 0))
         currency = data.get("currency", "USD")
+        structure = data.get("structure")
 
         # ===============================
-        # EMI CALCULATION
+        # STRUCTURED REPAYMENT
+        # (level loans stay on the cached fast path)
         # ===============================
-        calculation = EMIEngine.calculate(principal, rate, tenure)
+        if StructuredRepayment.is_structured(structure):
+            calculation, schedule = StructuredRepayment.calculate(
+                principal, rate, tenure, structure
+            )
 
-        # ===============================
-        # AMORTIZATION
-        # ===============================
-        schedule = AmortizationService.generate_schedule(
-            principal, rate, tenure
-        )
+        else:
+            # ===============================
+            # EMI CALCULATION
+            # ===============================
+            calculation = CalculationCache.calculate(principal, rate, tenure)
+
+            # ===============================
+            # AMORTIZATION
+            # ===============================
+            schedule = CalculationCache.generate_schedule(
+                principal, rate, tenure
+            )
 
         yearly_summary = AmortizationService.generate_yearly_summary(schedule)
 
@@ -70,29 +98,28 @@ def calculate_emi():
         # ===============================
         # SAVE TO DATABASE
         # ===============================
-        record = Calculation(
-            principal=principal,
-            annual_interest_rate=rate,
-            tenure_months=tenure,
-            emi=calculation["emi"],
-            total_interest=calculation["total_interest"],
-            total_payment=calculation["total_payment"],
-            currency=calculation["currency"],
-            ip_address=request.remote_addr
-        )
-
-        db.session.add(record)
-        db.session.commit()
+        calculation_recorder.record([{
+            "principal": principal,
+            "annual_interest_rate": rate,
+            "tenure_months": tenure,
+            "emi": calculation["emi"],
+            "total_interest": calculation["total_interest"],
+            "total_payment": calculation["total_payment"],
+            "currency": calculation["currency"],
+            "structure": calculation.get("structure"),
+            "ip_address": request.remote_addr
+        }])
 
         # ===============================
         # RESPONSE
+        # (schedule encoded straight from its columns)
         # ===============================
-        return jsonify({
-            "calculation": calculation,
-            "amortization": schedule,
-            "yearly_summary": yearly_summary,
-            "graph_data": graph_data
-        }), 200
+        return raw_json_response({
+            "calculation": json.dumps(calculation),
+            "amortization": schedule.to_json(),
+            "yearly_summary": json.dumps(yearly_summary),
+            "graph_data": json.dumps(graph_data)
+        })
 
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
@@ -103,4 +130,187 @@ def calculate_emi():
 
     except Exception as e:
         current_app.logger.error(f"EMI API Error: {str(e)}")
-        return jsonify({"error": "Something went wrong"}), 500
\ No newline at end of file
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+@emi_api_bp.route("/calculate-emi/stream", methods=["POST"])
+@limiter.limit("20 per minute")
+def stream_schedule():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON input"}), 400
+
+        principal = float(data.get("principal", 0))
+        rate = float(data.get("rate", 0))
+        tenure = int(data.get("tenure", 0))
+        currency = data.get("currency", "USD")
+        structure = data.get("structure")
+
+        output_format = request.args.get("format", data.get("format", "ndjson"))
+
+        if output_format not in ("ndjson", "csv"):
+            return jsonify({"error": "Format must be ndjson or csv"}), 400
+
+        # Rows carry no currency: a converted EMI is only on /api/calculate-emi
+        if currency != "USD":
+            return jsonify({"error": "Streamed schedules are in USD; use /api/calculate-emi for a converted EMI"}), 400
+
+        page_size = current_app.config.get("STREAM_PAGE_MONTHS", 120)
+
+        # Validates inputs before the first byte is sent; one page of
+        # rows is computed at a time (structured loans: from the plan's
+        # phase segments, same rows as /api/calculate-emi)
+        if StructuredRepayment.is_structured(structure):
+            pages = StructuredRepayment.pages(principal, rate, tenure, structure, page_size)
+        else:
+            pages = ScheduleQuery(principal, rate, tenure).pages(page_size)
+
+        # ===============================
+        # ROW GENERATOR
+        # (one page of rows in memory at a time)
+        # ===============================
+        def generate():
+            if output_format == "csv":
+                yield AmortizationSchedule.CSV_HEADER
+                for page in pages:
+                    yield page.to_csv()
+            else:
+                for page in pages:
+                    yield page.to_ndjson()
+
+        mimetype = "text/csv" if output_format == "csv" else "application/x-ndjson"
+
+        response = current_app.response_class(
+            stream_with_context(generate()), mimetype=mimetype
+        )
+
+        if output_format == "csv":
+            response.headers["Content-Disposition"] = \
+                "attachment; filename=amortization_schedule.csv"
+
+        return response
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"EMI Stream API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+@emi_api_bp.route("/calculate-emi/batch", methods=["POST"])
+@limiter.limit("10 per minute")
+def calculate_emi_batch():
+    try:
+        data = request.get_json()
+
+        if not data or not isinstance(data.get("loans"), list):
+            return jsonify({"error": "Provide a list of loans"}), 400
+
+        loans = data["loans"]
+        include_schedule = bool(data.get("include_schedule", False))
+
+        config = current_app.config
+        max_items = config.get(
+            "MAX_BATCH_SCHEDULES" if include_schedule else "MAX_BATCH_SIZE", 1000
+        )
+
+        if not loans:
+            return jsonify({"error": "Provide a list of loans"}), 400
+
+        if len(loans) > max_items:
+            return jsonify({"error": f"Batch exceeds maximum of {max_items} loans"}), 400
+
+        # ===============================
+        # VECTORIZED PRICING
+        # ===============================
+        results, records, priced = BatchPricingService.price(
+            loans, include_schedule=include_schedule
+        )
+
+        # ===============================
+        # SAVE TO DATABASE
+        # (one multi-row insert for the whole batch)
+        # ===============================
+        if records:
+            ip_address = request.remote_addr
+
+            for record in records:
+                record["currency"] = "USD"
+                record["ip_address"] = ip_address
+
+            calculation_recorder.record(records)
+
+        return raw_json_response({
+            "count": str(len(loans)),
+            "priced": str(priced),
+            "failed": str(len(loans) - priced),
+            "results": "[" + ",".join(results) + "]"
+        })
+
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({"error": "Database error"}), 500
+
+    except Exception as e:
+        current_app.logger.error(f"EMI Batch API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+@emi_api_bp.route("/calculate-emi/floating", methods=["POST"])
+@limiter.limit("20 per minute")
+def calculate_floating():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON input"}), 400
+
+        principal = float(data.get("principal", 0))
+        rate = float(data.get("rate", 0))
+        tenure = int(data.get("tenure", 0))
+        max_tenure = data.get("max_tenure")
+
+        base_calculation = CalculationCache.calculate(principal, rate, tenure)
+
+        result, schedule = FloatingRateService.simulate(
+            principal,
+            rate,
+            tenure,
+            data.get("rate_path", []),
+            recompute=data.get("recompute", "emi"),
+            max_tenure_months=int(max_tenure) if max_tenure is not None else None,
+            include_schedule=bool(data.get("include_schedule", False)),
+            base=base_calculation
+        )
+
+        if schedule is not None:
+            return raw_json_response({
+                "fixed_rate": json.dumps(base_calculation),
+                "floating_result": json.dumps(result),
+                "schedule": schedule.to_json()
+            })
+
+        return jsonify({
+            "fixed_rate": base_calculation,
+            "floating_result": result
+        }), 200
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"Floating Rate API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+@emi_api_bp.route("/calculate-emi/cache-stats", methods=["GET"])
+@limiter.limit("60 per minute")
+def cache_stats():
+    # Worker internals, not a public endpoint
+    if not current_app.debug:
+        abort(404)
+
+    return jsonify(CalculationCache.stats())
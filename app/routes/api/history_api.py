@@ -6,17 +6,23 @@ Handles:
 GET /api/history
 
 Features:
-- Pagination
+- Cursor pagination: ?cursor= for the first page, then the returned
+  next_cursor; cost does not grow with depth (?include_total=1 adds
+  a cached total_records)
+- Page number pagination (?page=N) with a cached total_records
 - Filter by IP
-- Filter by comparison group
-- Performance optimized
+- Filter by comparison group (rows of one stored comparison)
+- Performance optimized (indexed filters, rows encoded straight to JSON)
 - Ordered by latest first
 """
 
+import json
 from flask import Blueprint, request, jsonify, current_app
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.extensions import db, limiter
-from app.models.calculation import Calculation
+from app.models.loan_comparison import LoanComparison
+from app.services.history_service import HistoryService
+from app.utils.helpers import raw_json_response
 
 history_api_bp = Blueprint("history_api", __name__)
 
@@ -32,43 +38,73 @@ def get_history():
         per_page = int(request.args.get("per_page", 10))
         ip_filter = request.args.get("ip")
         comparison_group = request.args.get("group_id")
+        cursor = request.args.get("cursor")
+        include_total = request.args.get("include_total", "").lower() in ("1", "true", "yes")
+
+        if page < 1 or per_page < 1:
+            raise ValueError("Pagination values must be positive")
 
         if per_page > 50:
             per_page = 50  # safety cap
 
-        query = Calculation.query
-
         # ===============================
-        # OPTIONAL FILTERS
+        # ONE COMPARISON
+        # (stored once, in loan_comparisons)
         # ===============================
-        if ip_filter:
-            query = query.filter(Calculation.ip_address == ip_filter)
-
         if comparison_group:
-            query = query.filter(
-                Calculation.comparison_group_id == comparison_group
+            comparison = LoanComparison.query.filter_by(
+                comparison_group_id=comparison_group
+            ).first()
+
+            rows = comparison.loan_rows() if comparison else []
+
+            if ip_filter and comparison and comparison.ip_address != ip_filter:
+                rows = []
+
+            return jsonify({
+                "page": page,
+                "per_page": per_page,
+                "total_records": len(rows),
+                "total_pages": -(-len(rows) // per_page),
+                "results": rows[(page - 1) * per_page:page * per_page]
+            }), 200
+
+        # ===============================
+        # CURSOR (KEYSET) PAGINATION
+        # ===============================
+        if cursor is not None:
+            rows, next_cursor = HistoryService.keyset_page(
+                per_page, cursor or None, ip_filter
             )
 
+            fragments = {
+                "next_cursor": json.dumps(next_cursor),
+                "per_page": str(per_page),
+                "results": HistoryService.to_json(rows)
+            }
+
+            if include_total:
+                fragments["total_records"] = str(HistoryService.total(ip_filter))
+
+            return raw_json_response(fragments)
+
         # ===============================
-        # ORDER + PAGINATION
+        # PAGE NUMBER PAGINATION
+        # (total cached, not counted per call)
         # ===============================
-        query = query.order_by(Calculation.created_at.desc())
-
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-
-        results = [record.to_dict() for record in pagination.items]
-
-        return jsonify({
-            "page": page,
-            "per_page": per_page,
-            "total_records": pagination.total,
-            "total_pages": pagination.pages,
-            "results": results
-        }), 200
+        rows = HistoryService.offset_page(page, per_page, ip_filter)
+        total = HistoryService.total(ip_filter)
+
+        next_cursor = HistoryService.encode_cursor(rows[-1]) if len(rows) == per_page else None
+
+        return raw_json_response({
+            "next_cursor": json.dumps(next_cursor),
+            "page": str(page),
+            "per_page": str(per_page),
+            "results": HistoryService.to_json(rows),
+            "total_pages": str(-(-total // per_page)),
+            "total_records": str(total)
+        })
 
     except ValueError:
         return jsonify({"error": "Invalid pagination values"}), 400
@@ -4,20 +4,33 @@ Prepayment API Route
 Handles:
 
 POST /api/prepayment
+POST /api/prepayment/grid
 
 Supports:
 - Lump sum prepayment
 - Monthly extra payment
+- Multiple events: lump sums, extra changes, rate resets
+  ({"events": [...], "include_schedule": true})
+- Structured loans ({"structure": {"type": "step_up", ...}}, see
+  StructuredRepayment); prepayments apply on top of the structure
 - Returns interest savings
 - Returns tenure reduction
+- Sensitivity grids for heatmaps, in one vectorized pass:
+  {"grid": "lump_sum", "principal": ..., "rate": ..., "tenure": ...,
+   "lump_sums": [...], "after_months": [...]}
+  {"grid": "extra_monthly", "loans": [{"principal", "rate", "tenure"}, ...],
+   "extra_monthly": [...]}
 """
 
+import json
 from flask import Blueprint, request, jsonify, current_app
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.extensions import db, limiter
-from app.models.calculation import Calculation
+from app.core.write_behind import calculation_recorder
 from app.services.prepayment_service import PrepaymentService
-from app.services.emi_engine import EMIEngine
+from app.services.calculation_cache import CalculationCache
+from app.services.structured_repayment import StructuredRepayment
+from app.utils.helpers import raw_json_response
 
 prepayment_api_bp = Blueprint("prepayment_api", __name__)
 
@@ -39,19 +52,65 @@ def simulate_prepayment():
         after_month = int(data.get("after_month", 0))
         extra_monthly = float(data.get("extra_monthly", 0))
 
+        structure = data.get("structure")
+
         # Validate basic EMI first
-        base_calculation = EMIEngine.calculate(principal, rate, tenure)
+        if structure is not None:
+            base_calculation, _ = StructuredRepayment.calculate(
+                principal, rate, tenure, structure, include_schedule=False
+            )
+        else:
+            base_calculation = CalculationCache.calculate(principal, rate, tenure)
+
+        schedule = None
+
+        # Lump sum and extra together are just two events
+        # (and structured loans always take the event engine)
+        events = data.get("events")
+
+        if events is None and (structure is not None or (
+                lump_sum > 0 and after_month > 0 and extra_monthly > 0)):
+            events = []
+
+            if extra_monthly > 0:
+                events.append({"month": 0, "type": "extra", "amount": extra_monthly})
+
+            if lump_sum > 0 and after_month > 0:
+                events.append({"month": after_month, "type": "lump_sum", "amount": lump_sum})
+
+        # Simulation inputs (they key the stored configuration)
+        if events is not None:
+            inputs = {"events": events}
+        elif lump_sum > 0 and after_month > 0:
+            inputs = {"lump_sum": lump_sum, "after_month": after_month}
+        else:
+            inputs = {"extra_monthly": extra_monthly}
+
+        # ===============================
+        # EVENT-DRIVEN SIMULATION
+        # ===============================
+        if events is not None:
+            result, schedule = PrepaymentService.simulate_events(
+                principal,
+                rate,
+                tenure,
+                events,
+                base=base_calculation,
+                include_schedule=bool(data.get("include_schedule", False)),
+                structure=structure
+            )
 
         # ===============================
         # LUMP SUM SIMULATION
         # ===============================
-        if lump_sum > 0 and after_month > 0:
+        elif lump_sum > 0 and after_month > 0:
             result = PrepaymentService.simulate_lump_sum(
                 principal,
                 rate,
                 tenure,
                 lump_sum,
-                after_month
+                after_month,
+                base=base_calculation
             )
 
         # ===============================
@@ -62,36 +121,43 @@ def simulate_prepayment():
                 principal,
                 rate,
                 tenure,
-                extra_monthly
+                extra_monthly,
+                base=base_calculation
             )
 
         else:
             return jsonify({
-                "error": "Provide lump_sum + after_month OR extra_monthly"
+                "error": "Provide events, lump_sum + after_month, or extra_monthly"
             }), 400
 
         # ===============================
         # SAVE PREPAYMENT RECORD
         # ===============================
-        record = Calculation(
-            principal=principal,
-            annual_interest_rate=rate,
-            tenure_months=tenure,
-            emi=base_calculation["emi"],
-            total_interest=base_calculation["total_interest"],
-            total_payment=base_calculation["total_payment"],
-            currency="USD",
-            prepayment_used=True,
-            prepayment_data=result,
-            ip_address=request.remote_addr
-        )
-
-        db.session.add(record)
-        db.session.commit()
+        calculation_recorder.record([{
+            "principal": principal,
+            "annual_interest_rate": rate,
+            "tenure_months": tenure,
+            "emi": base_calculation["emi"],
+            "total_interest": base_calculation["total_interest"],
+            "total_payment": base_calculation["total_payment"],
+            "currency": "USD",
+            "structure": base_calculation.get("structure"),
+            "prepayment_used": True,
+            "prepayment": inputs,
+            "prepayment_data": result,
+            "ip_address": request.remote_addr
+        }])
 
         # ===============================
         # RESPONSE
         # ===============================
+        if schedule is not None:
+            return raw_json_response({
+                "original": json.dumps(base_calculation),
+                "prepayment_result": json.dumps(result),
+                "schedule": schedule.to_json()
+            })
+
         return jsonify({
             "original": base_calculation,
             "prepayment_result": result
@@ -106,4 +172,94 @@ def simulate_prepayment():
 
     except Exception as e:
         current_app.logger.error(f"Prepayment API Error: {str(e)}")
-        return jsonify({"error": "Something went wrong"}), 500
\ No newline at end of file
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+@prepayment_api_bp.route("/prepayment/grid", methods=["POST"])
+@limiter.limit("20 per minute")
+def prepayment_grid():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON input"}), 400
+
+        grid = data.get("grid", "lump_sum")
+        max_cells = current_app.config.get("PREPAYMENT_GRID_MAX_CELLS", 10000)
+
+        def axis(name):
+            values = data.get(name)
+
+            if not isinstance(values, list) or not values:
+                raise ValueError(f"Provide a non-empty list: {name}")
+
+            return values
+
+        # ===============================
+        # LUMP SUM x PREPAYMENT MONTH
+        # ===============================
+        if grid == "lump_sum":
+            principal = float(data.get("principal", 0))
+            rate = float(data.get("rate", 0))
+            tenure = int(data.get("tenure", 0))
+
+            lump_sums = [float(v) for v in axis("lump_sums")]
+            after_months = [int(v) for v in axis("after_months")]
+
+            if len(lump_sums) * len(after_months) > max_cells:
+                return jsonify({"error": f"Grid exceeds {max_cells} cells"}), 400
+
+            if min(lump_sums) < 0 or min(after_months) < 1:
+                raise ValueError("Lump sums must be >= 0 and months >= 1")
+
+            base_calculation = CalculationCache.calculate(principal, rate, tenure)
+
+            result = PrepaymentService.lump_sum_grid(
+                principal, rate, tenure, lump_sums, after_months,
+                base=base_calculation
+            )
+
+            rows = {"name": "lump_sum", "values": lump_sums}
+            columns = {"name": "after_month", "values": after_months}
+
+        # ===============================
+        # EXTRA MONTHLY x LOAN
+        # ===============================
+        elif grid == "extra_monthly":
+            loans = axis("loans")
+            extras = [float(v) for v in axis("extra_monthly")]
+
+            if len(loans) * len(extras) > max_cells:
+                return jsonify({"error": f"Grid exceeds {max_cells} cells"}), 400
+
+            if min(extras) < 0:
+                raise ValueError("Extra payments must be >= 0")
+
+            if not all(isinstance(loan, dict) for loan in loans):
+                raise ValueError("Each loan must be an object")
+
+            principals = [float(loan.get("principal", 0)) for loan in loans]
+            rates = [float(loan.get("rate", 0)) for loan in loans]
+            tenures = [int(loan.get("tenure", 0)) for loan in loans]
+
+            result = PrepaymentService.monthly_extra_grid(principals, rates, tenures, extras)
+
+            rows = {"name": "extra_monthly", "values": extras}
+            columns = {"name": "loan", "values": list(range(len(loans)))}
+
+        else:
+            return jsonify({"error": "Grid must be lump_sum or extra_monthly"}), 400
+
+        return jsonify({
+            "grid": grid,
+            "rows": rows,
+            "columns": columns,
+            **result
+        }), 200
+
+    except (ValueError, TypeError) as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"Prepayment Grid API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
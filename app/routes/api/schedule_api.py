@@ -0,0 +1,106 @@
+"""
+Schedule Query API Route
+-------------------------
+Handles:
+
+POST /api/amortization/query
+
+Answers one query per request, without building the full schedule:
+
+{"principal": 1000000, "rate": 8.5, "tenure": 240, "month": 12}
+{"principal": 1000000, "rate": 8.5, "tenure": 240, "start": 61, "count": 12}
+{"principal": 1000000, "rate": 8.5, "tenure": 240, "cumulative_through": 60}
+{"principal": 1000000, "rate": 8.5, "tenure": 240,
+ "filter": "interest_exceeds_principal", "start": 1, "count": 12}
+"""
+
+import json
+from flask import Blueprint, request, jsonify, current_app
+from app.core.extensions import limiter
+from app.services.schedule_query import ScheduleQuery
+from app.utils.helpers import raw_json_response
+
+schedule_api_bp = Blueprint("schedule_api", __name__)
+
+
+@schedule_api_bp.route("/amortization/query", methods=["POST"])
+@limiter.limit("60 per minute")
+def query_schedule():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON input"}), 400
+
+        principal = float(data.get("principal", 0))
+        rate = float(data.get("rate", 0))
+        tenure = int(data.get("tenure", 0))
+
+        query = ScheduleQuery(principal, rate, tenure)
+
+        # ===============================
+        # SINGLE MONTH
+        # ===============================
+        if "month" in data:
+            return jsonify({
+                "last_month": query.last_month,
+                "row": query.row(int(data["month"]))
+            }), 200
+
+        # ===============================
+        # CUMULATIVE TOTALS
+        # ===============================
+        if "cumulative_through" in data:
+            return jsonify({
+                "last_month": query.last_month,
+                "cumulative": query.cumulative(int(data["cumulative_through"]))
+            }), 200
+
+        # ===============================
+        # PAGE (OPTIONALLY FILTERED)
+        # ===============================
+        first, last = 1, query.last_month
+        filter_name = data.get("filter")
+
+        if filter_name:
+            matched = query.months_where(filter_name)
+
+            if matched is None:
+                return raw_json_response({
+                    "last_month": json.dumps(query.last_month),
+                    "filter": json.dumps(filter_name),
+                    "range": "null",
+                    "rows": "[]",
+                    "next_start": "null"
+                })
+
+            first, last = matched
+
+        page_max = current_app.config.get("SCHEDULE_PAGE_MAX", 120)
+        start = max(int(data.get("start", first)), first)
+        count = min(
+            int(data.get("count", current_app.config.get("SCHEDULE_PAGE_SIZE", 12))),
+            page_max,
+            last - start + 1
+        )
+
+        if start > last:
+            raise ValueError(f"Start must be between {first} and {last}")
+
+        page = query.rows(start, count)
+        next_start = start + count if start + count <= last else None
+
+        return raw_json_response({
+            "last_month": json.dumps(query.last_month),
+            "filter": json.dumps(filter_name),
+            "range": json.dumps({"first": first, "last": last}),
+            "rows": page.to_json(),
+            "next_start": json.dumps(next_start)
+        })
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"Schedule Query API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
@@ -0,0 +1,203 @@
+"""
+Inverse Solver API Route
+-------------------------
+Handles:
+
+POST /api/solve/principal
+POST /api/solve/tenure
+POST /api/solve/rate
+
+Every numeric field accepts a number or a list; lists broadcast
+against each other, so a grid of offers is solved in one request:
+
+{"emi": 25000, "rate": [8.5, 9.0, 9.5], "tenure": 240}
+{"income": 120000, "existing_emi": 10000, "rate": 8.5, "tenure": [180, 240]}
+{"principal": 2500000, "emi": 22000, "rate": 8.5}
+{"principal": 500000, "emi": 11000, "tenure": 60, "fees": 5000}
+
+Infeasible cells are returned as null.
+"""
+
+import numpy as np
+from flask import Blueprint, request, jsonify, current_app
+from app.core.extensions import limiter
+from app.core.money import get_quantizer
+from app.services.inverse_solver import InverseSolver
+
+solver_api_bp = Blueprint("solver_api", __name__)
+
+
+# ===============================
+# INPUT HELPERS
+# ===============================
+def _field(data, name, default=None):
+    value = data.get(name, default)
+
+    if value is None:
+        raise ValueError(f"Missing field: {name}")
+
+    values = np.asarray(value, dtype=np.float64)
+
+    if values.ndim > 1 or not np.all(np.isfinite(values)):
+        raise ValueError(f"Invalid value for {name}")
+
+    return values
+
+
+def _check_grid(*arrays):
+    try:
+        shape = np.broadcast_shapes(*[a.shape for a in arrays])
+    except ValueError:
+        raise ValueError("List fields must have matching lengths")
+
+    size = int(np.prod(shape))
+
+    if size > current_app.config.get("MAX_BATCH_SIZE", 5000):
+        raise ValueError("Too many combinations in one request")
+
+
+def _check_rates(rates):
+    if np.any((rates < 0) | (rates > current_app.config["MAX_INTEREST_RATE"])):
+        raise ValueError("Invalid interest rate")
+
+
+def _check_tenures(tenures):
+    if np.any((tenures <= 0) | (tenures > current_app.config["MAX_TENURE_MONTHS"])
+              | (tenures != np.floor(tenures))):
+        raise ValueError("Invalid tenure duration")
+
+
+def _listed(values, decimals=None, integer=False):
+    """
+    Array -> list (or scalar) with NaN as null.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+
+    if decimals is not None:
+        values = np.round(values, decimals)
+
+    cells = np.where(missing, 0, values).astype(np.int64 if integer else np.float64)
+
+    return np.where(missing, None, cells.astype(object)).tolist()
+
+
+# ===============================
+# PRINCIPAL FROM EMI
+# ===============================
+@solver_api_bp.route("/solve/principal", methods=["POST"])
+@limiter.limit("30 per minute")
+def solve_principal():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON input"}), 400
+
+        rates = _field(data, "rate")
+        tenures = _field(data, "tenure")
+
+        # Either a direct EMI, or income-based eligibility (FOIR)
+        if "emi" in data:
+            emis = _field(data, "emi")
+        else:
+            income = _field(data, "income")
+            existing = _field(data, "existing_emi", 0)
+            foir = float(data.get("foir", current_app.config.get("ELIGIBILITY_FOIR", 0.5)))
+
+            if not 0 < foir <= 1:
+                raise ValueError("FOIR must be between 0 and 1")
+
+            emis = income * foir - existing
+
+        _check_grid(emis, rates, tenures)
+        _check_rates(rates)
+        _check_tenures(tenures)
+
+        principals = InverseSolver.principal_from_emi(
+            emis, rates, tenures, scale=get_quantizer().scale
+        )
+
+        return jsonify({
+            "emi": _listed(np.broadcast_to(emis, principals.shape), 2),
+            "principal": _listed(principals)
+        }), 200
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"Solver API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+# ===============================
+# TENURE FROM EMI
+# ===============================
+@solver_api_bp.route("/solve/tenure", methods=["POST"])
+@limiter.limit("30 per minute")
+def solve_tenure():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON input"}), 400
+
+        principals = _field(data, "principal")
+        rates = _field(data, "rate")
+        emis = _field(data, "emi")
+
+        _check_grid(principals, rates, emis)
+        _check_rates(rates)
+
+        exact = InverseSolver.exact_tenure(principals, rates, emis)
+
+        return jsonify({
+            "tenure_months": _listed(
+                InverseSolver.tenure_from_emi(principals, rates, emis), integer=True
+            ),
+            "exact_tenure": _listed(exact, 4)
+        }), 200
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"Solver API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+# ===============================
+# RATE / APR FROM EMI
+# ===============================
+@solver_api_bp.route("/solve/rate", methods=["POST"])
+@limiter.limit("30 per minute")
+def solve_rate():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON input"}), 400
+
+        principals = _field(data, "principal")
+        emis = _field(data, "emi")
+        tenures = _field(data, "tenure")
+        fees = _field(data, "fees", 0)
+
+        _check_grid(principals, emis, tenures, fees)
+        _check_tenures(tenures)
+
+        rates = InverseSolver.rate_from_emi(principals, emis, tenures, fees)
+
+        return jsonify({
+            "annual_rate": _listed(rates["apr"], 4),
+            "monthly_rate": _listed(rates["monthly_rate"], 6),
+            "effective_annual_rate": _listed(rates["effective_annual_rate"], 4)
+        }), 200
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"Solver API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
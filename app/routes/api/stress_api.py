@@ -0,0 +1,76 @@
+"""
+Stress Test API Route
+----------------------
+Handles:
+
+POST /api/stress-test
+
+Monte Carlo stress test of a floating-rate loan:
+
+{
+    "principal": 5000000,
+    "rate": 8.5,
+    "tenure": 240,
+    "paths": 20000,
+    "recompute": "emi",           (or "tenure", with optional "max_tenure")
+    "reset_every": 3,             (months between rate resets)
+    "theta": 8.5,                 (long-run rate, default: rate)
+    "kappa": 0.5,                 (mean reversion per year)
+    "sigma": 1.0,                 (volatility, rate points per sqrt(year))
+    "seed": 42                    (optional; echoed back for reruns)
+}
+
+Returns percentiles of total interest, peak EMI, EMI shock and
+tenure change; individual paths are never returned.
+"""
+
+from flask import Blueprint, request, jsonify, current_app
+from app.core.extensions import limiter
+from app.services.calculation_cache import CalculationCache
+from app.services.stress_test_service import StressTestService
+
+stress_api_bp = Blueprint("stress_api", __name__)
+
+
+@stress_api_bp.route("/stress-test", methods=["POST"])
+@limiter.limit("5 per minute")
+def stress_test():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON input"}), 400
+
+        principal = float(data.get("principal", 0))
+        rate = float(data.get("rate", 0))
+        tenure = int(data.get("tenure", 0))
+
+        base_calculation = CalculationCache.calculate(principal, rate, tenure)
+
+        def optional(name, cast):
+            value = data.get(name)
+            return cast(value) if value is not None else None
+
+        result = StressTestService.run(
+            principal,
+            rate,
+            tenure,
+            int(data.get("paths", 1000)),
+            recompute=data.get("recompute", "emi"),
+            reset_every=int(data.get("reset_every", 3)),
+            theta=optional("theta", float),
+            kappa=float(data.get("kappa", 0.5)),
+            sigma=float(data.get("sigma", 1.0)),
+            max_tenure_months=optional("max_tenure", int),
+            seed=optional("seed", int),
+            base=base_calculation
+        )
+
+        return jsonify(result), 200
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"Stress Test API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
@@ -0,0 +1,99 @@
+"""
+What-If API Route
+------------------
+Handles:
+
+POST   /api/what-if               open a session, returns the full schedule
+PATCH  /api/what-if/<session_id>  replace events, returns changed rows only
+DELETE /api/what-if/<session_id>  close a session
+
+Open:
+{"principal": 1000000, "rate": 8.5, "tenure": 240,
+ "events": [{"month": 24, "type": "lump_sum", "amount": 100000}],
+ "structure": {...}}              (optional, see StructuredRepayment)
+
+Update:
+{"events": [{"month": 30, "type": "lump_sum", "amount": 100000}]}
+
+Update responses carry "from_month" and "last_month": the client
+replaces its rows from from_month on with "rows" and drops any row
+after last_month. Sessions live in the shared cache (any worker can
+serve them); a 404 means the session expired and must be reopened.
+"""
+
+import json
+from flask import Blueprint, request, jsonify, current_app
+from app.core.extensions import limiter
+from app.services.what_if_service import WhatIfService
+from app.utils.helpers import raw_json_response
+
+what_if_api_bp = Blueprint("what_if_api", __name__)
+
+
+@what_if_api_bp.route("/what-if", methods=["POST"])
+@limiter.limit("20 per minute")
+def open_session():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "Invalid JSON input"}), 400
+
+        session_id, result, schedule = WhatIfService.create(
+            float(data.get("principal", 0)),
+            float(data.get("rate", 0)),
+            int(data.get("tenure", 0)),
+            events=data.get("events", []),
+            structure=data.get("structure")
+        )
+
+        return raw_json_response({
+            "session_id": json.dumps(session_id),
+            "result": json.dumps(result),
+            "rows": schedule.to_json()
+        }, 201)
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"What-If API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+@what_if_api_bp.route("/what-if/<session_id>", methods=["PATCH"])
+@limiter.limit("120 per minute")
+def update_session(session_id):
+    try:
+        data = request.get_json()
+
+        if not data or "events" not in data:
+            return jsonify({"error": "Missing events"}), 400
+
+        result, from_month, rows = WhatIfService.update(session_id, data["events"])
+
+        return raw_json_response({
+            "session_id": json.dumps(session_id),
+            "result": json.dumps(result),
+            "from_month": json.dumps(from_month),
+            "last_month": json.dumps(result["new_tenure_months"]),
+            "rows": rows.to_json()
+        })
+
+    except LookupError as le:
+        return jsonify({"error": str(le)}), 404
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"What-If API Error: {str(e)}")
+        return jsonify({"error": "Something went wrong"}), 500
+
+
+@what_if_api_bp.route("/what-if/<session_id>", methods=["DELETE"])
+def close_session(session_id):
+    if not WhatIfService.close(session_id):
+        return jsonify({"error": "What-if session not found or expired"}), 404
+
+    return jsonify({"closed": True}), 200
@@ -13,9 +13,8 @@ from flask import Blueprint, send_file, abort, current_app
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.models.calculation import Calculation
-from app.services.amortization_service import AmortizationService
 from app.services.pdf_report_service import PDFReportService
-from app.services.emi_engine import EMIEngine
+from app.services.calculation_cache import CalculationCache
 
 reports_bp = Blueprint("reports", __name__)
 
@@ -31,20 +30,22 @@ def download_report(calculation_id):
         if not record:
             abort(404)
 
+        loan = record.configuration
+
         # ===============================
         # REGENERATE CALCULATION
         # (Ensures data integrity)
         # ===============================
-        calculation_result = EMIEngine.calculate(
-            float(record.principal),
-            float(record.annual_interest_rate),
-            record.tenure_months
+        calculation_result = CalculationCache.calculate(
+            float(loan.principal),
+            float(loan.annual_interest_rate),
+            loan.tenure_months
         )
 
-        schedule = AmortizationService.generate_schedule(
-            float(record.principal),
-            float(record.annual_interest_rate),
-            record.tenure_months
+        schedule = CalculationCache.generate_schedule(
+            float(loan.principal),
+            float(loan.annual_interest_rate),
+            loan.tenure_months
         )
 
         # ===============================
@@ -0,0 +1,179 @@
+"""
+Amortization Schedule
+----------------------
+Compact, columnar repayment schedule.
+
+Columns are held as int64 NumPy arrays in minor units; rows are
+only materialized as dicts when a caller asks for them.
+
+Features:
+- List-like row access (len, index, slice, iteration, pages)
+- Yearly summary straight from the columns
+- Graph-ready series straight from the columns
+- Direct JSON / NDJSON / CSV encoding without intermediate row dicts
+"""
+
+import numpy as np
+
+
+class AmortizationSchedule:
+
+    FIELDS = ("month", "emi", "principal_paid", "interest_paid", "remaining_balance")
+
+    MONEY_FIELDS = ("emi", "principal_paid", "interest_paid", "remaining_balance")
+
+    ROW_JSON = (
+        '{{"emi":{1},"interest_paid":{3},"month":{0},'
+        '"principal_paid":{2},"remaining_balance":{4}}}'
+    )
+
+    CSV_HEADER = ",".join(FIELDS) + "\n"
+
+    __slots__ = FIELDS + ("quantizer",)
+
+    def __init__(self, columns, quantizer):
+        self.quantizer = quantizer
+
+        for field in self.FIELDS:
+            setattr(self, field, np.asarray(columns[field], dtype=np.int64))
+
+    # ===============================
+    # ROW ACCESS
+    # ===============================
+    def __len__(self):
+        return len(self.month)
+
+    def _row(self, index):
+        scale = self.quantizer.scale
+
+        return {
+            "month": int(self.month[index]),
+            "emi": int(self.emi[index]) / scale,
+            "principal_paid": int(self.principal_paid[index]) / scale,
+            "interest_paid": int(self.interest_paid[index]) / scale,
+            "remaining_balance": int(self.remaining_balance[index]) / scale
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("schedule index out of range")
+
+        return self._row(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._row(index)
+
+    def pages(self, page_size):
+        """
+        Consecutive schedules of up to page_size rows (column views,
+        nothing is copied).
+        """
+        for start in range(0, len(self), page_size):
+            yield AmortizationSchedule(
+                {field: getattr(self, field)[start:start + page_size] for field in self.FIELDS},
+                self.quantizer
+            )
+
+    def _float_columns(self):
+        """
+        Money columns as Python float lists, in FIELDS order.
+        """
+        from_minor = self.quantizer.from_minor
+
+        return [self.month.tolist()] + [
+            from_minor(getattr(self, field)).tolist()
+            for field in self.MONEY_FIELDS
+        ]
+
+    def to_list(self):
+        """
+        Materialize every row as a dict.
+        """
+        return [
+            dict(zip(self.FIELDS, row))
+            for row in zip(*self._float_columns())
+        ]
+
+    # ===============================
+    # AGGREGATES
+    # ===============================
+    def yearly_summary(self):
+        """
+        Aggregate monthly columns into yearly totals.
+        """
+
+        if not len(self):
+            return []
+
+        years = (self.month - 1) // 12 + 1
+        starts = np.flatnonzero(np.diff(years, prepend=0))
+        from_minor = self.quantizer.from_minor
+
+        def yearly_total(column):
+            return from_minor(np.add.reduceat(column, starts)).tolist()
+
+        return [
+            {
+                "year": year,
+                "total_principal": total_principal,
+                "total_interest": total_interest,
+                "total_payment": total_payment
+            }
+            for year, total_principal, total_interest, total_payment in zip(
+                years[starts].tolist(),
+                yearly_total(self.principal_paid),
+                yearly_total(self.interest_paid),
+                yearly_total(self.emi)
+            )
+        ]
+
+    def graph_data(self):
+        """
+        Chart series.
+        """
+        from_minor = self.quantizer.from_minor
+
+        return {
+            "labels": [f"M{month}" for month in self.month.tolist()],
+            "principal": from_minor(self.principal_paid).tolist(),
+            "interest": from_minor(self.interest_paid).tolist(),
+            "balance": from_minor(self.remaining_balance).tolist()
+        }
+
+    # ===============================
+    # SERIALIZATION
+    # ===============================
+    def to_json(self):
+        """
+        Encode rows as a JSON array directly from the columns.
+        """
+        return "[" + ",".join(
+            map(self.ROW_JSON.format, *self._float_columns())
+        ) + "]"
+
+    def to_ndjson(self):
+        """
+        Encode rows as newline-delimited JSON.
+        """
+        return "".join(
+            map((self.ROW_JSON + "\n").format, *self._float_columns())
+        )
+
+    def to_csv(self):
+        """
+        Encode rows as CSV lines (no header) with fixed currency decimals.
+        """
+        decimals = self.quantizer.exponent
+        line = "{},{:.%df},{:.%df},{:.%df},{:.%df}\n" % ((decimals,) * 4)
+
+        return "".join(map(line.format, *self._float_columns()))
+
+    def __repr__(self):
+        return f"<AmortizationSchedule {len(self)} months>"
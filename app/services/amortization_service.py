@@ -9,32 +9,50 @@ Features:
 - Graph-ready data
 - Safe balance handling
 - Supports zero-interest loans
+- Closed-form, array-backed schedule generation
+- Integer minor-unit rows that reconcile with EMIEngine totals
+- Columnar schedule with direct JSON encoding
 """
 
-from decimal import Decimal, ROUND_HALF_UP
-from flask import current_app
+from app.core.money import get_quantizer
+from app.core.request_memo import request_memoized
+from app.services.amortization_schedule import AmortizationSchedule
 from app.services.emi_engine import EMIEngine
+from app.services.schedule_engine import ScheduleEngine
 
 
 class AmortizationService:
 
     @staticmethod
-    def _round(value):
-        precision = current_app.config.get("DECIMAL_PRECISION", 2)
-        return float(
-            Decimal(value).quantize(
-                Decimal("1." + "0" * precision),
-                rounding=ROUND_HALF_UP
-            )
+    @request_memoized("amortization.schedule")
+    def generate_schedule(principal, annual_rate, tenure_months, currency=None):
+        """
+        Generate full amortization schedule.
+
+        Columns are computed in closed form, in integer minor units,
+        and returned as a columnar AmortizationSchedule.
+        """
+
+        result = EMIEngine.calculate(principal, annual_rate, tenure_months, currency)
+        quantizer = get_quantizer(currency)
+
+        columns = ScheduleEngine.columns(
+            principal, annual_rate, tenure_months, result["emi"], quantizer
         )
 
+        return AmortizationSchedule(columns, quantizer)
+
     @staticmethod
-    def generate_schedule(principal, annual_rate, tenure_months):
+    def generate_schedule_reference(principal, annual_rate, tenure_months, currency=None):
         """
-        Generate full amortization schedule.
+        Month-by-month reference implementation.
+
+        The original per-row loop (rows rounded independently), kept
+        as the baseline generate_schedule is benchmarked against.
         """
 
-        result = EMIEngine.calculate(principal, annual_rate, tenure_months)
+        result = EMIEngine.calculate(principal, annual_rate, tenure_months, currency)
+        round_ = get_quantizer(currency).round
 
         emi = result["emi"]
         monthly_rate = annual_rate / (12 * 100)
@@ -60,10 +78,10 @@ class AmortizationService:
 
             schedule.append({
                 "month": month,
-                "emi": AmortizationService._round(emi),
-                "principal_paid": AmortizationService._round(principal_component),
-                "interest_paid": AmortizationService._round(interest),
-                "remaining_balance": AmortizationService._round(max(balance, 0))
+                "emi": round_(emi),
+                "principal_paid": round_(principal_component),
+                "interest_paid": round_(interest),
+                "remaining_balance": round_(max(balance, 0))
             })
 
             if balance <= 0:
@@ -76,57 +94,11 @@ class AmortizationService:
         """
         Aggregate monthly schedule into yearly data.
         """
-
-        yearly = {}
-        for row in schedule:
-            year = (row["month"] - 1) // 12 + 1
-
-            if year not in yearly:
-                yearly[year] = {
-                    "year": year,
-                    "total_principal": 0,
-                    "total_interest": 0,
-                    "total_payment": 0
-                }
-
-            yearly[year]["total_principal"] += row["principal_paid"]
-            yearly[year]["total_interest"] += row["interest_paid"]
-            yearly[year]["total_payment"] += row["emi"]
-
-        # Round final values
-        for year in yearly:
-            yearly[year]["total_principal"] = AmortizationService._round(
-                yearly[year]["total_principal"]
-            )
-            yearly[year]["total_interest"] = AmortizationService._round(
-                yearly[year]["total_interest"]
-            )
-            yearly[year]["total_payment"] = AmortizationService._round(
-                yearly[year]["total_payment"]
-            )
-
-        return list(yearly.values())
+        return schedule.yearly_summary()
 
     @staticmethod
     def graph_data(schedule):
         """
         Prepare data for charts.
         """
-
-        labels = []
-        principal_data = []
-        interest_data = []
-        balance_data = []
-
-        for row in schedule:
-            labels.append(f"M{row['month']}")
-            principal_data.append(row["principal_paid"])
-            interest_data.append(row["interest_paid"])
-            balance_data.append(row["remaining_balance"])
-
-        return {
-            "labels": labels,
-            "principal": principal_data,
-            "interest": interest_data,
-            "balance": balance_data
-        }
\ No newline at end of file
+        return schedule.graph_data()
@@ -0,0 +1,174 @@
+"""
+Annuity Math
+-------------
+Vectorized closed-form annuity formulas shared by the engines.
+
+Designed for:
+- Numerical stability (log1p / expm1 instead of (1 + r) ** n)
+- Whole-array evaluation with NumPy
+- Zero-interest loans handled without special-case loops
+
+All rates are monthly rates expressed as fractions (0.0075 = 0.75%).
+"""
+
+import numpy as np
+
+
+class AnnuityMath:
+
+    @staticmethod
+    def two_product(a, b):
+        """
+        Error-free product (Dekker): a * b == product + error exactly.
+        """
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+
+        product = a * b
+
+        split_a = 134217729.0 * a
+        a_hi = split_a - (split_a - a)
+        a_lo = a - a_hi
+
+        split_b = 134217729.0 * b
+        b_hi = split_b - (split_b - b)
+        b_lo = b - b_hi
+
+        error = ((a_hi * b_hi - product) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+
+        return product, error
+
+    @staticmethod
+    def monthly_rate(annual_rate):
+        """
+        Convert annual percentage rate(s) to monthly fractional rate(s).
+        """
+        return np.asarray(annual_rate, dtype=np.float64) / (12 * 100)
+
+    @staticmethod
+    def growth_minus_one(monthly_rate, months):
+        """
+        (1 + r) ** n - 1, computed as expm1(n * log1p(r)).
+        """
+        monthly_rate = np.asarray(monthly_rate, dtype=np.float64)
+        months = np.asarray(months, dtype=np.float64)
+        return np.expm1(months * np.log1p(monthly_rate))
+
+    @staticmethod
+    def growth(monthly_rate, months):
+        """
+        (1 + r) ** n, computed in log space.
+        """
+        monthly_rate = np.asarray(monthly_rate, dtype=np.float64)
+        months = np.asarray(months, dtype=np.float64)
+        return np.exp(months * np.log1p(monthly_rate))
+
+    @staticmethod
+    def payment_factor(monthly_rate, months):
+        """
+        EMI per unit of principal:
+
+            r / (1 - (1 + r) ** -n)
+
+        Falls back to 1 / n where the rate is zero.
+        """
+        monthly_rate = np.asarray(monthly_rate, dtype=np.float64)
+        months = np.asarray(months, dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            discount = -np.expm1(-months * np.log1p(monthly_rate))
+            factor = monthly_rate / discount
+
+        return np.where(monthly_rate == 0, 1.0 / months, factor)
+
+    @staticmethod
+    def annuity_factor(monthly_rate, months):
+        """
+        (1 - (1 + r) ** -n) / r, the present value of n unit payments.
+
+        Falls back to n where the rate is zero (and is 0 for n = 0).
+        """
+        monthly_rate = np.asarray(monthly_rate, dtype=np.float64)
+        months = np.asarray(months, dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = -np.expm1(-months * np.log1p(monthly_rate)) / monthly_rate
+
+        return np.where(monthly_rate == 0, months, factor)
+
+    @staticmethod
+    def accumulation_factor(monthly_rate, months):
+        """
+        ((1 + r) ** k - 1) / r, the future value of k unit payments.
+
+        Falls back to k where the rate is zero.
+        """
+        monthly_rate = np.asarray(monthly_rate, dtype=np.float64)
+        months = np.asarray(months, dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = np.expm1(months * np.log1p(monthly_rate)) / monthly_rate
+
+        return np.where(monthly_rate == 0, months, factor)
+
+    @staticmethod
+    def balance_after(principal, monthly_rate, payment, months):
+        """
+        Outstanding balance after k level payments:
+
+            P * (1 + r) ** k - E * ((1 + r) ** k - 1) / r
+
+        written as P + (P * r - E) * ((1 + r) ** k - 1) / r.
+
+        P * r - E is formed with an error-free product: at high rates
+        and long tenures it is a small difference of large numbers that
+        the growth factor then amplifies.
+        """
+        principal = np.asarray(principal, dtype=np.float64)
+        payment = np.asarray(payment, dtype=np.float64)
+
+        interest, error = AnnuityMath.two_product(principal, monthly_rate)
+        shortfall = (interest - payment) + error
+
+        return principal + shortfall * \
+            AnnuityMath.accumulation_factor(monthly_rate, months)
+
+    @staticmethod
+    def payoff_month(principal, monthly_rate, payment, tenure_months):
+        """
+        First month whose closing balance is <= 0, capped at the tenure:
+
+            ceil(-log(1 - P * r / E) / log(1 + r))
+
+        Loans whose payment never covers the interest run to the tenure.
+        """
+        principal = np.asarray(principal, dtype=np.float64)
+        monthly_rate = np.asarray(monthly_rate, dtype=np.float64)
+        payment = np.asarray(payment, dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coverage = principal * monthly_rate / payment
+            months = np.where(
+                monthly_rate == 0,
+                principal / payment,
+                -np.log1p(-coverage) / np.log1p(monthly_rate)
+            )
+            # Tolerance so a payment that exactly clears the balance is
+            # not pushed into the next month by log rounding
+            months = np.where(coverage < 1, np.ceil(months - 1e-9), np.inf)
+
+        return np.clip(months, 1, tenure_months).astype(np.int64)
+
+    @staticmethod
+    def interest_paid_through(principal, monthly_rate, payment, months):
+        """
+        Total interest in the first k level payments (unrounded):
+
+            k * E - (P - B_k)
+
+        Every payment not spent on principal went to interest.
+        """
+        months = np.asarray(months, dtype=np.float64)
+
+        return months * payment - principal + \
+            AnnuityMath.balance_after(principal, monthly_rate, payment, months)
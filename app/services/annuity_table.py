@@ -0,0 +1,143 @@
+"""
+Annuity Factor Table
+---------------------
+Precomputed EMI-per-unit-principal factors for every rate on the
+0.01% grid (rates are stored as Numeric(5,2)) and every tenure up
+to MAX_TENURE_MONTHS: 5,001 x 600 float64 values (~24 MB).
+
+Features:
+- Built once per process, or memory-mapped from a saved .npy file
+- Loaded in the app factory when ANNUITY_TABLE_PRELOAD is set (the
+  default in ProductionConfig), so a gunicorn master with preload_app
+  shares it copy-on-write
+- O(1) gather for on-grid inputs, exact formula for everything else
+
+Table entries are produced by AnnuityMath.payment_factor on the same
+float rates a request would use, so lookups are bit-identical to
+direct evaluation.
+"""
+
+import os
+import numpy as np
+from app.services.annuity_math import AnnuityMath
+
+
+# Rates step in basis points of annual percentage (0.01%)
+RATE_STEPS_PER_PERCENT = 100
+
+_table = None
+
+
+class AnnuityTable:
+
+    @staticmethod
+    def build(max_rate, max_tenure):
+        """
+        Compute the full (rate x tenure) payment-factor grid.
+
+        Row i is the annual rate i / 100 %, column j the tenure j + 1.
+        """
+
+        annual_rates = np.arange(
+            int(max_rate * RATE_STEPS_PER_PERCENT) + 1
+        ) / RATE_STEPS_PER_PERCENT
+        tenures = np.arange(1, max_tenure + 1)
+
+        return AnnuityMath.payment_factor(
+            AnnuityMath.monthly_rate(annual_rates)[:, None], tenures[None, :]
+        )
+
+    @staticmethod
+    def save(path, max_rate, max_tenure):
+        """
+        Build the grid and write it as .npy for memory-mapped loading.
+        """
+
+        factors = AnnuityTable.build(max_rate, max_tenure)
+        np.save(path, factors)
+
+        return factors.shape
+
+    @staticmethod
+    def load(app):
+        """
+        Install the process-wide table from app config.
+
+        Memory-maps ANNUITY_TABLE_PATH when it exists and matches the
+        configured limits; otherwise builds the grid in memory.
+        """
+
+        global _table
+
+        max_rate = app.config["MAX_INTEREST_RATE"]
+        max_tenure = app.config["MAX_TENURE_MONTHS"]
+        expected = (int(max_rate * RATE_STEPS_PER_PERCENT) + 1, max_tenure)
+        path = app.config.get("ANNUITY_TABLE_PATH")
+
+        factors = None
+
+        if path and os.path.exists(path):
+            factors = np.load(path, mmap_mode="r")
+
+            if factors.shape != expected or factors.dtype != np.float64:
+                app.logger.warning(
+                    f"Annuity table {path} has shape {factors.shape}, "
+                    f"expected {expected}; rebuilding in memory."
+                )
+                factors = None
+
+        if factors is None:
+            factors = AnnuityTable.build(max_rate, max_tenure)
+
+        _table = factors
+
+        app.logger.info(f"Annuity table loaded: {factors.shape[0]} rates x {factors.shape[1]} tenures.")
+
+    @staticmethod
+    def unload():
+        global _table
+        _table = None
+
+    @staticmethod
+    def is_loaded():
+        return _table is not None
+
+    @staticmethod
+    def payment_factor(annual_rates, tenures):
+        """
+        EMI per unit principal for each (annual rate %, tenure) pair.
+
+        On-grid pairs are gathered from the table; off-grid pairs
+        (finer-than-0.01% rates, or no table loaded) use the formula.
+        """
+
+        annual_rates = np.asarray(annual_rates, dtype=np.float64)
+        tenures = np.asarray(tenures, dtype=np.int64)
+
+        if _table is None:
+            return AnnuityMath.payment_factor(AnnuityMath.monthly_rate(annual_rates), tenures)
+
+        rows, columns = _table.shape
+        steps = np.rint(annual_rates * RATE_STEPS_PER_PERCENT)
+        on_grid = (
+            (steps / RATE_STEPS_PER_PERCENT == annual_rates)
+            & (steps >= 0) & (steps < rows)
+            & (tenures >= 1) & (tenures <= columns)
+        )
+
+        # Flat index into the row-major grid
+        cells = steps.astype(np.int64) * columns + (tenures - 1)
+        flat = _table.reshape(-1)
+
+        if on_grid.all():
+            return np.take(flat, cells)
+
+        factors = np.empty(annual_rates.shape, dtype=np.float64)
+        factors[on_grid] = np.take(flat, cells[on_grid])
+
+        off_grid = ~on_grid
+        factors[off_grid] = AnnuityMath.payment_factor(
+            AnnuityMath.monthly_rate(annual_rates[off_grid]), tenures[off_grid]
+        )
+
+        return factors
@@ -0,0 +1,121 @@
+"""
+Batch Pricing Service
+----------------------
+Prices many loan variants in one vectorized pass.
+
+Features:
+- Per-item parsing and validation errors (the batch never fails as a whole)
+- One EMIEngine.calculate_batch call for every valid loan
+- Compact per-loan summaries, optionally with schedules
+- Calculation rows ready for a single bulk insert
+"""
+
+import json
+import numpy as np
+from app.core.money import get_quantizer
+from app.services.amortization_schedule import AmortizationSchedule
+from app.services.emi_engine import EMIEngine
+from app.services.schedule_engine import ScheduleEngine
+
+
+class BatchPricingService:
+
+    SUMMARY_FIELDS = (
+        "emi", "total_interest", "total_payment",
+        "effective_annual_rate", "loan_end_date"
+    )
+
+    @staticmethod
+    def parse_items(loans):
+        """
+        Split raw loan dicts into numeric columns and parse errors.
+
+        Returns (principals, rates, tenures, errors) where errors
+        holds a message for every item that could not be parsed.
+        """
+
+        count = len(loans)
+        principals = np.zeros(count)
+        rates = np.zeros(count)
+        tenures = np.zeros(count, dtype=np.int64)
+        errors = np.full(count, None, dtype=object)
+
+        for index, loan in enumerate(loans):
+            if not isinstance(loan, dict):
+                errors[index] = "Each loan must be an object"
+                continue
+
+            try:
+                principals[index] = float(loan.get("principal", 0))
+                rates[index] = float(loan.get("rate", 0))
+                tenures[index] = int(loan.get("tenure", 0))
+            except (TypeError, ValueError, OverflowError):
+                errors[index] = "Principal, rate and tenure must be numeric"
+
+        errors[~(np.isfinite(principals) & np.isfinite(rates)) & np.equal(errors, None)] = \
+            "Principal, rate and tenure must be numeric"
+
+        return principals, rates, tenures, errors
+
+    @staticmethod
+    def price(loans, include_schedule=False):
+        """
+        Price a list of loan dicts.
+
+        Returns:
+            results: per-item JSON fragments, in request order
+            records: dicts for the valid loans (Calculation columns)
+            valid:   number of priced loans
+        """
+
+        principals, rates, tenures, errors = BatchPricingService.parse_items(loans)
+
+        parsed = np.equal(errors, None)
+        errors[parsed] = EMIEngine.batch_errors(
+            principals[parsed], rates[parsed], tenures[parsed]
+        )
+
+        valid = np.flatnonzero(np.equal(errors, None))
+
+        columns = EMIEngine.calculate_batch(
+            principals[valid], rates[valid], tenures[valid], validate=False
+        ) if valid.size else None
+
+        quantizer = get_quantizer()
+        results = [None] * len(loans)
+        records = []
+
+        for index in np.flatnonzero(np.not_equal(errors, None)).tolist():
+            results[index] = json.dumps({"index": index, "error": errors[index]})
+
+        if columns is not None:
+            summary = {
+                field: columns[field].tolist()
+                for field in BatchPricingService.SUMMARY_FIELDS
+            }
+
+            for position, index in enumerate(valid.tolist()):
+                item = {"index": index}
+                item.update({field: summary[field][position] for field in summary})
+
+                fragment = json.dumps(item)
+
+                if include_schedule:
+                    schedule = AmortizationSchedule(ScheduleEngine.columns(
+                        float(principals[index]), float(rates[index]), int(tenures[index]),
+                        item["emi"], quantizer
+                    ), quantizer)
+                    fragment = fragment[:-1] + ',"schedule":' + schedule.to_json() + "}"
+
+                results[index] = fragment
+
+                records.append({
+                    "principal": float(principals[index]),
+                    "annual_interest_rate": float(rates[index]),
+                    "tenure_months": int(tenures[index]),
+                    "emi": item["emi"],
+                    "total_interest": item["total_interest"],
+                    "total_payment": item["total_payment"],
+                })
+
+        return results, records, int(valid.size)
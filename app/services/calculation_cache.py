@@ -0,0 +1,68 @@
+"""
+Calculation Cache Service
+--------------------------
+Result cache in front of EMIEngine and AmortizationService.
+
+Both engines are pure functions of (principal, rate, tenure, currency),
+except for loan_end_date, which depends on today's date:
+
+- Keys are canonical, so 1e6 and 1000000.0 share an entry
+- Calculation keys carry today's date; schedule keys do not
+- Bounded LRU per process, backed by the shared Flask-Caching store
+- Shares request-memo namespaces with EMIEngine / AmortizationService,
+  so a cached result also dedupes later engine calls in the request
+"""
+
+from datetime import date
+from app.core.caching import calculation_cache, schedule_cache, canonical_key
+from app.core.request_memo import request_memoized
+from app.services.emi_engine import EMIEngine
+from app.services.amortization_service import AmortizationService
+
+
+class CalculationCache:
+
+    @staticmethod
+    @request_memoized("emi.calculate", copy=dict)
+    def calculate(principal, annual_rate, tenure_months, currency=None):
+        """
+        Cached EMIEngine.calculate. Returns a fresh dict per call,
+        so callers may add keys to it.
+        """
+
+        key = canonical_key(
+            "calculation", principal, annual_rate, tenure_months,
+            currency=currency, on=date.today().isoformat()
+        )
+
+        result = calculation_cache.get_or_compute(
+            key,
+            lambda: EMIEngine.calculate(principal, annual_rate, tenure_months, currency)
+        )
+
+        return dict(result)
+
+    @staticmethod
+    @request_memoized("amortization.schedule")
+    def generate_schedule(principal, annual_rate, tenure_months, currency=None):
+        """
+        Cached AmortizationService.generate_schedule.
+        """
+
+        key = canonical_key(
+            "schedule", principal, annual_rate, tenure_months, currency=currency
+        )
+
+        return schedule_cache.get_or_compute(
+            key,
+            lambda: AmortizationService.generate_schedule(
+                principal, annual_rate, tenure_months, currency
+            )
+        )
+
+    @staticmethod
+    def stats():
+        return {
+            "calculation": calculation_cache.stats(),
+            "schedule": schedule_cache.stats(),
+        }
@@ -0,0 +1,175 @@
+"""
+Calculation Store
+------------------
+Writes calculation history in the deduplicated layout.
+
+- loan_configurations: each distinct loan once, keyed by content hash
+- calculations:        one thin event row per calculation
+- loan_comparisons:    one row per comparison (ranked results as JSON)
+- calculation_rollups: daily counters, updated in the same transaction
+
+Features:
+- Accepts the flat calculation rows produced by the routes (with the
+  normalized "structure" and, for simulations, the "prepayment" inputs
+  that key the configuration)
+- Configuration ids resolved per batch: in-process LRU first, then
+  one SELECT ... IN, then one INSERT for the unseen configurations
+  (ON CONFLICT DO NOTHING on SQLite / PostgreSQL, so concurrent
+  workers inserting the same loan do not collide)
+- Used as the write-behind recorder's writer; every call commits
+"""
+
+from datetime import datetime
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from app.core.caching import configuration_ids
+from app.core.extensions import db
+from app.models.calculation import Calculation
+from app.models.loan_comparison import LoanComparison
+from app.models.loan_configuration import LoanConfiguration
+from app.services.rollup_service import RollupService
+
+
+class CalculationStore:
+
+    CONFIGURATION_FIELDS = (
+        "principal", "annual_interest_rate", "tenure_months", "currency", "structure",
+        "emi", "total_interest", "total_payment", "prepayment_data",
+    )
+
+    EVENT_FIELDS = ("user_id", "ip_address", "created_at")
+
+    # ===============================
+    # CONFIGURATIONS
+    # ===============================
+    @staticmethod
+    def _configuration(row):
+        configuration = {field: row.get(field) for field in CalculationStore.CONFIGURATION_FIELDS}
+        configuration["currency"] = configuration["currency"] or "USD"
+        configuration["prepayment_used"] = configuration["prepayment_data"] is not None
+
+        configuration["config_hash"] = LoanConfiguration.content_hash(
+            configuration["principal"],
+            configuration["annual_interest_rate"],
+            configuration["tenure_months"],
+            configuration["currency"],
+            configuration["structure"],
+            row.get("prepayment"),
+        )
+
+        return configuration
+
+    @staticmethod
+    def _insert_ignoring_duplicates():
+        dialects = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+        dialect_insert = dialects.get(db.session.get_bind().dialect.name)
+
+        if dialect_insert is None:
+            return insert(LoanConfiguration)
+
+        return dialect_insert(LoanConfiguration).on_conflict_do_nothing(
+            index_elements=["config_hash"]
+        )
+
+    @staticmethod
+    def _lookup(hashes):
+        if not hashes:
+            return {}
+
+        return dict(db.session.execute(
+            select(LoanConfiguration.config_hash, LoanConfiguration.id)
+            .where(LoanConfiguration.config_hash.in_(hashes))
+        ).all())
+
+    @staticmethod
+    def resolve_configurations(configurations):
+        """
+        Map config_hash -> id, inserting configurations not stored yet.
+
+        Returns the ids and the hashes first seen by this process (to
+        be remembered only once the transaction commits).
+        """
+
+        unique = {c["config_hash"]: c for c in configurations}
+        ids = {}
+
+        for config_hash in unique:
+            config_id = configuration_ids.get(config_hash)
+
+            if config_id is not None:
+                ids[config_hash] = config_id
+
+        missing = [h for h in unique if h not in ids]
+        found = CalculationStore._lookup(missing)
+
+        unseen = [h for h in missing if h not in found]
+
+        if unseen:
+            db.session.execute(
+                CalculationStore._insert_ignoring_duplicates(),
+                [unique[h] for h in unseen]
+            )
+            found.update(CalculationStore._lookup(unseen))
+
+        ids.update(found)
+        return ids, found
+
+    # ===============================
+    # WRITERS
+    # ===============================
+    @staticmethod
+    def save_calculations(rows):
+        """
+        Store flat calculation rows (loan columns + user_id, ip_address,
+        created_at, sample_weight) as configurations, events and rollup
+        counts, then commit.
+        """
+
+        now = datetime.utcnow()
+        rows = [row if row.get("created_at") else dict(row, created_at=now) for row in rows]
+        configurations = [CalculationStore._configuration(row) for row in rows]
+        ids, new_ids = CalculationStore.resolve_configurations(configurations)
+
+        db.session.execute(insert(Calculation), [
+            {
+                "configuration_id": ids[configuration["config_hash"]],
+                "sample_weight": row.get("sample_weight", 1.0),
+                **{field: row.get(field) for field in CalculationStore.EVENT_FIELDS}
+            }
+            for row, configuration in zip(rows, configurations)
+        ])
+
+        # Sampled rows count for the calls they stand for
+        RollupService.add([
+            (
+                row["created_at"].date(),
+                configuration["principal"], configuration["annual_interest_rate"],
+                configuration["tenure_months"], configuration["currency"],
+                row.get("sample_weight", 1.0)
+            )
+            for row, configuration in zip(rows, configurations)
+        ])
+
+        db.session.commit()
+
+        for config_hash, config_id in new_ids.items():
+            configuration_ids.put(config_hash, config_id)
+
+    @staticmethod
+    def save_comparisons(rows):
+        """
+        Store comparison rows (comparison_group_id, loans_data,
+        best_loan_id, user_id, ip_address, created_at), then commit.
+        """
+
+        db.session.execute(insert(LoanComparison), [
+            {
+                "comparison_group_id": row["comparison_group_id"],
+                "loans_data": row["loans_data"],
+                "best_loan_id": row.get("best_loan_id"),
+                **{field: row.get(field) for field in CalculationStore.EVENT_FIELDS}
+            }
+            for row in rows
+        ])
+
+        db.session.commit()
@@ -4,86 +4,192 @@ Loan Comparison Service
 Compares multiple loan options intelligently.
 
 Features:
-- Compare up to 3 loans
+- Compare 2 loans up to thousands of lender offers
 - EMI comparison
 - Total interest comparison
 - Cost efficiency score
 - Automatic best loan ranking
+- Per-loan validation (errors name the loan)
+- Vectorized pricing (one EMIEngine.calculate_batch pass)
+- Heap-based top-k selection, without sorting every offer
+- Matching against the stored lender-offer catalog (OfferIndex)
 """
 
-from decimal import Decimal, ROUND_HALF_UP
+import heapq
+import numpy as np
 from flask import current_app
+from app.core.money import get_quantizer
 from app.services.emi_engine import EMIEngine
+from app.services.inverse_solver import InverseSolver
+from app.services.offer_index import OfferIndex
 
 
 class LoanComparisonService:
 
-    @staticmethod
-    def _round(value):
-        precision = current_app.config.get("DECIMAL_PRECISION", 2)
-        return float(
-            Decimal(value).quantize(
-                Decimal("1." + "0" * precision),
-                rounding=ROUND_HALF_UP
-            )
-        )
+    SORT_KEYS = ("total_payment", "total_interest", "emi")
 
     @staticmethod
-    def compare(loans):
+    def compare(loans, top_k=None, sort_by="total_payment"):
         """
         loans = [
             {"principal": 1000000, "rate": 8.5, "tenure": 240},
             {"principal": 1000000, "rate": 8.2, "tenure": 240},
         ]
+
+        Returns the top_k loans (all when None), best first.
+        Ties keep request order.
         """
 
-        if len(loans) < 2 or len(loans) > 3:
-            raise ValueError("You can compare between 2 and 3 loans only.")
-
-        results = []
-
-        for idx, loan in enumerate(loans):
-            calc = EMIEngine.calculate(
-                loan["principal"],
-                loan["rate"],
-                loan["tenure"]
-            )
-
-            efficiency_score = LoanComparisonService._calculate_efficiency_score(calc)
-
-            results.append({
-                "loan_id": idx + 1,
-                "principal": calc["principal"],
-                "rate": calc["annual_interest_rate"],
-                "tenure": calc["tenure_months"],
-                "emi": calc["emi"],
-                "total_interest": calc["total_interest"],
-                "total_payment": calc["total_payment"],
-                "efficiency_score": efficiency_score
-            })
+        max_loans = current_app.config.get("MAX_COMPARISON_LOANS", 3)
+
+        if len(loans) < 2 or len(loans) > max_loans:
+            raise ValueError(f"You can compare between 2 and {max_loans} loans only.")
+
+        if sort_by not in LoanComparisonService.SORT_KEYS:
+            raise ValueError(f"Sort by one of: {', '.join(LoanComparisonService.SORT_KEYS)}")
 
-        # Sort by total payment (lowest is best)
-        ranked = sorted(results, key=lambda x: x["total_payment"])
+        principals, rates, tenures = LoanComparisonService._columns(loans)
 
-        # Mark best loan
-        ranked[0]["best_option"] = True
-        for r in ranked[1:]:
-            r["best_option"] = False
+        # ===============================
+        # VECTORIZED PRICING
+        # ===============================
+        calc = EMIEngine.calculate_batch(principals, rates, tenures, validate=False)
+
+        efficiency_scores = LoanComparisonService._efficiency_scores(
+            calc["total_payment"], calc["principal"]
+        )
+
+        # ===============================
+        # TOP-K RANKING
+        # ===============================
+        count = len(loans)
+        k = count if top_k is None else max(1, min(int(top_k), count))
+
+        keys = calc[sort_by].tolist()
+        ranked_indices = [
+            index for _, index in heapq.nsmallest(k, zip(keys, range(count)))
+        ]
+
+        columns = {
+            name: calc[name][ranked_indices].tolist()
+            for name in ("principal", "annual_interest_rate", "tenure_months",
+                         "emi", "total_interest", "total_payment")
+        }
+        scores = efficiency_scores[ranked_indices].tolist()
+
+        ranked = [
+            {
+                "loan_id": index + 1,
+                "principal": columns["principal"][position],
+                "rate": columns["annual_interest_rate"][position],
+                "tenure": columns["tenure_months"][position],
+                "emi": columns["emi"][position],
+                "total_interest": columns["total_interest"][position],
+                "total_payment": columns["total_payment"][position],
+                "efficiency_score": scores[position],
+                "best_option": position == 0
+            }
+            for position, index in enumerate(ranked_indices)
+        ]
 
         return ranked
 
     @staticmethod
-    def _calculate_efficiency_score(calculation_result):
+    def _columns(loans):
         """
-        Custom financial efficiency score.
-        Lower total payment → higher score.
+        Validated principal / rate / tenure arrays. Raises ValueError
+        naming the first invalid loan (1-based, like loan_id).
+        """
+
+        columns = ([], [], [])
+
+        for number, loan in enumerate(loans, start=1):
+            missing = [key for key in ("principal", "rate", "tenure") if key not in loan]
+
+            if missing:
+                raise ValueError(f"Loan {number}: missing {', '.join(missing)}")
+
+            try:
+                values = (float(loan["principal"]), float(loan["rate"]), int(loan["tenure"]))
+            except (TypeError, ValueError):
+                raise ValueError(f"Loan {number}: principal, rate and tenure must be numbers")
+
+            for column, value in zip(columns, values):
+                column.append(value)
+
+        principals, rates, tenures = (np.array(column) for column in columns)
+        errors = EMIEngine.batch_errors(principals, rates, tenures)
+
+        for number, error in enumerate(errors, start=1):
+            if error is not None:
+                raise ValueError(f"Loan {number}: {error}")
+
+        return principals, rates, tenures
+
+    @staticmethod
+    def match_offers(principal, tenure_months, top_k=10, currency="USD"):
+        """
+        Catalog offers in this currency eligible for this principal
+        and tenure, ranked by total cost (total payment + processing
+        fees). The APR is None where fees swallow the whole principal.
         """
 
-        total_payment = calculation_result["total_payment"]
-        principal = calculation_result["principal"]
+        EMIEngine.validate_inputs(principal, 0, tenure_months)
+
+        index = OfferIndex.current()
+        positions = index.eligible(principal, tenure_months, currency)
+
+        if not positions.size:
+            return [], 0
+
+        count = len(positions)
+        calc = EMIEngine.calculate_batch(
+            np.full(count, principal), index.rates[positions],
+            np.full(count, tenure_months), validate=False, currency=currency
+        )
+
+        quantizer = get_quantizer(currency)
+        fees = quantizer.round_array(index.fees(positions, principal))
+        total_costs = quantizer.round_array(calc["total_payment"] + fees)
+
+        # APR: the rate implied by the EMI on the amount received after fees
+        aprs = InverseSolver.rate_from_emi(principal, calc["emi"], tenure_months, fees)["apr"]
+
+        k = max(1, min(int(top_k), count))
+        best = [
+            position for _, position in heapq.nsmallest(k, zip(total_costs.tolist(), range(count)))
+        ]
+
+        ranked = []
+
+        for rank, position in enumerate(best):
+            offer = int(positions[position])
+            lender_name, product_name = index.labels[offer]
+
+            ranked.append({
+                "offer_id": int(index.ids[offer]),
+                "lender_name": lender_name,
+                "product_name": product_name,
+                "rate": float(calc["annual_interest_rate"][position]),
+                "emi": float(calc["emi"][position]),
+                "total_interest": float(calc["total_interest"][position]),
+                "fees": float(fees[position]),
+                "total_cost": float(total_costs[position]),
+                "apr": round(float(aprs[position]), 4) if np.isfinite(aprs[position]) else None,
+                "best_option": rank == 0
+            })
+
+        return ranked, count
+
+    @staticmethod
+    def _efficiency_scores(total_payments, principals):
+        """
+        Custom financial efficiency score, for whole arrays.
+        Lower total payment → higher score.
+        """
 
         # Efficiency formula (custom scoring logic)
-        cost_ratio = total_payment / principal
-        score = 100 - ((cost_ratio - 1) * 100)
+        cost_ratios = total_payments / principals
+        scores = 100 - ((cost_ratios - 1) * 100)
 
-        return LoanComparisonService._round(max(score, 0))
\ No newline at end of file
+        return get_quantizer().round_array(np.maximum(scores, 0))
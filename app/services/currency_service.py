@@ -8,6 +8,7 @@ Handles multi-currency conversion with:
 - API-ready structure
 - Performance optimized
 - Scalable to Redis caching
+- Per-currency minor-unit rounding (JPY, KWD, ...)
 
 Note:
 In production, integrate real Forex API like:
@@ -17,9 +18,8 @@ In production, integrate real Forex API like:
 """
 
 import requests
-from decimal import Decimal, ROUND_HALF_UP
-from flask import current_app
 from app.core.extensions import cache
+from app.core.money import get_quantizer
 
 
 class CurrencyService:
@@ -34,16 +34,6 @@ class CurrencyService:
         "CAD": 1.35
     }
 
-    @staticmethod
-    def _round(value):
-        precision = current_app.config.get("DECIMAL_PRECISION", 2)
-        return float(
-            Decimal(value).quantize(
-                Decimal("1." + "0" * precision),
-                rounding=ROUND_HALF_UP
-            )
-        )
-
     @staticmethod
     @cache.cached(timeout=3600, key_prefix="forex_rates")
     def get_live_rates():
@@ -86,11 +76,11 @@ class CurrencyService:
         converted = amount_in_usd * rates[to_currency]
 
         return {
-            "original_amount": CurrencyService._round(amount),
+            "original_amount": get_quantizer(from_currency).round(amount),
             "from": from_currency,
             "to": to_currency,
-            "converted_amount": CurrencyService._round(converted),
-            "rate_used": CurrencyService._round(rates[to_currency])
+            "converted_amount": get_quantizer(to_currency).round(converted),
+            "rate_used": get_quantizer().round(rates[to_currency])
         }
 
     @staticmethod
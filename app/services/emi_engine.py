@@ -10,13 +10,31 @@ Designed for:
 - Extensibility
 
 All monetary values are rounded using
-config-defined precision.
+config-defined precision, in integer minor units.
+
+The EMI is rounded up to the minor unit. A payment even slightly
+below the exact annuity leaves a shortfall that compounds every month
+(at 40% over 531 months a half-cent grows past four million), so
+rounding up keeps the final row at most one EMI. The loan then closes
+on or before the tenure (months early where the compounding is that
+extreme: 476 of 531 months in that example).
+
+Totals are the sum of the schedule AmortizationService would
+produce: level EMI rows plus a final row that settles the exact
+remaining balance.
+
+EMI factors come from the precomputed AnnuityTable when the
+rate / tenure pair is on its grid.
 """
 
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
 from flask import current_app
+from app.core.money import get_quantizer
+from app.core.request_memo import request_memoized
+from app.services.annuity_math import AnnuityMath
+from app.services.annuity_table import AnnuityTable
 
 
 class EMIEngine:
@@ -24,19 +42,6 @@ class EMIEngine:
     Enterprise-grade EMI calculation service.
     """
 
-    @staticmethod
-    def _round(value):
-        """
-        Centralized rounding using config precision.
-        """
-        precision = current_app.config.get("DECIMAL_PRECISION", 2)
-        return float(
-            Decimal(value).quantize(
-                Decimal("1." + "0" * precision),
-                rounding=ROUND_HALF_UP
-            )
-        )
-
     @staticmethod
     def validate_inputs(principal, annual_rate, tenure_months):
         """
@@ -58,44 +63,143 @@ class EMIEngine:
             raise ValueError("Invalid tenure duration")
 
     @staticmethod
-    def calculate(principal, annual_rate, tenure_months):
+    def validate_batch(principals, annual_rates, tenures):
         """
-        Calculate EMI and full loan metrics.
+        Vectorized validation. Raises on the first rule any loan breaks.
         """
 
-        # Validate first
-        EMIEngine.validate_inputs(principal, annual_rate, tenure_months)
+        config = current_app.config
 
-        monthly_rate = annual_rate / (12 * 100)
+        if np.any(principals < config["MIN_LOAN_AMOUNT"]):
+            raise ValueError("Loan amount below minimum allowed")
 
-        if monthly_rate == 0:
-            emi = principal / tenure_months
-        else:
-            emi = (
-                principal
-                * monthly_rate
-                * (1 + monthly_rate) ** tenure_months
-            ) / ((1 + monthly_rate) ** tenure_months - 1)
+        if np.any(principals > config["MAX_LOAN_AMOUNT"]):
+            raise ValueError("Loan amount exceeds maximum allowed")
 
-        total_payment = emi * tenure_months
-        total_interest = total_payment - principal
+        if np.any((annual_rates < 0) | (annual_rates > config["MAX_INTEREST_RATE"])):
+            raise ValueError("Invalid interest rate")
 
-        # Effective annual rate (APR equivalent)
-        effective_annual_rate = (
-            (1 + monthly_rate) ** 12 - 1
-        ) * 100 if monthly_rate > 0 else 0
+        if np.any((tenures <= 0) | (tenures > config["MAX_TENURE_MONTHS"])):
+            raise ValueError("Invalid tenure duration")
+
+    @staticmethod
+    def batch_errors(principals, annual_rates, tenures):
+        """
+        Per-loan validation messages (None where the loan is valid).
+
+        Same rules and precedence as validate_inputs, evaluated
+        for the whole batch at once.
+        """
+
+        config = current_app.config
+
+        rules = [
+            (principals < config["MIN_LOAN_AMOUNT"], "Loan amount below minimum allowed"),
+            (principals > config["MAX_LOAN_AMOUNT"], "Loan amount exceeds maximum allowed"),
+            ((annual_rates < 0) | (annual_rates > config["MAX_INTEREST_RATE"]), "Invalid interest rate"),
+            ((tenures <= 0) | (tenures > config["MAX_TENURE_MONTHS"]), "Invalid tenure duration"),
+        ]
+
+        errors = np.full(len(principals), None, dtype=object)
+
+        # Apply in reverse so the first broken rule wins
+        for broken, message in reversed(rules):
+            errors[broken] = message
+
+        return errors
+
+    @staticmethod
+    def _end_dates(tenures):
+        """
+        Loan end dates, formatted once per distinct tenure.
+        """
 
-        # Loan end date
-        end_date = datetime.today() + relativedelta(months=tenure_months)
+        today = datetime.today()
+        unique, inverse = np.unique(tenures, return_inverse=True)
+        labels = np.array([
+            (today + relativedelta(months=int(n))).strftime("%d %b %Y")
+            for n in unique
+        ], dtype=object)
+
+        return labels[inverse]
+
+    @staticmethod
+    def calculate_batch(principals, annual_rates, tenures, validate=True, currency=None):
+        """
+        Calculate EMI and loan metrics for many loans at once.
+
+        Accepts array-likes of equal length and returns a dict of
+        columns (NumPy arrays) keyed like the scalar result.
+        """
+
+        principals = np.atleast_1d(np.asarray(principals, dtype=np.float64))
+        annual_rates = np.atleast_1d(np.asarray(annual_rates, dtype=np.float64))
+        tenures = np.atleast_1d(np.asarray(tenures, dtype=np.int64))
+
+        if not (principals.shape == annual_rates.shape == tenures.shape):
+            raise ValueError("Principal, rate and tenure arrays must have the same length")
+
+        if validate:
+            EMIEngine.validate_batch(principals, annual_rates, tenures)
+
+        money = get_quantizer(currency)
+        percent = get_quantizer()
+
+        monthly_rates = AnnuityMath.monthly_rate(annual_rates)
+
+        principal_minor = money.to_minor(principals)
+        emi_minor = money.to_minor_ceil(
+            principals * AnnuityTable.payment_factor(annual_rates, tenures)
+        )
+        emi = money.from_minor(emi_minor)
+
+        # Final row settles whatever the level EMI leaves outstanding
+        last_month = AnnuityMath.payoff_month(principals, monthly_rates, emi, tenures)
+        last_opening = AnnuityMath.balance_after(
+            principals, monthly_rates, emi, last_month - 1
+        )
+
+        total_interest_minor = (
+            (last_month - 1) * emi_minor
+            - principal_minor
+            + money.to_minor(last_opening)
+            + money.to_minor(last_opening * monthly_rates)
+        )
+
+        # Effective annual rate (APR equivalent)
+        effective_annual_rate = AnnuityMath.growth_minus_one(monthly_rates, 12) * 100
 
         return {
-            "emi": EMIEngine._round(emi),
-            "principal": EMIEngine._round(principal),
-            "annual_interest_rate": EMIEngine._round(annual_rate),
-            "monthly_interest_rate": EMIEngine._round(monthly_rate * 100),
-            "total_interest": EMIEngine._round(total_interest),
-            "total_payment": EMIEngine._round(total_payment),
-            "effective_annual_rate": EMIEngine._round(effective_annual_rate),
-            "tenure_months": tenure_months,
-            "loan_end_date": end_date.strftime("%d %b %Y"),
-        }
\ No newline at end of file
+            "emi": emi,
+            "principal": money.from_minor(principal_minor),
+            "annual_interest_rate": percent.round_array(annual_rates),
+            "monthly_interest_rate": percent.round_array(monthly_rates * 100),
+            "total_interest": money.from_minor(total_interest_minor),
+            "total_payment": money.from_minor(principal_minor + total_interest_minor),
+            "effective_annual_rate": percent.round_array(effective_annual_rate),
+            "tenure_months": tenures,
+            "loan_end_date": EMIEngine._end_dates(tenures),
+        }
+
+    @staticmethod
+    @request_memoized("emi.calculate", copy=dict)
+    def calculate(principal, annual_rate, tenure_months, currency=None):
+        """
+        Calculate EMI and full loan metrics.
+
+        Thin wrapper over calculate_batch for a single loan.
+        Memoized per request.
+        """
+
+        # Validate first
+        EMIEngine.validate_inputs(principal, annual_rate, tenure_months)
+
+        batch = EMIEngine.calculate_batch(
+            [principal], [annual_rate], [tenure_months],
+            validate=False, currency=currency
+        )
+
+        result = {key: column.tolist()[0] for key, column in batch.items()}
+        result["tenure_months"] = tenure_months
+
+        return result
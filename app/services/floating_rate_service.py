@@ -0,0 +1,135 @@
+"""
+Floating Rate Service
+----------------------
+Schedules for floating-rate loans.
+
+A rate path is a list of resets, each applied after the EMI of its
+month (month 0 = from the first month):
+
+    [[12, 9.0], [36, 8.25]]  or  [{"month": 12, "rate": 9.0}, ...]
+
+Features:
+- Recompute the EMI at each reset (same maturity), or
+- Keep the EMI and let the tenure move (up to a maturity cap; the
+  EMI is raised only when it can no longer repay by the cap)
+- Constant-rate segments evaluated in closed form by PrepaymentEngine,
+  so a dozen resets cost about the same as a fixed-rate schedule
+- Per-segment rate / EMI timeline and a fixed-rate comparison
+"""
+
+from flask import current_app
+from app.core.money import get_quantizer, round_money
+from app.services.emi_engine import EMIEngine
+from app.services.prepayment_engine import PrepaymentEngine
+
+
+class FloatingRateService:
+
+    # Public names for the engine's event modes
+    RECOMPUTE = {"emi": "reduce_emi", "tenure": "reduce_tenure"}
+
+    @staticmethod
+    def to_events(rate_path, recompute):
+        """
+        Rate path (pairs or dicts) -> rate_reset events.
+        """
+
+        if not isinstance(rate_path, list):
+            raise ValueError("Rate path must be a list")
+
+        if recompute not in FloatingRateService.RECOMPUTE:
+            raise ValueError(f"Recompute must be one of: {', '.join(FloatingRateService.RECOMPUTE)}")
+
+        mode = FloatingRateService.RECOMPUTE[recompute]
+        events = []
+
+        for reset in rate_path:
+            if isinstance(reset, dict):
+                month, rate = reset.get("month"), reset.get("rate")
+            elif isinstance(reset, (list, tuple)) and len(reset) == 2:
+                month, rate = reset
+            else:
+                raise ValueError("Each reset must be [month, rate] or {\"month\", \"rate\"}")
+
+            if month is None or rate is None:
+                raise ValueError("Each reset needs a month and a rate")
+
+            events.append({"month": month, "type": "rate_reset", "rate": rate, "mode": mode})
+
+        return events
+
+    @staticmethod
+    def simulate(principal, annual_rate, tenure_months, rate_path, recompute="emi",
+                 max_tenure_months=None, include_schedule=False, base=None):
+        """
+        Simulate a floating-rate loan.
+
+        Returns (result, schedule); schedule is None unless requested.
+        """
+
+        base = base or EMIEngine.calculate(principal, annual_rate, tenure_months)
+
+        config = current_app.config
+        max_resets = config.get("MAX_PREPAYMENT_EVENTS", 120)
+
+        if isinstance(rate_path, list) and len(rate_path) > max_resets:
+            raise ValueError(f"At most {max_resets} rate resets are allowed")
+
+        # Only a kept EMI can stretch the tenure
+        if recompute == "tenure":
+            cap = int(max_tenure_months or config["MAX_TENURE_MONTHS"])
+
+            if cap < tenure_months or cap > config["MAX_TENURE_MONTHS"]:
+                raise ValueError(
+                    f"Max tenure must be between {tenure_months} and {config['MAX_TENURE_MONTHS']}"
+                )
+        else:
+            cap = tenure_months
+
+        events = PrepaymentEngine.normalize_events(
+            FloatingRateService.to_events(rate_path, recompute),
+            cap,
+            config["MAX_INTEREST_RATE"]
+        )
+
+        quantizer = get_quantizer()
+        plan = PrepaymentEngine.plan(
+            principal, annual_rate, tenure_months, base["emi"], events, quantizer,
+            max_tenure_months=cap
+        )
+
+        summary = PrepaymentEngine.summary(plan)
+
+        result = {
+            "recompute": recompute,
+            "resets_applied": summary["events_applied"],
+            "tenure_months": summary["new_tenure_months"],
+            "tenure_change": summary["new_tenure_months"] - tenure_months,
+            "final_emi": summary["final_emi"],
+            "total_interest": summary["total_interest"],
+            "total_payment": summary["total_payment"],
+            "interest_vs_fixed": round_money(summary["total_interest"] - base["total_interest"]),
+            "segments": FloatingRateService.segments(plan),
+        }
+
+        schedule = PrepaymentEngine.schedule(plan) if include_schedule else None
+
+        return result, schedule
+
+    @staticmethod
+    def segments(plan):
+        """
+        Constant-rate stretches: months, annual rate and EMI.
+        """
+
+        scale = plan["quantizer"].scale
+
+        return [
+            {
+                "from_month": segment["start"],
+                "to_month": segment["start"] + segment["months"] - 1,
+                "rate": round(segment["rate"] * 12 * 100, 4),
+                "emi": segment["emi_minor"] / scale,
+            }
+            for segment in plan["segments"]
+        ]
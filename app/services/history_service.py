@@ -0,0 +1,210 @@
+"""
+History Service
+----------------
+Calculation history queries for GET /api/history.
+
+Features:
+- Keyset (cursor) pages on (created_at, id), newest first: every
+  page costs one index range scan, whatever its depth
+- Opaque continuation tokens (URL-safe base64 of the last row's key)
+- Offset pages kept for existing clients, without a COUNT(*) per call
+- Filtered totals counted at most once per HISTORY_COUNT_TTL seconds
+  (shared cache), so total_records is approximate between refreshes
+- Core selects of only the serialized columns (no ORM objects), encoded
+  straight to JSON in Calculation.to_dict's format
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import Float, cast, func, or_, select
+from app.core.caching import cache_key_builder, get_cached_value, set_cached_value
+from app.core.extensions import db
+from app.models.calculation import Calculation
+from app.models.loan_configuration import LoanConfiguration
+
+
+class HistoryService:
+
+    # Money columns come back as floats (no Decimal round trip)
+    COLUMNS = (
+        cast(LoanConfiguration.annual_interest_rate, Float).label("annual_interest_rate"),
+        Calculation.configuration_id,
+        Calculation.created_at,
+        LoanConfiguration.currency,
+        cast(LoanConfiguration.emi, Float).label("emi"),
+        Calculation.id,
+        LoanConfiguration.prepayment_used,
+        cast(LoanConfiguration.principal, Float).label("principal"),
+        LoanConfiguration.structure,
+        LoanConfiguration.tenure_months,
+        cast(LoanConfiguration.total_interest, Float).label("total_interest"),
+        cast(LoanConfiguration.total_payment, Float).label("total_payment"),
+    )
+
+    # Calculation.to_dict as JSON (keys sorted, as jsonify emits them)
+    ROW_JSON = (
+        '{{"annual_interest_rate":{},"configuration_id":{},"created_at":{},'
+        '"currency":{},"emi":{},"id":{},"prepayment_used":{},"principal":{},'
+        '"structure":{},"tenure_months":{},"total_interest":{},"total_payment":{}}}'
+    )
+
+    # ===============================
+    # CURSORS
+    # ===============================
+    @staticmethod
+    def encode_cursor(record):
+        """
+        Opaque token for the position just after record.
+        """
+        raw = f"{record.created_at.isoformat()}|{record.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(token):
+        """
+        (created_at, id) from a token; ValueError if it is malformed.
+        """
+
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            created_at, record_id = raw.split("|")
+            return datetime.fromisoformat(created_at), int(record_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    # ===============================
+    # QUERIES
+    # (Core selects of the serialized columns only)
+    # ===============================
+    @staticmethod
+    def _select(ip_address=None):
+        statement = select(*HistoryService.COLUMNS).join_from(
+            Calculation, LoanConfiguration,
+            Calculation.configuration_id == LoanConfiguration.id
+        )
+
+        if ip_address:
+            statement = statement.where(Calculation.ip_address == ip_address)
+
+        return statement.order_by(Calculation.created_at.desc(), Calculation.id.desc())
+
+    @staticmethod
+    def keyset_statement(limit, cursor=None, ip_address=None):
+        statement = HistoryService._select(ip_address)
+
+        if cursor:
+            created_at, record_id = HistoryService.decode_cursor(cursor)
+
+            # The plain created_at bound gives the planner an index range;
+            # the OR only trims rows sharing the cursor's timestamp
+            statement = statement.where(
+                Calculation.created_at <= created_at,
+                or_(Calculation.created_at < created_at, Calculation.id < record_id)
+            )
+
+        return statement.limit(limit)
+
+    @staticmethod
+    def offset_statement(page, per_page, ip_address=None):
+        return HistoryService._select(ip_address).offset((page - 1) * per_page).limit(per_page)
+
+    @staticmethod
+    def keyset_page(per_page, cursor=None, ip_address=None):
+        """
+        One page after cursor (None: the newest rows).
+
+        Returns the rows and the next cursor (None on the last page).
+        """
+
+        # One extra row tells whether another page exists
+        rows = db.session.execute(
+            HistoryService.keyset_statement(per_page + 1, cursor, ip_address)
+        ).all()
+
+        if len(rows) <= per_page:
+            return rows, None
+
+        rows = rows[:per_page]
+        return rows, HistoryService.encode_cursor(rows[-1])
+
+    @staticmethod
+    def offset_page(page, per_page, ip_address=None):
+        """
+        Page number `page` (OFFSET scan; prefer keyset_page when deep).
+        """
+        return db.session.execute(
+            HistoryService.offset_statement(page, per_page, ip_address)
+        ).all()
+
+    # ===============================
+    # SERIALIZATION
+    # ===============================
+    @staticmethod
+    def to_json(rows):
+        """
+        Encode rows as a JSON array without building dicts.
+
+        Dates and currencies repeat heavily, so each distinct value
+        is formatted once per call.
+        """
+
+        dates = {}
+        strings = {}
+        booleans = {True: "true", False: "false", None: "null"}
+
+        def date_json(created_at):
+            day = created_at.date()
+
+            if day not in dates:
+                dates[day] = '"' + created_at.strftime("%d %b %Y") + '"'
+
+            return dates[day]
+
+        def string_json(value):
+            if value not in strings:
+                strings[value] = json.dumps(value)
+
+            return strings[value]
+
+        def structure_json(structure):
+            if structure is None:
+                return "null"
+
+            return json.dumps(structure, sort_keys=True, separators=(",", ":"))
+
+        return "[" + ",".join(
+            HistoryService.ROW_JSON.format(
+                row.annual_interest_rate, row.configuration_id, date_json(row.created_at),
+                string_json(row.currency), row.emi, row.id, booleans[row.prepayment_used],
+                row.principal, structure_json(row.structure), row.tenure_months,
+                row.total_interest, row.total_payment
+            )
+            for row in rows
+        ) + "]"
+
+    # ===============================
+    # TOTALS
+    # ===============================
+    @staticmethod
+    def total(ip_address=None):
+        """
+        Row count for a filter, cached for HISTORY_COUNT_TTL seconds.
+        """
+
+        key = cache_key_builder("history_count", ip_address or "*")
+        total = get_cached_value(key)
+
+        if total is None:
+            statement = select(func.count()).select_from(Calculation)
+
+            if ip_address:
+                statement = statement.where(Calculation.ip_address == ip_address)
+
+            total = db.session.execute(statement).scalar_one()
+
+            set_cached_value(key, total, current_app.config.get("HISTORY_COUNT_TTL", 60))
+
+        return total
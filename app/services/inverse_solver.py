@@ -0,0 +1,183 @@
+"""
+Inverse Solver
+---------------
+Solves the EMI equation for the unknown other than EMI.
+
+    EMI = P * r / (1 - (1 + r) ** -n)
+
+Features:
+- Principal from an affordable EMI (closed form)
+- Tenure from an EMI (closed-form log)
+- Implied rate / APR from an EMI plus upfront fees
+  (safeguarded Newton-bisection, always converges)
+- Every solver takes NumPy arrays and broadcasts, so whole
+  grids of offers are solved in one pass
+
+Infeasible items (EMI below the interest, EMI below P / n for a
+rate) come back as NaN rather than raising, so one bad cell never
+fails a grid.
+"""
+
+import numpy as np
+from app.services.annuity_math import AnnuityMath
+
+
+class InverseSolver:
+
+    RATE_TOLERANCE = 1e-13
+    MAX_ITERATIONS = 100
+
+    @staticmethod
+    def _arrays(*values):
+        return np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in values])
+
+    # ===============================
+    # PRINCIPAL
+    # ===============================
+    @staticmethod
+    def principal_from_emi(emis, annual_rates, tenures, scale=100):
+        """
+        Largest principal (in minor units of 1 / scale) whose EMI
+        does not exceed the given EMI.
+        """
+
+        emis, annual_rates, tenures = InverseSolver._arrays(emis, annual_rates, tenures)
+
+        factors = AnnuityMath.payment_factor(AnnuityMath.monthly_rate(annual_rates), tenures)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            principals = np.floor(emis / factors * scale) / scale
+
+        return np.where((emis > 0) & (tenures >= 1), principals, np.nan)
+
+    # ===============================
+    # TENURE
+    # ===============================
+    @staticmethod
+    def exact_tenure(principals, annual_rates, emis):
+        """
+        Fractional number of level payments that repays the loan:
+
+            n = -log(1 - P * r / E) / log(1 + r)
+
+        NaN where the EMI does not cover the first month's interest.
+        """
+
+        principals, annual_rates, emis = InverseSolver._arrays(principals, annual_rates, emis)
+        monthly_rates = AnnuityMath.monthly_rate(annual_rates)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coverage = principals * monthly_rates / emis
+            months = np.where(
+                monthly_rates == 0,
+                principals / emis,
+                -np.log1p(-coverage) / np.log1p(monthly_rates)
+            )
+
+        return np.where((emis > 0) & (coverage < 1), months, np.nan)
+
+    @staticmethod
+    def tenure_from_emi(principals, annual_rates, emis):
+        """
+        Whole months needed at the given EMI (last payment may be smaller).
+        """
+
+        months = InverseSolver.exact_tenure(principals, annual_rates, emis)
+
+        # Guard against n = 120.0000000001 from floating-point noise
+        return np.ceil(months - 1e-9)
+
+    # ===============================
+    # RATE / APR
+    # ===============================
+    @staticmethod
+    def _factor_and_slope(monthly_rates, tenures):
+        """
+        payment_factor(r, n) and its derivative in r.
+
+            f  = r / (1 - v),  v = (1 + r) ** -n
+            f' = (1 - v - n * r * v / (1 + r)) / (1 - v) ** 2
+        """
+
+        v = np.exp(-tenures * np.log1p(monthly_rates))
+        one_minus_v = -np.expm1(-tenures * np.log1p(monthly_rates))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = monthly_rates / one_minus_v
+            slope = (one_minus_v - tenures * monthly_rates * v / (1 + monthly_rates)) \
+                / one_minus_v ** 2
+
+        # Limits at r -> 0: f = 1 / n, f' = (n + 1) / (2n)
+        zero = monthly_rates == 0
+        factor = np.where(zero, 1.0 / tenures, factor)
+        slope = np.where(zero, (tenures + 1) / (2 * tenures), slope)
+
+        return factor, slope
+
+    @staticmethod
+    def monthly_rate_from_emi(principals, emis, tenures, fees=0.0):
+        """
+        Monthly rate r such that (P - fees) * payment_factor(r, n) == EMI.
+
+        The root is bracketed in [0, EMI / (P - fees)] (the payment
+        factor always exceeds r). Each iteration takes a Newton step
+        and falls back to bisection whenever the step leaves the
+        bracket, so every item converges.
+        """
+
+        principals, emis, tenures, fees = InverseSolver._arrays(principals, emis, tenures, fees)
+        net = principals - fees
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            target = emis / net
+
+        # No non-negative rate exists when EMI < net / n
+        # (up to rounding, so zero-rate EMIs still solve to 0)
+        feasible = (net > 0) & (emis > 0) & (tenures >= 1) & (target * tenures >= 1 - 1e-12)
+        target = np.where(feasible, target, 1.0)
+        tenures = np.where(feasible, tenures, 1.0)
+
+        low = np.zeros_like(target)
+        high = target.copy()
+        rate = np.minimum(target, 0.01)
+
+        for _ in range(InverseSolver.MAX_ITERATIONS):
+            factor, slope = InverseSolver._factor_and_slope(rate, tenures)
+            residual = factor - target
+
+            low = np.where(residual < 0, rate, low)
+            high = np.where(residual > 0, rate, high)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = rate - residual / slope
+
+            inside = np.isfinite(newton) & (newton > low) & (newton < high)
+            next_rate = np.where(inside, newton, 0.5 * (low + high))
+            next_rate = np.where(residual == 0, rate, next_rate)
+
+            converged = np.abs(next_rate - rate) <= InverseSolver.RATE_TOLERANCE * np.maximum(rate, 1e-3)
+            rate = next_rate
+
+            if converged.all():
+                break
+
+        return np.where(feasible, rate, np.nan)
+
+    @staticmethod
+    def rate_from_emi(principals, emis, tenures, fees=0.0):
+        """
+        Implied annual rates in percent.
+
+        Without fees this is the loan's nominal rate. With fees
+        deducted from the amount received, it is the APR:
+        - apr:       nominal annual rate on the net amount (12 * r)
+        - effective: compounded annual rate ((1 + r) ** 12 - 1)
+        """
+
+        monthly = InverseSolver.monthly_rate_from_emi(principals, emis, tenures, fees)
+
+        return {
+            "monthly_rate": monthly * 100,
+            "apr": monthly * 12 * 100,
+            "effective_annual_rate": AnnuityMath.growth_minus_one(monthly, 12) * 100,
+        }
@@ -0,0 +1,166 @@
+"""
+Offer Index
+------------
+In-memory index over the active lender-offer catalog.
+
+Offers are held as NumPy columns, bucketed by currency (amounts in
+different currencies are never compared) and sorted by min_amount
+within each bucket; each bucket also keeps its offers ordered by
+max_amount. An eligibility query for (principal X, tenure Y,
+currency C):
+- binary-searches C's bucket twice: the prefix with min_amount <= X
+  and the suffix (in max_amount order) with max_amount >= X
+- intersects the two, scanning only the smaller side
+- masks the survivors on the tenure range
+
+Offers in other currencies are never touched, and a query costs
+O(log n) plus the smaller of the two candidate sets, not the whole
+catalog.
+
+The index is built lazily per process and rebuilt after
+OFFER_INDEX_TTL seconds (or on invalidate()), so bulk loads made by
+the CLI in another process are picked up.
+"""
+
+import threading
+import time
+import numpy as np
+from flask import current_app
+from app.models.lender_offer import LenderOffer
+
+
+_index = None
+_built_at = 0.0
+_lock = threading.Lock()
+
+
+class OfferIndex:
+
+    COLUMNS = (
+        "id", "min_amount", "max_amount", "min_tenure_months",
+        "max_tenure_months", "annual_interest_rate",
+        "processing_fee_percent", "processing_fee_flat",
+    )
+
+    def __init__(self, rows):
+        """
+        rows: iterables of (COLUMNS..., lender_name, product_name, currency).
+        """
+
+        rows = list(rows)
+        width = len(self.COLUMNS)
+
+        numeric = np.array(
+            [[float(value) for value in row[:width]] for row in rows],
+            dtype=np.float64
+        ).reshape(len(rows), width)
+
+        currencies = np.array([row[width + 2] or "USD" for row in rows], dtype=object)
+        names, codes = np.unique(currencies.astype(str), return_inverse=True)
+
+        # Currency buckets, each sorted by min_amount
+        order = np.lexsort((numeric[:, 1], codes))
+        numeric = numeric[order]
+        codes = codes[order]
+
+        self.ids = numeric[:, 0].astype(np.int64)
+        self.min_amount = numeric[:, 1]
+        self.max_amount = numeric[:, 2]
+        self.min_tenure = numeric[:, 3].astype(np.int64)
+        self.max_tenure = numeric[:, 4].astype(np.int64)
+        self.rates = numeric[:, 5]
+        self.fee_percent = numeric[:, 6]
+        self.fee_flat = numeric[:, 7]
+
+        labels = [(row[width], row[width + 1]) for row in rows]
+        self.labels = [labels[i] for i in order.tolist()]
+
+        # currency -> (start, stop) of its bucket
+        bounds = np.searchsorted(codes, np.arange(len(names) + 1))
+        self.buckets = {
+            str(name): (int(bounds[code]), int(bounds[code + 1]))
+            for code, name in enumerate(names)
+        }
+
+        # Positions ordered by max_amount within each bucket
+        self.by_max = np.lexsort((self.max_amount, codes))
+        self.max_sorted = self.max_amount[self.by_max]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def eligible(self, principal, tenure_months, currency="USD"):
+        """
+        Positions (into the index columns, ascending) of offers
+        covering this principal and tenure, in this currency.
+        """
+
+        if currency not in self.buckets:
+            return np.empty(0, dtype=np.int64)
+
+        start, stop = self.buckets[currency]
+
+        # min_amount <= X: positions [start, end)
+        end = start + int(np.searchsorted(self.min_amount[start:stop], principal, side="right"))
+
+        # max_amount >= X: by_max[first:stop]
+        first = start + int(np.searchsorted(self.max_sorted[start:stop], principal, side="left"))
+
+        if end - start <= stop - first:
+            candidates = start + np.flatnonzero(self.max_amount[start:end] >= principal)
+        else:
+            candidates = self.by_max[first:stop]
+            candidates = np.sort(candidates[candidates < end])
+
+        keep = (self.min_tenure[candidates] <= tenure_months) \
+            & (self.max_tenure[candidates] >= tenure_months)
+
+        return candidates[keep]
+
+    def fees(self, positions, principal):
+        """
+        Processing fees for each offer at this principal.
+        """
+        return principal * self.fee_percent[positions] / 100 + self.fee_flat[positions]
+
+    # ===============================
+    # PROCESS-WIDE INSTANCE
+    # ===============================
+    @staticmethod
+    def build():
+        """
+        Load active offers from the database.
+        """
+
+        query = LenderOffer.query.filter(LenderOffer.is_active.is_(True)).with_entities(
+            *[getattr(LenderOffer, column) for column in OfferIndex.COLUMNS],
+            LenderOffer.lender_name,
+            LenderOffer.product_name,
+            LenderOffer.currency
+        )
+
+        return OfferIndex(query.all())
+
+    @staticmethod
+    def current():
+        """
+        The process-wide index, rebuilt when older than OFFER_INDEX_TTL.
+        """
+
+        global _index, _built_at
+
+        ttl = current_app.config.get("OFFER_INDEX_TTL", 300)
+
+        with _lock:
+            if _index is None or time.monotonic() - _built_at > ttl:
+                _index = OfferIndex.build()
+                _built_at = time.monotonic()
+
+            return _index
+
+    @staticmethod
+    def invalidate():
+        global _index
+
+        with _lock:
+            _index = None
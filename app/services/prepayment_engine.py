@@ -0,0 +1,498 @@
+"""
+Prepayment Engine
+------------------
+Event-driven multi-prepayment schedule engine.
+
+A loan is split into segments between events. Within a segment the
+rate and the payment are constant, so the balance at any month comes
+from the closed-form annuity balance and the engine jumps from event
+to event: planning costs O(number of events), not O(tenure).
+
+Events (applied after the EMI of their month; month 0 = before month 1):
+- {"month": 12, "type": "lump_sum", "amount": 200000}
+- {"month": 0,  "type": "extra", "amount": 2000}      (replaces the current extra)
+- {"month": 36, "type": "rate_reset", "rate": 9.25}
+- optional "mode": "reduce_tenure" (keep EMI) or "reduce_emi"
+  (re-amortize over the months left to the original maturity)
+
+If the kept EMI can no longer repay the loan by the maturity cap
+(e.g. after an upward rate reset), it is re-amortized over the months
+left to that cap. The cap is the original maturity unless the caller
+allows the tenure to stretch (max_tenure_months, floating-rate loans).
+
+Structured loans (StructuredRepayment) add scheduled "payment"
+events that set the regular payment (step-ups, the end of a
+moratorium, ...) and an optional balloon due at maturity. For them,
+re-amortizing scales every remaining scheduled payment by the same
+factor, found from the closed-form present value of the remaining
+payment phases, so the structure survives prepayments and resets.
+Plain annuities never take that path.
+
+Totals follow the same minor-unit rules as ScheduleEngine: rounded
+closed-form closing balances, and a final row that settles the exact
+remaining balance. Re-solved payments are rounded up to the minor
+unit, like EMIEngine's EMI, so a shortfall never compounds into a
+final row larger than the payment.
+"""
+
+from itertools import groupby
+import numpy as np
+from app.services.amortization_schedule import AmortizationSchedule
+from app.services.annuity_math import AnnuityMath
+
+
+class PrepaymentEngine:
+
+    EVENT_TYPES = ("lump_sum", "extra", "rate_reset")
+
+    MODES = ("reduce_tenure", "reduce_emi")
+
+    # ===============================
+    # EVENTS
+    # ===============================
+    @staticmethod
+    def normalize_events(events, tenure_months, max_rate):
+        """
+        Validate raw event dicts and return them sorted by month.
+
+        tenure_months bounds the event months (pass the maturity cap
+        when the tenure may stretch).
+        """
+
+        if not isinstance(events, list):
+            raise ValueError("Events must be a list")
+
+        normalized = []
+
+        for event in events:
+            if not isinstance(event, dict):
+                raise ValueError("Each event must be an object")
+
+            event_type = event.get("type")
+            mode = event.get("mode", "reduce_tenure")
+
+            if event_type not in PrepaymentEngine.EVENT_TYPES:
+                raise ValueError(f"Event type must be one of: {', '.join(PrepaymentEngine.EVENT_TYPES)}")
+
+            if mode not in PrepaymentEngine.MODES:
+                raise ValueError(f"Event mode must be one of: {', '.join(PrepaymentEngine.MODES)}")
+
+            month = int(event.get("month", 0))
+
+            if month < 0 or month >= tenure_months:
+                raise ValueError(f"Event month must be between 0 and {tenure_months - 1}")
+
+            item = {"month": month, "type": event_type, "mode": mode}
+
+            if event_type == "rate_reset":
+                rate = float(event.get("rate", -1))
+
+                if rate < 0 or rate > max_rate:
+                    raise ValueError("Invalid interest rate")
+
+                item["rate"] = rate
+            else:
+                amount = float(event.get("amount", -1))
+
+                if amount < 0 or not np.isfinite(amount):
+                    raise ValueError("Event amount must be zero or positive")
+
+                item["amount"] = amount
+
+            normalized.append(item)
+
+        # Stable: events in the same month keep their request order
+        return sorted(normalized, key=lambda item: item["month"])
+
+    # ===============================
+    # PLAN
+    # ===============================
+    @staticmethod
+    def plan(principal, annual_rate, tenure_months, emi, events, quantizer,
+             max_tenure_months=None, balloon=0.0, resume=None):
+        """
+        Split the loan into closed-form segments.
+
+        reduce_emi re-amortizes to the original maturity; a kept EMI
+        may run on until max_tenure_months (default: the original tenure).
+        balloon is left for the final row to settle, as agreed.
+
+        Each segment: start month, months, opening balance (float),
+        monthly rate, EMI and extra (minor units), the lump sum paid
+        after its last month (minor units) and whether it ends the loan.
+
+        The plan also records a checkpoint (the full planner state)
+        before every event month. resume (from resume_from) restarts
+        planning at one of them; pass only the events from its month
+        on. The result is identical to planning from month 1.
+        """
+
+        to_minor = quantizer.to_minor_scalar
+        to_minor_ceil = quantizer.to_minor_ceil_scalar
+        maturity = max(max_tenure_months or tenure_months, tenure_months)
+
+        # Structured loans: scheduled payments (before scaling) and balloon
+        scheduled = [(e["month"], e["amount_minor"]) for e in events if e["type"] == "payment"]
+        balloon_minor = to_minor(balloon)
+
+        if resume is None:
+            balance = float(principal)
+            rate = float(AnnuityMath.monthly_rate(annual_rate))
+            emi_minor = to_minor(emi)
+            extra_minor = 0
+            month = 0
+            structured = bool(scheduled) or balloon_minor > 0
+            scheduled_minor = emi_minor
+            payment_scale = 1.0
+            applied = 0
+            upfront_minor = 0
+            segments = []
+            checkpoints = []
+        else:
+            state = resume["state"]
+            balance, rate, month = state["balance"], state["rate"], state["month"]
+            emi_minor, extra_minor = state["emi_minor"], state["extra_minor"]
+            structured = state["structured"]
+            scheduled_minor, payment_scale = state["scheduled_minor"], state["payment_scale"]
+            applied, upfront_minor = state["applied"], state["upfront_minor"]
+            segments = resume["segments"]
+            checkpoints = list(resume["checkpoints"])
+
+        groups = [(k, list(group)) for k, group in groupby(events, key=lambda e: e["month"])]
+        groups.append((maturity, []))
+
+        for event_month, group in groups:
+
+            # ---- level payments up to the event ----
+            months = event_month - month
+            payment = (emi_minor + extra_minor) / quantizer.scale
+
+            if months > 0:
+                last = int(AnnuityMath.payoff_month(balance, rate, payment, months))
+                closing = float(AnnuityMath.balance_after(balance, rate, payment, last))
+                final = closing <= 0 or event_month >= maturity
+
+                segments.append({
+                    "start": month + 1,
+                    "months": last if final else months,
+                    "opening": balance,
+                    "rate": rate,
+                    "emi_minor": emi_minor,
+                    "extra_minor": extra_minor,
+                    "lump_minor": 0,
+                    "final": final,
+                })
+
+                if final:
+                    break
+
+                balance = closing
+                month = event_month
+
+            # ---- events at this month ----
+            if group:
+                checkpoints.append({
+                    "month": month, "balance": balance, "rate": rate,
+                    "emi_minor": emi_minor, "extra_minor": extra_minor,
+                    "structured": structured, "scheduled_minor": scheduled_minor,
+                    "payment_scale": payment_scale, "applied": applied,
+                    "upfront_minor": upfront_minor, "segment_count": len(segments),
+                })
+
+            lump_minor = 0
+            modes = set()
+
+            for event in group:
+                if event["type"] == "payment":
+                    scheduled_minor = event["amount_minor"]
+                    emi_minor = scheduled_minor if payment_scale == 1 else \
+                        to_minor_ceil(scheduled_minor * payment_scale / quantizer.scale)
+                    continue
+
+                if event["type"] == "lump_sum":
+                    lump_minor += to_minor(event["amount"])
+                elif event["type"] == "extra":
+                    extra_minor = to_minor(event["amount"])
+                else:
+                    rate = float(AnnuityMath.monthly_rate(event["rate"]))
+
+                modes.add(event["mode"])
+                applied += 1
+
+            if lump_minor:
+                # Never prepay more than is outstanding
+                outstanding = to_minor(balance)
+                lump_minor = min(lump_minor, outstanding)
+                balance -= lump_minor / quantizer.scale
+
+                if segments:
+                    segments[-1]["lump_minor"] = lump_minor
+                else:
+                    upfront_minor = lump_minor
+
+                if lump_minor == outstanding:
+                    if segments:
+                        segments[-1]["final"] = True
+                        segments[-1]["closed_by_lump"] = True
+                    break
+
+            # Scheduled payment changes alone keep the structure as is
+            if not modes:
+                continue
+
+            # ---- EMI after the events ----
+            horizon = maturity - month
+
+            if structured:
+                payment_scale = PrepaymentEngine._rescale(
+                    balance, rate, month, maturity, modes, payment_scale,
+                    scheduled_minor, scheduled, extra_minor, balloon_minor, quantizer
+                )
+                emi_minor = to_minor_ceil(scheduled_minor * payment_scale / quantizer.scale)
+                continue
+
+            if "reduce_emi" in modes:
+                # Past the original maturity, the cap is all that is left
+                remaining = tenure_months - month if month < tenure_months else horizon
+                emi_minor = to_minor_ceil(
+                    balance * float(AnnuityMath.payment_factor(rate, remaining))
+                )
+                continue
+
+            payment = (emi_minor + extra_minor) / quantizer.scale
+            leftover = float(AnnuityMath.balance_after(balance, rate, payment, horizon))
+
+            if leftover > emi_minor / quantizer.scale:
+                emi_minor = to_minor_ceil(
+                    balance * float(AnnuityMath.payment_factor(rate, horizon))
+                )
+
+        return {
+            "principal_minor": to_minor(principal),
+            "upfront_minor": upfront_minor,
+            "segments": segments,
+            "events_applied": applied,
+            "checkpoints": checkpoints,
+            "quantizer": quantizer,
+        }
+
+    @staticmethod
+    def resume_from(plan, month):
+        """
+        Resume point for replanning when events from month on change:
+        the latest checkpoint at or before month (None if there is none)
+        and copies of the segments planned before it.
+        """
+
+        candidates = [state for state in plan["checkpoints"] if state["month"] <= month]
+
+        if not candidates:
+            return None
+
+        state = candidates[-1]
+        segments = [dict(segment) for segment in plan["segments"][:state["segment_count"]]]
+
+        # Events at the checkpoint month are replayed; undo their effect
+        if segments:
+            segments[-1].update(lump_minor=0, final=False)
+            segments[-1].pop("closed_by_lump", None)
+
+        return {"state": state, "segments": segments, "checkpoints": candidates[:-1]}
+
+    @staticmethod
+    def _rescale(balance, rate, month, maturity, modes, payment_scale,
+                 scheduled_minor, scheduled, extra_minor, balloon_minor, quantizer):
+        """
+        New scale for the remaining scheduled payments of a structured
+        loan, from their closed-form present value at the current rate.
+        """
+
+        scale = quantizer.scale
+        horizon = maturity - month
+
+        # Remaining payment phases: the current one, then each scheduled change
+        changes = [(start, amount) for start, amount in scheduled if month < start < maturity]
+        starts = np.array([month] + [start for start, _ in changes], dtype=np.float64)
+        amounts = np.array([scheduled_minor] + [amount for _, amount in changes]) / scale
+        lengths = np.append(starts[1:], maturity) - starts
+
+        scheduled_pv = float(np.sum(
+            amounts * AnnuityMath.growth(rate, month - starts) * AnnuityMath.annuity_factor(rate, lengths)
+        ))
+        balloon_pv = balloon_minor / scale * float(AnnuityMath.growth(rate, -horizon))
+        extra_pv = extra_minor / scale * float(AnnuityMath.annuity_factor(rate, horizon))
+
+        if scheduled_pv <= 0:
+            return payment_scale
+
+        if "reduce_emi" in modes:
+            return max((balance - balloon_pv) / scheduled_pv, 0.0)
+
+        # Keep the payments unless they no longer repay by maturity
+        leftover = (balance - payment_scale * scheduled_pv - extra_pv - balloon_pv) \
+            * float(AnnuityMath.growth(rate, horizon))
+
+        if leftover > scheduled_minor * payment_scale / scale:
+            return max((balance - balloon_pv - extra_pv) / scheduled_pv, 0.0)
+
+        return payment_scale
+
+    # ===============================
+    # TOTALS (O(segments))
+    # ===============================
+    @staticmethod
+    def _segment_totals(segment, opening_minor, quantizer):
+        """
+        (principal paid, interest paid, closing minor) for one segment.
+        """
+
+        months = segment["months"]
+        payment_minor = segment["emi_minor"] + segment["extra_minor"]
+
+        if segment["final"] and not segment.get("closed_by_lump"):
+            # Level rows up to L - 1, then the settling row
+            before_last = float(AnnuityMath.balance_after(
+                segment["opening"], segment["rate"], payment_minor / quantizer.scale, months - 1
+            ))
+            before_last_minor = quantizer.to_minor_scalar(before_last) if months > 1 else opening_minor
+
+            interest = (months - 1) * payment_minor - (opening_minor - before_last_minor) \
+                + quantizer.to_minor_scalar(before_last * segment["rate"])
+
+            return opening_minor, interest, 0
+
+        closing = float(AnnuityMath.balance_after(
+            segment["opening"], segment["rate"], payment_minor / quantizer.scale, months
+        ))
+        closing_minor = quantizer.to_minor_scalar(closing) if months else opening_minor
+        principal_paid = opening_minor - closing_minor
+
+        return (
+            principal_paid + segment["lump_minor"],
+            months * payment_minor - principal_paid,
+            closing_minor - segment["lump_minor"]
+        )
+
+    @staticmethod
+    def summary(plan):
+        """
+        Tenure, total interest and final EMI without building rows.
+        """
+
+        quantizer = plan["quantizer"]
+        opening_minor = plan["principal_minor"] - plan["upfront_minor"]
+        interest_minor = 0
+        months = 0
+
+        for segment in plan["segments"]:
+            _, interest, opening_minor = PrepaymentEngine._segment_totals(
+                segment, opening_minor, quantizer
+            )
+            interest_minor += interest
+            months = segment["start"] + segment["months"] - 1
+
+        last = plan["segments"][-1] if plan["segments"] else None
+        scale = quantizer.scale
+
+        return {
+            "new_tenure_months": months,
+            "total_interest": interest_minor / scale,
+            "total_payment": (plan["principal_minor"] + interest_minor) / scale,
+            "final_emi": last["emi_minor"] / scale if last else 0.0,
+            "final_extra": last["extra_minor"] / scale if last else 0.0,
+            "upfront_prepayment": plan["upfront_minor"] / scale,
+            "events_applied": plan["events_applied"],
+        }
+
+    # ===============================
+    # SCHEDULE (O(months))
+    # ===============================
+    @staticmethod
+    def schedule(plan, first_month=1, last_month=None):
+        """
+        Schedule rows from first_month to last_month (default: the
+        end). The emi column is the whole payment made that month
+        (EMI + extra + any lump sum).
+
+        Every row comes from one vectorized balance evaluation, so the
+        cost barely depends on the number of events, and a window costs
+        only its own rows.
+        """
+
+        quantizer = plan["quantizer"]
+        segments = plan["segments"]
+
+        lengths = np.array([segment["months"] for segment in segments], dtype=np.int64)
+        ends = np.cumsum(lengths)
+        total = int(ends[-1]) if segments else 0
+        stop = total if last_month is None else min(int(last_month), total)
+
+        if first_month > stop:
+            empty = np.empty(0, dtype=np.int64)
+            return AmortizationSchedule({field: empty for field in AmortizationSchedule.FIELDS}, quantizer)
+
+        payments_minor = np.array(
+            [segment["emi_minor"] + segment["extra_minor"] for segment in segments], dtype=np.int64
+        )
+        lumps_minor = np.array([segment["lump_minor"] for segment in segments], dtype=np.int64)
+        starts = ends - lengths
+
+        # Rows (0-based), plus the row before first_month for its closing balance
+        first = max(int(first_month), 1)
+        rows = np.arange(max(first - 2, 0), stop)
+        owner = np.searchsorted(ends, rows, side="right")
+
+        closing = quantizer.to_minor(AnnuityMath.balance_after(
+            np.array([segment["opening"] for segment in segments])[owner],
+            np.array([segment["rate"] for segment in segments])[owner],
+            payments_minor[owner] / quantizer.scale,
+            rows - starts[owner] + 1
+        ))
+        payment = payments_minor[owner]
+
+        at_end = rows == ends[owner] - 1
+        closing[at_end] -= lumps_minor[owner[at_end]]
+        payment[at_end] += lumps_minor[owner[at_end]]
+
+        last = segments[-1]
+        final_interest = None
+
+        if stop == total and last["final"] and not last.get("closed_by_lump"):
+            before_last = float(AnnuityMath.balance_after(
+                last["opening"], last["rate"],
+                payments_minor[-1] / quantizer.scale, last["months"] - 1
+            ))
+            final_interest = quantizer.to_minor_scalar(before_last * last["rate"])
+            closing[-1] = 0
+
+        if first > 1:
+            opening_minor = closing[0]
+            rows, closing, payment = rows[1:], closing[1:], payment[1:]
+        else:
+            opening_minor = plan["principal_minor"] - plan["upfront_minor"]
+
+        principal_paid = -np.diff(closing, prepend=opening_minor)
+        interest_paid = payment - principal_paid
+
+        if final_interest is not None:
+            interest_paid[-1] = final_interest
+
+        return AmortizationSchedule({
+            "month": rows + segments[0]["start"],
+            "emi": principal_paid + interest_paid,
+            "principal_paid": principal_paid,
+            "interest_paid": interest_paid,
+            "remaining_balance": closing,
+        }, quantizer)
+
+    @staticmethod
+    def pages(plan, page_size):
+        """
+        Yield the schedule as consecutive pages of rows, segment by
+        segment from the plan: only one page is held in memory at a time.
+        """
+
+        total = sum(segment["months"] for segment in plan["segments"])
+
+        for start in range(1, total + 1, page_size):
+            yield PrepaymentEngine.schedule(plan, start, start + page_size - 1)
@@ -10,29 +10,292 @@ Features:
 - Interest savings calculation
 - Before vs After comparison
 - Graph-ready results
+- Closed-form (log-annuity) outcomes, O(1) per simulation
+- Month-by-month reference loops kept for verification
+- Multiple events (lump sums, extra changes, rate resets) via PrepaymentEngine
+- Events on structured loans (step-up, balloon, moratorium, ...)
+- Sensitivity grids (lump x month, extra x loan) in one vectorized pass
+
+Closed-form outcomes reproduce the reference loops: the balance
+compounds monthly, the EMI is applied at month end, a lump sum lands
+after the EMI of its month, and the loan ends in the first month the
+balance reaches zero (or at the original tenure).
 """
 
-from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
 from flask import current_app
+from app.core.money import get_quantizer, round_money
+from app.services.annuity_math import AnnuityMath
 from app.services.emi_engine import EMIEngine
+from app.services.prepayment_engine import PrepaymentEngine
+from app.services.structured_repayment import StructuredRepayment
 
 
 class PrepaymentService:
 
+    # ===============================
+    # CLOSED-FORM OUTCOMES
+    # ===============================
     @staticmethod
-    def _round(value):
-        precision = current_app.config.get("DECIMAL_PRECISION", 2)
-        return float(
-            Decimal(value).quantize(
-                Decimal("1." + "0" * precision),
-                rounding=ROUND_HALF_UP
-            )
+    def lump_sum_outcome(principal, monthly_rate, emi, tenure_months, lump_sum, after_month):
+        """
+        (months to payoff, total interest paid) after a lump sum that
+        follows the EMI of after_month. Broadcasts over NumPy arrays.
+        """
+
+        principal, monthly_rate, emi, lump_sum = [
+            np.asarray(v, dtype=np.float64) for v in (principal, monthly_rate, emi, lump_sum)
+        ]
+        tenure_months = np.asarray(tenure_months, dtype=np.int64)
+        after_month = np.asarray(after_month, dtype=np.int64)
+
+        principal, monthly_rate, emi, lump_sum, tenure_months, after_month = np.broadcast_arrays(
+            principal, monthly_rate, emi, lump_sum, tenure_months, after_month
+        )
+
+        # Without the lump sum (or if it lands after payoff)
+        base_months = AnnuityMath.payoff_month(principal, monthly_rate, emi, tenure_months)
+        base_interest = AnnuityMath.interest_paid_through(
+            principal, monthly_rate, emi, base_months
+        )
+
+        applied = (after_month >= 1) & (after_month < base_months)
+        k = np.where(applied, after_month, 1)
+
+        # Phase 1: level payments up to k, then the lump sum
+        reduced = AnnuityMath.balance_after(principal, monthly_rate, emi, k) - lump_sum
+        interest_k = AnnuityMath.interest_paid_through(principal, monthly_rate, emi, k)
+
+        # Phase 2: same EMI on the reduced balance
+        remaining = np.maximum(tenure_months - k, 1)
+        settled = reduced <= 0
+        rest_principal = np.where(settled, 1.0, reduced)
+
+        rest_months = AnnuityMath.payoff_month(rest_principal, monthly_rate, emi, remaining)
+        rest_interest = AnnuityMath.interest_paid_through(
+            rest_principal, monthly_rate, emi, rest_months
+        )
+
+        months = np.where(settled, k, k + rest_months)
+        interest = np.where(settled, interest_k, interest_k + rest_interest)
+
+        return (
+            np.where(applied, months, base_months),
+            np.where(applied, interest, base_interest)
         )
 
     @staticmethod
-    def simulate_lump_sum(principal, annual_rate, tenure_months, lump_sum, after_month):
+    def monthly_extra_outcome(principal, monthly_rate, emi, tenure_months, extra_monthly):
+        """
+        (months to payoff, total interest paid) paying EMI + extra every
+        month, capped at the original tenure. Broadcasts over NumPy arrays.
+        """
+
+        payment = np.asarray(emi, dtype=np.float64) + np.asarray(extra_monthly, dtype=np.float64)
+
+        months = AnnuityMath.payoff_month(principal, monthly_rate, payment, tenure_months)
+        interest = AnnuityMath.interest_paid_through(principal, monthly_rate, payment, months)
+
+        return months, interest
+
+    @staticmethod
+    def _result(base, tenure_months, new_tenure, interest_paid):
+        new_tenure = int(new_tenure)
+
+        return {
+            "new_tenure_months": new_tenure,
+            "interest_saved": round_money(base["total_interest"] - float(interest_paid)),
+            "tenure_reduced": tenure_months - new_tenure,
+        }
+
+    # ===============================
+    # SIMULATIONS
+    # ===============================
+    @staticmethod
+    def simulate_lump_sum(principal, annual_rate, tenure_months, lump_sum, after_month, base=None):
         """
         Simulate one-time prepayment after specific month.
+
+        Pass base (an EMIEngine.calculate result) to skip recomputing it.
+        """
+
+        base = base or EMIEngine.calculate(principal, annual_rate, tenure_months)
+
+        new_tenure, interest_paid = PrepaymentService.lump_sum_outcome(
+            principal, AnnuityMath.monthly_rate(annual_rate), base["emi"],
+            tenure_months, lump_sum, after_month
+        )
+
+        return PrepaymentService._result(base, tenure_months, new_tenure, interest_paid)
+
+    @staticmethod
+    def simulate_monthly_extra(principal, annual_rate, tenure_months, extra_monthly, base=None):
+        """
+        Simulate extra monthly payment.
+
+        Pass base (an EMIEngine.calculate result) to skip recomputing it.
+        """
+
+        base = base or EMIEngine.calculate(principal, annual_rate, tenure_months)
+
+        new_tenure, interest_paid = PrepaymentService.monthly_extra_outcome(
+            principal, AnnuityMath.monthly_rate(annual_rate), base["emi"],
+            tenure_months, extra_monthly
+        )
+
+        return PrepaymentService._result(base, tenure_months, new_tenure, interest_paid)
+
+    @staticmethod
+    def simulate_events(principal, annual_rate, tenure_months, events, base=None,
+                        include_schedule=False, structure=None):
+        """
+        Simulate an ordered list of prepayment events.
+
+        With a structure, events apply to that structured loan and base
+        must be (or defaults to) its StructuredRepayment calculation.
+
+        Returns (result, schedule); schedule is None unless requested.
+        """
+
+        base, structure, events = PrepaymentService.prepare_events(
+            principal, annual_rate, tenure_months, events, base, structure
+        )
+
+        plan = PrepaymentService.plan_events(
+            principal, annual_rate, tenure_months, base, events, structure
+        )
+
+        result = PrepaymentService.events_result(plan, base, tenure_months)
+        schedule = PrepaymentEngine.schedule(plan) if include_schedule else None
+
+        return result, schedule
+
+    @staticmethod
+    def prepare_events(principal, annual_rate, tenure_months, events, base=None, structure=None):
+        """
+        Validate events and structure; returns (base, structure, events)
+        with the structure and events normalized.
+        """
+
+        if structure is not None:
+            structure = StructuredRepayment.normalize(structure, principal, tenure_months)
+            base = base or StructuredRepayment.calculate(
+                principal, annual_rate, tenure_months, structure, include_schedule=False
+            )[0]
+        else:
+            base = base or EMIEngine.calculate(principal, annual_rate, tenure_months)
+
+        config = current_app.config
+        max_events = config.get("MAX_PREPAYMENT_EVENTS", 120)
+
+        if isinstance(events, list) and len(events) > max_events:
+            raise ValueError(f"At most {max_events} events are allowed")
+
+        events = PrepaymentEngine.normalize_events(
+            events, tenure_months, config["MAX_INTEREST_RATE"]
+        )
+
+        return base, structure, events
+
+    @staticmethod
+    def plan_events(principal, annual_rate, tenure_months, base, events, structure=None, resume=None):
+        """
+        PrepaymentEngine plan for normalized events, optionally resumed
+        from a checkpoint (PrepaymentEngine.resume_from).
+        """
+
+        if structure is not None:
+            return StructuredRepayment.plan(
+                principal, annual_rate, tenure_months, structure, get_quantizer(), events, resume
+            )[0]
+
+        if resume is not None:
+            events = [event for event in events if event["month"] >= resume["state"]["month"]]
+
+        return PrepaymentEngine.plan(
+            principal, annual_rate, tenure_months, base["emi"], events, get_quantizer(),
+            resume=resume
+        )
+
+    @staticmethod
+    def events_result(plan, base, tenure_months):
+        """
+        Plan summary with savings against the base calculation.
+        """
+
+        result = PrepaymentEngine.summary(plan)
+        result["interest_saved"] = round_money(base["total_interest"] - result["total_interest"])
+        result["tenure_reduced"] = tenure_months - result["new_tenure_months"]
+
+        return result
+
+    # ===============================
+    # SENSITIVITY GRIDS
+    # ===============================
+    @staticmethod
+    def _grid_result(base_interest, tenures, new_tenure, interest_paid):
+        quantizer = get_quantizer()
+
+        return {
+            "interest_saved": quantizer.round_array(base_interest - interest_paid).tolist(),
+            "tenure_reduced": (tenures - new_tenure).tolist(),
+            "new_tenure_months": new_tenure.tolist(),
+        }
+
+    @staticmethod
+    def lump_sum_grid(principal, annual_rate, tenure_months, lump_sums, after_months, base=None):
+        """
+        simulate_lump_sum over every (lump sum, month) pair.
+
+        Matrices are indexed [lump_sum][after_month].
+        """
+
+        base = base or EMIEngine.calculate(principal, annual_rate, tenure_months)
+
+        lump_sums = np.asarray(lump_sums, dtype=np.float64)[:, None]
+        after_months = np.asarray(after_months, dtype=np.int64)[None, :]
+
+        new_tenure, interest_paid = PrepaymentService.lump_sum_outcome(
+            principal, AnnuityMath.monthly_rate(annual_rate), base["emi"],
+            tenure_months, lump_sums, after_months
+        )
+
+        return PrepaymentService._grid_result(
+            base["total_interest"], tenure_months, new_tenure, interest_paid
+        )
+
+    @staticmethod
+    def monthly_extra_grid(principals, annual_rates, tenures, extras):
+        """
+        simulate_monthly_extra over every (extra amount, loan) pair.
+
+        Matrices are indexed [extra][loan].
+        """
+
+        base = EMIEngine.calculate_batch(principals, annual_rates, tenures)
+
+        new_tenure, interest_paid = PrepaymentService.monthly_extra_outcome(
+            np.asarray(principals, dtype=np.float64)[None, :],
+            AnnuityMath.monthly_rate(np.asarray(annual_rates, dtype=np.float64))[None, :],
+            base["emi"][None, :],
+            base["tenure_months"][None, :],
+            np.asarray(extras, dtype=np.float64)[:, None]
+        )
+
+        return PrepaymentService._grid_result(
+            base["total_interest"][None, :], base["tenure_months"][None, :],
+            new_tenure, interest_paid
+        )
+
+    # ===============================
+    # REFERENCE LOOPS
+    # ===============================
+    @staticmethod
+    def simulate_lump_sum_reference(principal, annual_rate, tenure_months, lump_sum, after_month):
+        """
+        Month-by-month lump sum simulation.
+
+        Kept to verify and benchmark simulate_lump_sum.
         """
 
         base = EMIEngine.calculate(principal, annual_rate, tenure_months)
@@ -65,14 +328,16 @@ class PrepaymentService:
 
         return {
             "new_tenure_months": new_tenure,
-            "interest_saved": PrepaymentService._round(interest_saved),
+            "interest_saved": round_money(interest_saved),
             "tenure_reduced": tenure_months - new_tenure,
         }
 
     @staticmethod
-    def simulate_monthly_extra(principal, annual_rate, tenure_months, extra_monthly):
+    def simulate_monthly_extra_reference(principal, annual_rate, tenure_months, extra_monthly):
         """
-        Simulate extra monthly payment.
+        Month-by-month extra payment simulation.
+
+        Kept to verify and benchmark simulate_monthly_extra.
         """
 
         base = EMIEngine.calculate(principal, annual_rate, tenure_months)
@@ -83,7 +348,8 @@ class PrepaymentService:
         total_interest_paid = 0
         month = 0
 
-        while balance > 0:
+        # Bounded by the original tenure, like the lump sum loop
+        while balance > 0 and month < tenure_months:
             month += 1
 
             interest = balance * monthly_rate
@@ -101,7 +367,7 @@ class PrepaymentService:
 
         return {
             "new_tenure_months": new_tenure,
-            "interest_saved": PrepaymentService._round(interest_saved),
+            "interest_saved": round_money(interest_saved),
             "tenure_reduced": tenure_months - new_tenure,
         }
 
@@ -113,7 +379,7 @@ class PrepaymentService:
 
         base = EMIEngine.calculate(principal, annual_rate, tenure_months)
         extra = PrepaymentService.simulate_monthly_extra(
-            principal, annual_rate, tenure_months, extra_monthly
+            principal, annual_rate, tenure_months, extra_monthly, base=base
         )
 
         return {
@@ -122,4 +388,4 @@ class PrepaymentService:
             "tenure_reduction": extra["tenure_reduced"],
             "original_interest": base["total_interest"],
             "interest_saved": extra["interest_saved"],
-        }
\ No newline at end of file
+        }
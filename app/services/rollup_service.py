@@ -0,0 +1,359 @@
+"""
+Rollup Service
+---------------
+Daily calculation analytics without scanning the raw event table.
+
+Features:
+- Incremental: CalculationStore adds every written batch to the
+  calculation_rollups counters in the same transaction (one upsert
+  per batch, ON CONFLICT DO UPDATE on SQLite / PostgreSQL)
+- Buckets per dimension:
+    principal             1-2-5 series lower bound (100000, 200000, 500000, ...)
+    annual_interest_rate  RATE_STEP-wide bands ("8.25")
+    tenure_months         exact months
+    currency              exact code
+    all                   daily total
+- Counts are scaled by each event's sample_weight, so sampling
+  (CALCULATION_SAMPLE_RATE) does not undercount
+- Rebuild of recent days from the raw rows (repair)
+- Retention: raw rows older than N days are pruned in small chunks;
+  their rollups are kept, configurations no longer referenced by any
+  row are deleted
+- Popular buckets and daily totals read only the rollup rows, so their
+  cost depends on the date range, not on the raw table size
+"""
+
+import math
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import delete, exists, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.core.extensions import db
+from app.models.calculation import Calculation
+from app.models.calculation_rollup import CalculationRollup
+from app.models.loan_configuration import LoanConfiguration
+
+
+class RollupService:
+
+    DIMENSIONS = ("all", "principal", "annual_interest_rate", "tenure_months", "currency")
+
+    RATE_STEP = 0.25
+
+    # ===============================
+    # BUCKETS
+    # ===============================
+    @staticmethod
+    def amount_bucket(value):
+        """
+        Lower bound of value on the 1-2-5 series.
+        """
+
+        if value < 1:
+            return "0"
+
+        base = 10 ** math.floor(math.log10(value))
+
+        # Guard against log10 landing just below an exact power of ten
+        if value >= base * 10:
+            base *= 10
+
+        for step in (5, 2, 1):
+            if value >= step * base:
+                return str(step * base)
+
+    @staticmethod
+    def buckets(principal, annual_interest_rate, tenure_months, currency):
+        """
+        (dimension, bucket) pairs one calculation counts towards.
+        """
+
+        step = RollupService.RATE_STEP
+        rate_band = math.floor(round(float(annual_interest_rate) / step, 9)) * step
+
+        return (
+            ("all", "all"),
+            ("principal", RollupService.amount_bucket(float(principal))),
+            ("annual_interest_rate", f"{rate_band:.2f}"),
+            ("tenure_months", str(int(tenure_months))),
+            ("currency", currency or "USD"),
+        )
+
+    @staticmethod
+    def aggregate(items):
+        """
+        (day, principal, rate, tenure, currency, weight) items ->
+        {(day, dimension, bucket): [calculations, principal_total]}
+        """
+
+        totals = defaultdict(lambda: [0, 0.0])
+
+        for day, principal, rate, tenure, currency, weight in items:
+            for dimension, bucket in RollupService.buckets(principal, rate, tenure, currency):
+                total = totals[(day, dimension, bucket)]
+                total[0] += weight
+                total[1] += float(principal) * weight
+
+        return totals
+
+    @staticmethod
+    def _rows(totals):
+        return [
+            {
+                "day": day,
+                "dimension": dimension,
+                "bucket": bucket,
+                "calculations": round(count, 2),
+                "principal_total": round(principal_total, 2),
+            }
+            for (day, dimension, bucket), (count, principal_total) in totals.items()
+        ]
+
+    # ===============================
+    # INCREMENTAL UPDATES
+    # ===============================
+    @staticmethod
+    def add(items):
+        """
+        Add calculations to the counters (no commit: runs inside the
+        caller's transaction).
+        """
+
+        rows = RollupService._rows(RollupService.aggregate(items))
+
+        if not rows:
+            return
+
+        table = CalculationRollup.__table__
+        dialects = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+        dialect_insert = dialects.get(db.session.get_bind().dialect.name)
+
+        if dialect_insert is not None:
+            statement = dialect_insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=["day", "dimension", "bucket"],
+                set_={
+                    "calculations": table.c.calculations + statement.excluded.calculations,
+                    "principal_total": table.c.principal_total + statement.excluded.principal_total,
+                }
+            )
+            db.session.execute(statement, rows)
+            return
+
+        for row in rows:
+            updated = db.session.execute(
+                update(table)
+                .where(table.c.day == row["day"], table.c.dimension == row["dimension"],
+                       table.c.bucket == row["bucket"])
+                .values(calculations=table.c.calculations + row["calculations"],
+                        principal_total=table.c.principal_total + row["principal_total"])
+            ).rowcount
+
+            if not updated:
+                db.session.execute(insert(table), [row])
+
+    # ===============================
+    # REBUILD / RETENTION
+    # ===============================
+    @staticmethod
+    def _day(value):
+        # SQLite returns date() as text, PostgreSQL as a date
+        return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+    @staticmethod
+    def retained_since():
+        """
+        Day of the oldest raw calculation row (None if there are none).
+
+        prune cuts at day boundaries, so this day and every later one
+        still have all their raw rows.
+        """
+
+        oldest = db.session.execute(select(func.min(Calculation.created_at))).scalar()
+        return oldest.date() if oldest is not None else None
+
+    @staticmethod
+    def rebuild(since, until=None):
+        """
+        Recompute the rollups of days since..until (inclusive) from
+        the raw rows.
+
+        since is clamped to retained_since(): days already pruned keep
+        their rollups, which can no longer be recomputed.
+
+        Returns the number of rollup rows written.
+        """
+
+        retained = RollupService.retained_since()
+
+        if retained is None:
+            return 0
+
+        since = max(since, retained)
+
+        day = func.date(Calculation.created_at)
+        start = datetime.combine(since, time.min)
+
+        statement = (
+            select(
+                day, LoanConfiguration.principal, LoanConfiguration.annual_interest_rate,
+                LoanConfiguration.tenure_months, LoanConfiguration.currency,
+                func.sum(Calculation.sample_weight)
+            )
+            .join_from(Calculation, LoanConfiguration,
+                       Calculation.configuration_id == LoanConfiguration.id)
+            .where(Calculation.created_at >= start)
+            .group_by(day, LoanConfiguration.id)
+        )
+
+        window = [CalculationRollup.day >= since]
+
+        if until is not None:
+            statement = statement.where(
+                Calculation.created_at < datetime.combine(until + timedelta(days=1), time.min)
+            )
+            window.append(CalculationRollup.day <= until)
+
+        items = [
+            (RollupService._day(row[0]),) + tuple(row[1:])
+            for row in db.session.execute(statement)
+        ]
+        rows = RollupService._rows(RollupService.aggregate(items))
+
+        db.session.execute(delete(CalculationRollup).where(*window))
+
+        if rows:
+            db.session.execute(insert(CalculationRollup), rows)
+
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def prune(days, chunk_size=10000):
+        """
+        Delete raw calculation rows of the days before the last `days`
+        days, chunk by chunk (short transactions), then the
+        configurations no calculation references any more. Rollups
+        are kept.
+
+        The cutoff is a (UTC) midnight, so a day is either fully kept
+        or fully pruned, and rebuild never recomputes a partial day.
+
+        Workers remember configuration ids for at most
+        CONFIGURATION_ID_CACHE_SECONDS, well below a day, so none of
+        them still holds a deleted id.
+
+        Returns the number of calculation rows deleted.
+        """
+
+        if days < 1:
+            raise ValueError("Retention must be at least 1 day")
+
+        cutoff = datetime.combine(datetime.utcnow().date() - timedelta(days=days), time.min)
+        deleted = 0
+
+        while True:
+            oldest = (
+                select(Calculation.id)
+                .where(Calculation.created_at < cutoff)
+                .order_by(Calculation.created_at)
+                .limit(chunk_size)
+            )
+
+            count = db.session.execute(
+                delete(Calculation).where(Calculation.id.in_(oldest.scalar_subquery()))
+            ).rowcount
+            db.session.commit()
+
+            deleted += count
+
+            if count < chunk_size:
+                break
+
+        RollupService.prune_configurations(chunk_size)
+        return deleted
+
+    @staticmethod
+    def prune_configurations(chunk_size=10000):
+        """
+        Delete configurations no calculation references, chunk by chunk.
+
+        Returns the number of configurations deleted.
+        """
+
+        referenced = exists().where(Calculation.configuration_id == LoanConfiguration.id)
+        deleted = 0
+
+        while True:
+            orphans = (
+                select(LoanConfiguration.id)
+                .where(~referenced)
+                .limit(chunk_size)
+            )
+
+            count = db.session.execute(
+                delete(LoanConfiguration).where(LoanConfiguration.id.in_(orphans.scalar_subquery()))
+            ).rowcount
+            db.session.commit()
+
+            deleted += count
+
+            if count < chunk_size:
+                return deleted
+
+    # ===============================
+    # QUERIES
+    # ===============================
+    @staticmethod
+    def popular(dimension, since, until, limit=10):
+        """
+        Buckets of a dimension ranked by calculations over a day range.
+        """
+
+        if dimension not in RollupService.DIMENSIONS or dimension == "all":
+            raise ValueError(
+                f"Unknown dimension. Use one of: {', '.join(RollupService.DIMENSIONS[1:])}"
+            )
+
+        calculations = func.sum(CalculationRollup.calculations)
+
+        rows = db.session.execute(
+            select(CalculationRollup.bucket, calculations, func.sum(CalculationRollup.principal_total))
+            .where(CalculationRollup.dimension == dimension,
+                   CalculationRollup.day >= since, CalculationRollup.day <= until)
+            .group_by(CalculationRollup.bucket)
+            .order_by(calculations.desc(), CalculationRollup.bucket)
+            .limit(limit)
+        ).all()
+
+        return [
+            {
+                "bucket": bucket,
+                "calculations": round(float(count)),
+                "average_principal": round(float(principal_total) / float(count), 2) if count else 0.0,
+            }
+            for bucket, count, principal_total in rows
+        ]
+
+    @staticmethod
+    def daily_totals(since, until):
+        """
+        Calculations per day over a day range (days without any omitted).
+        """
+
+        rows = db.session.execute(
+            select(CalculationRollup.day, CalculationRollup.calculations,
+                   CalculationRollup.principal_total)
+            .where(CalculationRollup.dimension == "all",
+                   CalculationRollup.day >= since, CalculationRollup.day <= until)
+            .order_by(CalculationRollup.day)
+        ).all()
+
+        return [
+            {
+                "day": day.isoformat(),
+                "calculations": round(float(count)),
+                "principal_total": float(principal_total),
+            }
+            for day, count, principal_total in rows
+        ]
@@ -0,0 +1,123 @@
+"""
+Schedule Engine
+----------------
+Closed-form amortization schedule generator.
+
+Every month's balance comes straight from the annuity balance
+formula, so any row — or any range of rows — costs O(1) per row
+instead of a month-by-month loop from month 1.
+
+Features:
+- Integer minor-unit columns (paise / cents)
+- Rows reconcile exactly: principal sums to the loan amount and
+  every EMI equals principal + interest
+- Final row settles the exact remaining balance
+- Early payoff detection (rounded EMI may clear the loan early)
+- Random access to any month range
+- Supports zero-interest loans
+
+Closing balances are the rounded closed-form balances. Balance plus
+EMIs paid to date never decreases and rounding is monotone, so every
+interest component stays non-negative after rounding.
+"""
+
+import numpy as np
+from app.core.money import reconcile_residual
+from app.services.annuity_math import AnnuityMath
+
+
+class ScheduleEngine:
+
+    FIELDS = ("month", "emi", "principal_paid", "interest_paid", "remaining_balance")
+
+    @staticmethod
+    def plan(principal, annual_rate, tenure_months, emi, quantizer):
+        """
+        Loan constants shared by full and random-access generation.
+        """
+
+        monthly_rate = float(AnnuityMath.monthly_rate(annual_rate))
+        emi_minor = quantizer.to_minor_scalar(emi)
+        emi = emi_minor / quantizer.scale
+
+        last = int(AnnuityMath.payoff_month(
+            principal, monthly_rate, emi, tenure_months
+        ))
+
+        # Final row interest from the exact remaining balance
+        last_opening = float(AnnuityMath.balance_after(
+            principal, monthly_rate, emi, last - 1
+        ))
+
+        return {
+            "principal": principal,
+            "monthly_rate": monthly_rate,
+            "emi": emi,
+            "emi_minor": emi_minor,
+            "principal_minor": quantizer.to_minor_scalar(principal),
+            "last_month": last,
+            "last_opening_minor": quantizer.to_minor_scalar(last_opening),
+            "last_interest_minor": quantizer.to_minor_scalar(last_opening * monthly_rate),
+            "quantizer": quantizer,
+        }
+
+    @staticmethod
+    def closing_balances(plan, months):
+        """
+        Closing balance after each given month, in minor units.
+        """
+
+        months = np.asarray(months, dtype=np.int64)
+
+        balances = plan["quantizer"].to_minor(AnnuityMath.balance_after(
+            plan["principal"], plan["monthly_rate"], plan["emi"], months
+        ))
+
+        return np.where(months >= plan["last_month"], 0, balances)
+
+    @staticmethod
+    def rows(plan, first_month, last_month):
+        """
+        Rows first_month..last_month (1-based, inclusive) as
+        integer minor-unit columns. Clipped to the loan's last month.
+        """
+
+        first_month = max(int(first_month), 1)
+        last_month = min(int(last_month), plan["last_month"])
+
+        if last_month < first_month:
+            return {field: np.empty(0, dtype=np.int64) for field in ScheduleEngine.FIELDS}
+
+        balances = ScheduleEngine.closing_balances(
+            plan, np.arange(first_month - 1, last_month + 1)
+        )
+        opening = int(balances[0])
+
+        principal_paid = -np.diff(balances)
+        interest_paid = plan["emi_minor"] - principal_paid
+
+        if last_month == plan["last_month"]:
+            # Final row takes the residual, so principal sums to the balance
+            principal_paid[-1] = 0
+            reconcile_residual(principal_paid, opening)
+            interest_paid[-1] = plan["last_interest_minor"]
+
+        return {
+            "month": np.arange(first_month, last_month + 1, dtype=np.int64),
+            "emi": principal_paid + interest_paid,
+            "principal_paid": principal_paid,
+            "interest_paid": interest_paid,
+            "remaining_balance": opening - np.cumsum(principal_paid),
+        }
+
+    @staticmethod
+    def columns(principal, annual_rate, tenure_months, emi, quantizer):
+        """
+        Compute the full schedule as integer minor-unit columns.
+
+        Returns a dict of int64 NumPy arrays:
+        month, emi, principal_paid, interest_paid, remaining_balance
+        """
+
+        plan = ScheduleEngine.plan(principal, annual_rate, tenure_months, emi, quantizer)
+        return ScheduleEngine.rows(plan, 1, plan["last_month"])
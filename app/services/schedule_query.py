@@ -0,0 +1,162 @@
+"""
+Schedule Query Service
+-----------------------
+Random-access and paginated amortization queries.
+
+Answers, without building the full schedule:
+- Balance / interest / principal at month k
+- Rows k..k+n (one page)
+- Cumulative interest and principal through month k
+- Months matching a filter (e.g. interest exceeds principal)
+- The whole schedule as a stream of pages
+
+Every row comes from the closed-form annuity balance, so each
+answer costs O(1) per returned row and matches the full schedule
+from AmortizationService exactly.
+"""
+
+import math
+from app.core.money import get_quantizer
+from app.services.amortization_schedule import AmortizationSchedule
+from app.services.emi_engine import EMIEngine
+from app.services.schedule_engine import ScheduleEngine
+
+
+class ScheduleQuery:
+
+    FILTERS = ("interest_exceeds_principal", "principal_exceeds_interest")
+
+    def __init__(self, principal, annual_rate, tenure_months, currency=None):
+        calculation = EMIEngine.calculate(principal, annual_rate, tenure_months, currency)
+
+        self.quantizer = get_quantizer(currency)
+        self.calculation = calculation
+        self.plan = ScheduleEngine.plan(
+            principal, annual_rate, tenure_months, calculation["emi"], self.quantizer
+        )
+
+    @property
+    def last_month(self):
+        return self.plan["last_month"]
+
+    def _check_month(self, month):
+        if month < 1 or month > self.last_month:
+            raise ValueError(f"Month must be between 1 and {self.last_month}")
+
+    # ===============================
+    # ROWS
+    # ===============================
+    def row(self, month):
+        """
+        Single schedule row at month k.
+        """
+        self._check_month(month)
+        return self.rows(month, 1)[0]
+
+    def rows(self, start, count):
+        """
+        Rows start..start+count-1 as a columnar schedule page.
+        """
+        self._check_month(start)
+
+        if count < 1:
+            raise ValueError("Count must be at least 1")
+
+        columns = ScheduleEngine.rows(self.plan, start, start + count - 1)
+        return AmortizationSchedule(columns, self.quantizer)
+
+    def pages(self, page_size):
+        """
+        Yield the whole schedule as consecutive pages of rows.
+
+        Only one page is held in memory at a time.
+        """
+        for start in range(1, self.last_month + 1, page_size):
+            yield self.rows(start, page_size)
+
+    # ===============================
+    # CUMULATIVE
+    # ===============================
+    def cumulative(self, month):
+        """
+        Interest and principal paid through month k.
+        """
+        self._check_month(month)
+
+        plan = self.plan
+        scale = self.quantizer.scale
+
+        if month == self.last_month:
+            principal_paid = plan["principal_minor"]
+            interest_paid = (
+                (month - 1) * plan["emi_minor"]
+                - plan["principal_minor"]
+                + plan["last_opening_minor"]
+                + plan["last_interest_minor"]
+            )
+            remaining = 0
+        else:
+            remaining = int(ScheduleEngine.closing_balances(plan, [month])[0])
+            principal_paid = plan["principal_minor"] - remaining
+            interest_paid = month * plan["emi_minor"] - principal_paid
+
+        return {
+            "month": month,
+            "cumulative_interest": interest_paid / scale,
+            "cumulative_principal": principal_paid / scale,
+            "cumulative_payment": (interest_paid + principal_paid) / scale,
+            "remaining_balance": remaining / scale,
+        }
+
+    # ===============================
+    # FILTERS
+    # ===============================
+    def months_where(self, filter_name):
+        """
+        Month range (first, last) matching a filter, or None.
+
+        The principal share of a level EMI grows every month, so
+        "interest exceeds principal" is always a prefix of the loan
+        and its complement a suffix. The boundary comes from the
+        log-annuity formula and is then confirmed on the rounded rows.
+        """
+
+        if filter_name not in self.FILTERS:
+            raise ValueError(f"Unknown filter. Use one of: {', '.join(self.FILTERS)}")
+
+        boundary = self._interest_dominant_through()
+
+        if filter_name == "interest_exceeds_principal":
+            return (1, boundary) if boundary >= 1 else None
+
+        return (boundary + 1, self.last_month) if boundary < self.last_month else None
+
+    def _interest_dominant_through(self):
+        """
+        Last month whose interest exceeds its principal (0 if none).
+        """
+
+        plan = self.plan
+        rate = plan["monthly_rate"]
+        emi = plan["emi"]
+        first_principal = emi - plan["principal"] * rate
+
+        if rate == 0 or first_principal <= 0:
+            estimate = 0 if rate == 0 else self.last_month
+        else:
+            # principal_k = first_principal * (1 + r) ** (k - 1) < emi / 2
+            estimate = 1 + math.floor(
+                math.log(emi / (2 * first_principal)) / math.log1p(rate)
+            )
+
+        # Rounding can move the boundary by a row; check around the estimate
+        low = min(max(estimate - 2, 1), self.last_month)
+        high = min(max(estimate + 2, 1), self.last_month)
+
+        window = ScheduleEngine.rows(plan, low, high)
+        dominant = (window["interest_paid"] > window["principal_paid"]).nonzero()[0]
+
+        if not dominant.size:
+            return low - 1
+
+        return int(window["month"][dominant[-1]])
@@ -0,0 +1,279 @@
+"""
+Stress Test Service
+--------------------
+Monte Carlo stress tests for floating-rate loans.
+
+Rates follow a mean-reverting (Vasicek) process, sampled exactly at
+each reset date:
+
+    r' = theta + (r - theta) * exp(-kappa * dt) + sigma * sd * Z
+
+and are clipped to [0, MAX_INTEREST_RATE]. At every reset the EMI is
+recomputed (same maturity) or kept with the tenure moving (up to a
+maturity cap), exactly as in FloatingRateService: re-solved EMIs are
+rounded up and interest is totalled in minor units, so a path given
+to FloatingRateService gives the same peak EMI and total interest.
+
+Features:
+- Vectorized across paths: each reset period is one closed-form
+  annuity step (AnnuityMath) over all paths at once
+- Seeded and reproducible: paths are split into fixed-size shards,
+  each with its own child seed, so results do not depend on the
+  number of workers
+- Large runs sharded over a ProcessPoolExecutor
+- Percentiles only: total interest, peak EMI / EMI shock, tenure change
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from flask import current_app
+from app.core.money import Quantizer
+from app.services.annuity_math import AnnuityMath
+from app.services.emi_engine import EMIEngine
+from app.services.floating_rate_service import FloatingRateService
+
+
+_executor = None
+_executor_workers = 0
+
+
+def _get_executor(workers):
+    """
+    Process pool shared by every request in this process.
+    """
+
+    global _executor, _executor_workers
+
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+
+    return _executor
+
+
+def simulate_shard(spec, paths, seed):
+    """
+    Simulate one shard of rate paths.
+
+    Runs without an app context (inside pool workers); everything it
+    needs is in spec. Returns per-path (total interest, peak EMI,
+    payoff month).
+    """
+
+    rng = np.random.default_rng(seed)
+    quantizer = Quantizer(spec["exponent"])
+
+    tenure = spec["tenure_months"]
+    maturity = spec["maturity"]
+    reset_every = spec["reset_every"]
+    theta, kappa, sigma = spec["theta"], spec["kappa"], spec["sigma"]
+
+    dt = reset_every / 12
+    decay = math.exp(-kappa * dt)
+    spread = sigma * (math.sqrt((1 - decay ** 2) / (2 * kappa)) if kappa > 0 else math.sqrt(dt))
+
+    scale = quantizer.scale
+
+    balance = np.full(paths, float(spec["principal"]))
+    annual_rates = np.full(paths, float(spec["annual_rate"]))
+    emi_minor = np.full(paths, quantizer.to_minor_scalar(spec["emi"]), dtype=np.int64)
+    peak_minor = emi_minor.copy()
+
+    # Minor-unit bookkeeping, as PrepaymentEngine.summary does
+    opening_minor = np.full(paths, quantizer.to_minor_scalar(spec["principal"]), dtype=np.int64)
+    interest_minor = np.zeros(paths, dtype=np.int64)
+    payoff = np.zeros(paths, dtype=np.int64)
+    active = np.ones(paths, dtype=bool)
+
+    month = 0
+
+    while month < maturity and active.any():
+
+        # ---- reset: new rate, new EMI (rounded up, as in PrepaymentEngine.plan) ----
+        if month > 0:
+            shocks = rng.standard_normal(paths)
+            annual_rates = np.clip(
+                theta + (annual_rates - theta) * decay + spread * shocks, 0, spec["max_rate"]
+            )
+            rates = AnnuityMath.monthly_rate(annual_rates)
+
+            if spec["recompute"] == "emi":
+                new_emi = quantizer.to_minor_ceil(balance * AnnuityMath.payment_factor(rates, tenure - month))
+            else:
+                leftover = AnnuityMath.balance_after(balance, rates, emi_minor / scale, maturity - month)
+                new_emi = np.where(
+                    leftover > emi_minor / scale,
+                    quantizer.to_minor_ceil(balance * AnnuityMath.payment_factor(rates, maturity - month)),
+                    emi_minor
+                )
+
+            emi_minor = np.where(active, new_emi, emi_minor)
+            peak_minor = np.maximum(peak_minor, emi_minor)
+        else:
+            rates = AnnuityMath.monthly_rate(annual_rates)
+
+        # ---- level payments up to the next reset ----
+        months = min(reset_every, maturity - month)
+        emi = emi_minor / scale
+        closing = AnnuityMath.balance_after(balance, rates, emi, months)
+        ends = active & ((closing <= 0) | (month + months >= maturity))
+        running = active & ~ends
+
+        # Interest = payments - principal repaid, on rounded balances
+        closing_minor = np.where(running, quantizer.to_minor(closing), opening_minor)
+        interest_minor += np.where(running, months * emi_minor - (opening_minor - closing_minor), 0)
+
+        # Settling month: level EMIs, then the exact remaining balance
+        if ends.any():
+            index = np.flatnonzero(ends)
+            opening, rate, payment = balance[index], rates[index], emi[index]
+
+            last = AnnuityMath.payoff_month(opening, rate, payment, months)
+            before_last = AnnuityMath.balance_after(opening, rate, payment, last - 1)
+            before_last_minor = np.where(last > 1, quantizer.to_minor(before_last), opening_minor[index])
+
+            interest_minor[index] += (last - 1) * emi_minor[index] \
+                - (opening_minor[index] - before_last_minor) \
+                + quantizer.to_minor(before_last * rate)
+            payoff[index] = month + last
+
+        balance = np.where(running, closing, balance)
+        opening_minor = closing_minor
+        active = running
+
+        month += months
+
+    interest = quantizer.from_minor(interest_minor)
+    peak_emi = quantizer.from_minor(peak_minor)
+
+    return interest, peak_emi, payoff
+
+
+class StressTestService:
+
+    PERCENTILES = (5, 25, 50, 75, 95, 99)
+
+    @staticmethod
+    def run(principal, annual_rate, tenure_months, paths, recompute="emi",
+            reset_every=3, theta=None, kappa=0.5, sigma=1.0, max_tenure_months=None,
+            seed=None, base=None):
+        """
+        Simulate paths stochastic rate paths and summarize them.
+        """
+
+        base = base or EMIEngine.calculate(principal, annual_rate, tenure_months)
+        config = current_app.config
+
+        # ===============================
+        # VALIDATION
+        # ===============================
+        max_paths = config.get("STRESS_TEST_MAX_PATHS", 100_000)
+
+        if paths < 1 or paths > max_paths:
+            raise ValueError(f"Paths must be between 1 and {max_paths}")
+
+        if recompute not in FloatingRateService.RECOMPUTE:
+            raise ValueError(f"Recompute must be one of: {', '.join(FloatingRateService.RECOMPUTE)}")
+
+        if reset_every < 1 or reset_every > 60:
+            raise ValueError("Reset interval must be between 1 and 60 months")
+
+        theta = annual_rate if theta is None else theta
+
+        if theta < 0 or theta > config["MAX_INTEREST_RATE"]:
+            raise ValueError("Invalid long-run rate (theta)")
+
+        if kappa < 0 or sigma < 0 or not math.isfinite(kappa) or not math.isfinite(sigma):
+            raise ValueError("Kappa and sigma must be zero or positive")
+
+        if recompute == "tenure":
+            maturity = int(max_tenure_months or config["MAX_TENURE_MONTHS"])
+
+            if maturity < tenure_months or maturity > config["MAX_TENURE_MONTHS"]:
+                raise ValueError(
+                    f"Max tenure must be between {tenure_months} and {config['MAX_TENURE_MONTHS']}"
+                )
+        else:
+            maturity = tenure_months
+
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % 2 ** 32)
+
+        spec = {
+            "principal": principal,
+            "annual_rate": annual_rate,
+            "tenure_months": tenure_months,
+            "emi": base["emi"],
+            "recompute": recompute,
+            "maturity": maturity,
+            "reset_every": reset_every,
+            "theta": theta,
+            "kappa": kappa,
+            "sigma": sigma,
+            "max_rate": config["MAX_INTEREST_RATE"],
+            "exponent": config.get("DECIMAL_PRECISION", 2),
+        }
+
+        interest, peak_emi, payoff = StressTestService._simulate(spec, paths, seed)
+
+        # ===============================
+        # PERCENTILES
+        # ===============================
+        def percentiles(values, decimals=2):
+            points = np.percentile(values, StressTestService.PERCENTILES)
+            return {f"p{p}": round(float(v), decimals) for p, v in zip(StressTestService.PERCENTILES, points)}
+
+        return {
+            "paths": paths,
+            "seed": seed,
+            "model": {
+                "type": "mean_reverting",
+                "theta": theta,
+                "kappa": kappa,
+                "sigma": sigma,
+                "reset_every": reset_every,
+                "recompute": recompute,
+            },
+            "base": {
+                "emi": base["emi"],
+                "total_interest": base["total_interest"],
+                "tenure_months": tenure_months,
+            },
+            "total_interest": percentiles(interest),
+            "interest_vs_fixed": percentiles(interest - base["total_interest"]),
+            "peak_emi": percentiles(peak_emi),
+            "emi_shock_percent": percentiles((peak_emi / base["emi"] - 1) * 100, 4),
+            "tenure_change_months": percentiles(payoff - tenure_months, 1),
+            "probability_emi_increase": round(float(np.mean(peak_emi > base["emi"])), 4),
+        }
+
+    @staticmethod
+    def _simulate(spec, paths, seed):
+        """
+        Run every shard, in-process or on the process pool.
+        """
+
+        config = current_app.config
+        shard_paths = config.get("STRESS_TEST_SHARD_PATHS", 5000)
+        workers = config.get("STRESS_TEST_WORKERS") or os.cpu_count() or 1
+
+        sizes = [shard_paths] * (paths // shard_paths)
+
+        if paths % shard_paths:
+            sizes.append(paths % shard_paths)
+
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+        if len(sizes) == 1 or workers <= 1:
+            results = map(simulate_shard, [spec] * len(sizes), sizes, seeds)
+        else:
+            results = _get_executor(workers).map(simulate_shard, [spec] * len(sizes), sizes, seeds)
+
+        interest, peak_emi, payoff = zip(*results)
+
+        return np.concatenate(interest), np.concatenate(peak_emi), np.concatenate(payoff)
@@ -0,0 +1,279 @@
+"""
+Structured Repayment
+---------------------
+Repayment structures beyond the level-EMI annuity.
+
+Structures (all solved in closed form, no per-row loops):
+- {"type": "step_up", "step_percent": 5, "step_every": 12}
+- {"type": "step_down", "step_percent": 5, "step_every": 12}
+    Payments grow (shrink) geometrically every step_every months.
+    The first payment solves P = E0 * sum over steps of
+    (1 + g) ** j * v ** (m * j) * a(m), a geometric series.
+- {"type": "balloon", "balloon": 200000}  (or "balloon_percent": 20)
+    Level payments on P - balloon * v ** n; the balloon is due with
+    the last payment.
+- {"type": "bullet"}
+    Interest only; the whole principal is due at maturity.
+- {"type": "interest_only", "months": 24}
+    Interest only, then a level EMI over the remaining months.
+- {"type": "moratorium", "months": 6}
+    No payments; interest is capitalized, then a level EMI on the
+    grown balance. Capitalized months show as negative principal.
+
+A structure becomes payment phases for PrepaymentEngine (first
+payment, scheduled "payment" events and a balloon), so its schedule
+and totals come from the same segment math, and prepayment events
+can be layered on top. Level loans never come here.
+
+Amortizing phase payments are rounded up to the minor unit, like the
+level EMI, so no shortfall compounds into the final row. Interest-only
+payments are rounded half-up instead: rounding them up would repay a
+little principal every month (a bullet would partly amortize).
+
+The reported "emi" is the first amortizing payment; a moratorium adds
+"moratorium_months" for the payment-free months before it.
+"""
+
+import numpy as np
+from app.core.money import get_quantizer
+from app.services.annuity_math import AnnuityMath
+from app.services.emi_engine import EMIEngine
+from app.services.prepayment_engine import PrepaymentEngine
+
+
+class StructuredRepayment:
+
+    TYPES = ("level", "step_up", "step_down", "balloon", "bullet", "interest_only", "moratorium")
+
+    # ===============================
+    # VALIDATION
+    # ===============================
+    @staticmethod
+    def is_structured(structure):
+        """
+        Whether a raw request structure needs this module (anything but
+        absent or level). Malformed values count, so normalize rejects them.
+        """
+        return structure is not None and (
+            not isinstance(structure, dict) or structure.get("type", "level") != "level"
+        )
+
+    @staticmethod
+    def normalize(structure, principal, tenure_months):
+        """
+        Validate a raw structure dict; returns a clean copy.
+        """
+
+        if not isinstance(structure, dict):
+            raise ValueError("Structure must be an object")
+
+        kind = structure.get("type", "level")
+
+        if kind not in StructuredRepayment.TYPES:
+            raise ValueError(f"Structure type must be one of: {', '.join(StructuredRepayment.TYPES)}")
+
+        normalized = {"type": kind}
+
+        if kind in ("step_up", "step_down"):
+            percent = float(structure.get("step_percent", 5))
+            step_every = int(structure.get("step_every", 12))
+
+            if not 0 <= percent < 100:
+                raise ValueError("step_percent must be at least 0 and below 100")
+
+            if not 1 <= step_every <= tenure_months:
+                raise ValueError(f"step_every must be between 1 and {tenure_months}")
+
+            normalized.update(step_percent=percent, step_every=step_every)
+
+        elif kind == "balloon":
+            if "balloon" in structure:
+                balloon = float(structure["balloon"])
+            else:
+                balloon = principal * float(structure.get("balloon_percent", 0)) / 100
+
+            if not 0 <= balloon < principal:
+                raise ValueError("Balloon must be zero or positive and below the principal")
+
+            normalized["balloon"] = balloon
+
+        elif kind in ("interest_only", "moratorium"):
+            months = int(structure.get("months", 0))
+
+            if not 1 <= months < tenure_months:
+                raise ValueError(f"months must be between 1 and {tenure_months - 1}")
+
+            normalized["months"] = months
+
+        return normalized
+
+    # ===============================
+    # PAYMENT PHASES
+    # ===============================
+    @staticmethod
+    def phases(principal, annual_rate, tenure_months, structure, quantizer):
+        """
+        Payment phases [(first month, payment minor)] and the balloon.
+
+        structure must already be normalized.
+        """
+
+        to_minor = quantizer.to_minor_ceil_scalar
+        interest_only = quantizer.to_minor_scalar
+        rate = float(AnnuityMath.monthly_rate(annual_rate))
+        n = tenure_months
+        kind = structure["type"]
+
+        if kind in ("step_up", "step_down"):
+            sign = 1 if kind == "step_up" else -1
+            growth = 1 + sign * structure["step_percent"] / 100
+            m = structure["step_every"]
+            full, rest = divmod(n, m)
+
+            # Ratio between the present values of consecutive steps
+            ratio = growth * float(AnnuityMath.growth(rate, -m))
+            series = full if ratio == 1 else (1 - ratio ** full) / (1 - ratio)
+
+            present_value = float(AnnuityMath.annuity_factor(rate, m)) * series \
+                + growth ** full * float(AnnuityMath.growth(rate, -m * full)) \
+                * float(AnnuityMath.annuity_factor(rate, rest))
+
+            first = principal / present_value
+            steps = np.arange(full + (rest > 0))
+
+            amounts = first * growth ** steps
+
+            if quantizer.to_minor_scalar(amounts[-1]) <= 0:
+                raise ValueError(
+                    "step_percent and step_every shrink the last payment to zero; "
+                    "use a smaller step_percent or a longer step_every"
+                )
+
+            payments = quantizer.to_minor_ceil(amounts)
+            return list(zip((steps * m + 1).tolist(), payments.tolist())), 0.0
+
+        if kind == "balloon":
+            balloon = structure["balloon"]
+            financed = principal - balloon * float(AnnuityMath.growth(rate, -n))
+            return [(1, to_minor(financed * float(AnnuityMath.payment_factor(rate, n))))], balloon
+
+        if kind == "bullet":
+            return [(1, interest_only(principal * rate))], principal
+
+        if kind == "interest_only":
+            k = structure["months"]
+            return [
+                (1, interest_only(principal * rate)),
+                (k + 1, to_minor(principal * float(AnnuityMath.payment_factor(rate, n - k)))),
+            ], 0.0
+
+        if kind == "moratorium":
+            k = structure["months"]
+            grown = principal * float(AnnuityMath.growth(rate, k))
+            return [
+                (1, 0),
+                (k + 1, to_minor(grown * float(AnnuityMath.payment_factor(rate, n - k)))),
+            ], 0.0
+
+        return [(1, to_minor(EMIEngine.calculate(principal, annual_rate, n)["emi"]))], 0.0
+
+    @staticmethod
+    def payment_events(phases):
+        """
+        Scheduled "payment" events for every phase after the first.
+        """
+        return [
+            {"month": start - 1, "type": "payment", "amount_minor": amount, "mode": "reduce_tenure"}
+            for start, amount in phases[1:]
+        ]
+
+    @staticmethod
+    def plan(principal, annual_rate, tenure_months, structure, quantizer, events=(), resume=None):
+        """
+        PrepaymentEngine plan for a structured loan plus optional
+        (normalized) prepayment events, optionally resumed from a
+        checkpoint.
+        """
+
+        phases, balloon = StructuredRepayment.phases(
+            principal, annual_rate, tenure_months, structure, quantizer
+        )
+
+        # Scheduled changes first, so same-month user events see them
+        merged = sorted(
+            StructuredRepayment.payment_events(phases) + list(events),
+            key=lambda event: event["month"]
+        )
+
+        if resume is not None:
+            merged = [event for event in merged if event["month"] >= resume["state"]["month"]]
+
+        return PrepaymentEngine.plan(
+            principal, annual_rate, tenure_months, phases[0][1] / quantizer.scale,
+            merged, quantizer, balloon=balloon, resume=resume
+        ), phases, balloon
+
+    # ===============================
+    # CALCULATION
+    # ===============================
+    @staticmethod
+    def calculate(principal, annual_rate, tenure_months, structure, include_schedule=True):
+        """
+        EMIEngine-style result for a structured loan.
+
+        Returns (calculation, schedule); schedule is None unless requested.
+        """
+
+        calculation = EMIEngine.calculate(principal, annual_rate, tenure_months)
+        structure = StructuredRepayment.normalize(structure, principal, tenure_months)
+
+        quantizer = get_quantizer()
+        plan, phases, balloon = StructuredRepayment.plan(
+            principal, annual_rate, tenure_months, structure, quantizer
+        )
+        summary = PrepaymentEngine.summary(plan)
+        scale = quantizer.scale
+
+        # Phases the loan never reaches (paid off early) are dropped
+        last_month = summary["new_tenure_months"]
+        phases = [(start, amount) for start, amount in phases if start <= last_month]
+        ends = [start - 1 for start, _ in phases[1:]] + [last_month]
+
+        # A moratorium's first phase pays nothing; report the EMI after it
+        first_payment = phases[1][1] if structure["type"] == "moratorium" else phases[0][1]
+
+        if structure["type"] == "moratorium":
+            calculation["moratorium_months"] = structure["months"]
+
+        calculation.update({
+            "emi": first_payment / scale,
+            "total_interest": summary["total_interest"],
+            "total_payment": summary["total_payment"],
+            "structure": structure,
+            "balloon": balloon,
+            "payments": [
+                {"from_month": start, "to_month": end, "emi": amount / scale}
+                for (start, amount), end in zip(phases, ends)
+            ],
+        })
+
+        schedule = PrepaymentEngine.schedule(plan) if include_schedule else None
+
+        return calculation, schedule
+
+    @staticmethod
+    def pages(principal, annual_rate, tenure_months, structure, page_size):
+        """
+        The schedule of calculate() as consecutive pages of rows, built
+        from the plan's segments one page at a time (never the whole
+        schedule). Inputs are validated here, before the first page.
+        """
+
+        EMIEngine.validate_inputs(principal, annual_rate, tenure_months)
+        structure = StructuredRepayment.normalize(structure, principal, tenure_months)
+
+        plan, _, _ = StructuredRepayment.plan(
+            principal, annual_rate, tenure_months, structure, get_quantizer()
+        )
+
+        return PrepaymentEngine.pages(plan, page_size)
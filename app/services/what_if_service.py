@@ -0,0 +1,121 @@
+"""
+What-If Service
+----------------
+Incremental what-if sessions for prepayment sliders.
+
+A session keeps the loan, its current events and the engine plan
+server-side. The plan carries a checkpoint (full planner state)
+before every event month, which is where the closed-form segments
+restart anyway. When the events change:
+- the first month whose events differ is found
+- planning resumes from the latest checkpoint at or before it
+- only rows from that month on are generated and returned
+
+Rows before the changed month are unchanged by construction, and
+the resumed plan is identical to a rebuild from month 1.
+
+Sessions live in the shared cache for WHAT_IF_SESSION_TTL seconds
+after their last update, so any worker can serve the next request;
+an expired or unknown session raises LookupError.
+"""
+
+import uuid
+from app.core.caching import what_if_sessions
+from app.services.prepayment_engine import PrepaymentEngine
+from app.services.prepayment_service import PrepaymentService
+
+
+class WhatIfService:
+
+    @staticmethod
+    def _first_change(old_events, new_events):
+        """
+        Earliest month whose events differ (None if none do).
+        """
+
+        months = sorted({event["month"] for event in old_events + new_events})
+
+        for month in months:
+            old = [event for event in old_events if event["month"] == month]
+            new = [event for event in new_events if event["month"] == month]
+
+            if old != new:
+                return month
+
+        return None
+
+    @staticmethod
+    def create(principal, annual_rate, tenure_months, events=None, structure=None):
+        """
+        Open a session. Returns (session_id, result, full schedule).
+        """
+
+        base, structure, events = PrepaymentService.prepare_events(
+            principal, annual_rate, tenure_months, events or [], structure=structure
+        )
+
+        plan = PrepaymentService.plan_events(
+            principal, annual_rate, tenure_months, base, events, structure
+        )
+
+        session_id = uuid.uuid4().hex
+
+        what_if_sessions.put(session_id, {
+            "loan": (principal, annual_rate, tenure_months),
+            "structure": structure,
+            "base": base,
+            "events": events,
+            "plan": plan,
+        })
+
+        return (
+            session_id,
+            PrepaymentService.events_result(plan, base, tenure_months),
+            PrepaymentEngine.schedule(plan)
+        )
+
+    @staticmethod
+    def update(session_id, events):
+        """
+        Replace the session's events.
+
+        Returns (result, first changed month, rows from that month on).
+        """
+
+        session = what_if_sessions.get(session_id)
+
+        if session is None:
+            raise LookupError("What-if session not found or expired")
+
+        principal, annual_rate, tenure_months = session["loan"]
+        base, structure = session["base"], session["structure"]
+
+        _, _, events = PrepaymentService.prepare_events(
+            principal, annual_rate, tenure_months, events, base, structure
+        )
+
+        plan = session["plan"]
+        changed = WhatIfService._first_change(session["events"], events)
+
+        if changed is not None:
+            resume = PrepaymentEngine.resume_from(plan, changed)
+
+            plan = PrepaymentService.plan_events(
+                principal, annual_rate, tenure_months, base, events, structure, resume
+            )
+
+            what_if_sessions.put(session_id, dict(session, events=events, plan=plan))
+
+        result = PrepaymentService.events_result(plan, base, tenure_months)
+
+        # A lump sum changes the row of its own month
+        from_month = max(changed, 1) if changed is not None else result["new_tenure_months"] + 1
+
+        return result, from_month, PrepaymentEngine.schedule(plan, first_month=from_month)
+
+    @staticmethod
+    def close(session_id):
+        """
+        Drop a session. Returns whether it existed.
+        """
+        return what_if_sessions.pop(session_id) is not None
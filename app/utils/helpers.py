@@ -9,9 +9,10 @@ Reusable utility functions for:
 - Date utilities
 """
 
+import json
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
-from flask import jsonify
+from flask import jsonify, current_app
 
 
 # ===============================
@@ -68,6 +69,17 @@ def error_response(message, status=400):
     return jsonify({"status": "error", "message": message}), status
 
 
+def raw_json_response(fragments, status=200):
+    """
+    Build a JSON object response from already-encoded JSON fragments,
+    e.g. {"amortization": schedule.to_json()}.
+    """
+    body = "{" + ",".join(
+        f"{json.dumps(key)}:{fragment}" for key, fragment in fragments.items()
+    ) + "}"
+    return current_app.response_class(body, status=status, mimetype="application/json")
+
+
 # ===============================
 # PERFORMANCE TIMER
 # ===============================
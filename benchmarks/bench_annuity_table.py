@@ -0,0 +1,133 @@
+"""
+Annuity Table Benchmark
+------------------------
+Compares precomputed annuity-factor lookups against direct evaluation.
+
+Checks:
+- Table lookups are bit-identical to AnnuityMath.payment_factor
+- Time to build / memory-map the table
+- Per-batch time: table gather vs vectorized formula vs a scalar
+  (1 + r) ** n loop, and per-call time of EMIEngine.calculate
+
+Usage:
+    python benchmarks/bench_annuity_table.py [--loans 100000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.services.annuity_math import AnnuityMath
+from app.services.annuity_table import AnnuityTable
+from app.services.emi_engine import EMIEngine
+
+
+def power_factor(annual_rate, tenure_months):
+    """
+    Textbook EMI factor, one loan at a time.
+    """
+    r = annual_rate / (12 * 100)
+
+    if r == 0:
+        return 1 / tenure_months
+
+    growth = (1 + r) ** tenure_months
+    return r * growth / (growth - 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--loans", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app()
+
+    with app.app_context():
+        config = app.config
+        max_rate = config["MAX_INTEREST_RATE"]
+        max_tenure = config["MAX_TENURE_MONTHS"]
+
+        # ===============================
+        # BUILD / LOAD
+        # ===============================
+        started = time.perf_counter()
+        AnnuityTable.load(app)
+        built = time.perf_counter() - started
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "annuity_table.npy")
+            AnnuityTable.save(path, max_rate, max_tenure)
+            config["ANNUITY_TABLE_PATH"] = path
+
+            started = time.perf_counter()
+            AnnuityTable.load(app)
+            mapped = time.perf_counter() - started
+
+            AnnuityTable.unload()
+            config["ANNUITY_TABLE_PATH"] = None
+
+        AnnuityTable.load(app)
+
+        print(f"Table {int(max_rate * 100) + 1} x {max_tenure}")
+        print(f"  build in memory : {built * 1000:8.1f} ms")
+        print(f"  memory-map .npy : {mapped * 1000:8.1f} ms")
+
+        # ===============================
+        # CORRECTNESS
+        # ===============================
+        rng = np.random.default_rng(args.seed)
+        rates = rng.integers(0, int(max_rate * 100) + 1, args.loans) / 100
+        tenures = rng.integers(1, max_tenure + 1, args.loans)
+
+        looked_up = AnnuityTable.payment_factor(rates, tenures)
+        direct = AnnuityMath.payment_factor(AnnuityMath.monthly_rate(rates), tenures)
+
+        off_grid = rates + 0.001
+        mixed = AnnuityTable.payment_factor(off_grid, tenures)
+        mixed_direct = AnnuityMath.payment_factor(AnnuityMath.monthly_rate(off_grid), tenures)
+
+        print(f"Verified {args.loans} loans:")
+        print(f"  on-grid mismatches  : {int(np.count_nonzero(looked_up != direct))}")
+        print(f"  off-grid mismatches : {int(np.count_nonzero(mixed != mixed_direct))}")
+
+        # ===============================
+        # TIMING
+        # ===============================
+        def per_batch(fn, number):
+            return timeit.timeit(fn, number=number) / number
+
+        gather = per_batch(lambda: AnnuityTable.payment_factor(rates, tenures), args.repeat)
+        vectorized = per_batch(
+            lambda: AnnuityMath.payment_factor(AnnuityMath.monthly_rate(rates), tenures),
+            args.repeat
+        )
+
+        pairs = list(zip(rates.tolist(), tenures.tolist()))
+        scalar = per_batch(lambda: [power_factor(r, n) for r, n in pairs], 1)
+
+        print(f"Batch of {args.loans} factors")
+        print(f"  table gather      : {gather * 1000:8.3f} ms")
+        print(f"  vectorized log1p  : {vectorized * 1000:8.3f} ms")
+        print(f"  scalar (1+r)**n   : {scalar * 1000:8.3f} ms")
+
+        with_table = per_batch(lambda: EMIEngine.calculate(2_500_000, 8.5, 240), 2000)
+        AnnuityTable.unload()
+        without_table = per_batch(lambda: EMIEngine.calculate(2_500_000, 8.5, 240), 2000)
+
+        print("EMIEngine.calculate (single loan)")
+        print(f"  with table    : {with_table * 1e6:8.1f} us")
+        print(f"  without table : {without_table * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
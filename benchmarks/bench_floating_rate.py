@@ -0,0 +1,139 @@
+"""
+Floating Rate Benchmark
+------------------------
+Compares floating-rate schedules against a month-by-month loop and
+times them against a fixed-rate schedule of the same length.
+
+Checks:
+- Same tenure and total interest (to the cent) as the loop on a
+  random sample of rate paths, in both recompute modes
+- Time per 600-month schedule as the number of resets grows
+
+Usage:
+    python benchmarks/bench_floating_rate.py [--cases 300] [--repeat 100]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.services.amortization_service import AmortizationService
+from app.services.emi_engine import EMIEngine
+from app.services.floating_rate_service import FloatingRateService
+
+
+def payment_factor(rate, months):
+    return 1 / months if rate == 0 else rate / (1 - (1 + rate) ** -months)
+
+
+def reference(principal, annual_rate, tenure_months, rate_path, recompute, maturity):
+    """
+    (months, total interest) from a month-by-month loop.
+    """
+
+    emi = EMIEngine.calculate(principal, annual_rate, tenure_months)["emi"]
+    resets = dict(rate_path)
+    balance, rate = principal, annual_rate / 1200
+    total_interest, month = 0.0, 0
+
+    def reset(month):
+        nonlocal emi
+
+        if recompute == "emi":
+            emi = round(balance * payment_factor(rate, tenure_months - month), 2)
+            return
+
+        leftover = balance
+
+        for _ in range(maturity - month):
+            leftover = leftover * (1 + rate) - emi
+
+        if leftover > emi:
+            emi = round(balance * payment_factor(rate, maturity - month), 2)
+
+    if 0 in resets:
+        rate = resets[0] / 1200
+        reset(0)
+
+    while balance > 0.005 and month < maturity:
+        month += 1
+        interest = balance * rate
+        total_interest += interest
+
+        if balance + interest <= emi or month == maturity:
+            break
+
+        balance += interest - emi
+
+        if month in resets:
+            rate = resets[month] / 1200
+            reset(month)
+
+    return month, total_interest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app()
+
+    with app.app_context():
+        rng = random.Random(args.seed)
+        max_tenure = app.config["MAX_TENURE_MONTHS"]
+        tenure_mismatches, worst = 0, 0.0
+
+        for _ in range(args.cases):
+            principal = rng.choice([500_000, 1_000_000, 3_750_000])
+            tenure = rng.choice([120, 240, 300])
+            rate = round(rng.uniform(6, 11), 2)
+            path = sorted({
+                rng.randrange(0, tenure): round(rng.uniform(5, 13), 2)
+                for _ in range(rng.randint(1, 12))
+            }.items())
+            recompute = rng.choice(["emi", "tenure"])
+            maturity = rng.choice([tenure, 360, max_tenure]) if recompute == "tenure" else tenure
+
+            result, _ = FloatingRateService.simulate(
+                principal, rate, tenure, [list(reset) for reset in path], recompute, maturity
+            )
+            months, interest = reference(principal, rate, tenure, path, recompute, maturity)
+
+            tenure_mismatches += months != result["tenure_months"]
+            worst = max(worst, abs(interest - result["total_interest"]))
+
+        print(f"Verified {args.cases} rate paths:")
+        print(f"  tenure mismatches         : {tenure_mismatches}")
+        print(f"  worst interest difference : {worst:.4f}")
+
+        print(f"Schedule of {max_tenure} months")
+
+        fixed = timeit.timeit(
+            lambda: AmortizationService.generate_schedule(1_000_000, 8.5, max_tenure),
+            number=args.repeat
+        ) / args.repeat
+        print(f"  {'fixed rate':<20}: {fixed * 1000:8.3f} ms")
+
+        for resets in (1, 6, 12, 24):
+            path = [[month, 8 + (index % 3) * 0.5]
+                    for index, month in enumerate(range(24, max_tenure, max_tenure // resets))][:resets]
+
+            seconds = timeit.timeit(
+                lambda: FloatingRateService.simulate(
+                    1_000_000, 8.5, max_tenure, path, include_schedule=True
+                ),
+                number=args.repeat
+            ) / args.repeat
+            print(f"  {f'{resets} resets':<20}: {seconds * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
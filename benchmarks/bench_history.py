@@ -0,0 +1,138 @@
+"""
+History Pagination Benchmark
+-----------------------------
+Times GET /api/history page by page number (OFFSET) versus by cursor
+(keyset on created_at, id) at increasing depths of a large table.
+
+Checks:
+- The cursor page at each depth returns the same rows as the
+  numbered page
+- Median latency per depth: OFFSET grows with depth, keyset stays flat
+- COUNT(*) time, paid once per HISTORY_COUNT_TTL instead of per call
+
+Usage:
+    python benchmarks/bench_history.py [--rows 2000000] [--per-page 50] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Scratch database (config reads DATABASE_URL at import)
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+from sqlalchemy import func, insert, select
+
+from app import create_app
+from app.core.extensions import db, limiter
+from app.models.calculation import Calculation
+from app.models.loan_configuration import LoanConfiguration
+from app.services.history_service import HistoryService
+
+
+CHUNK = 100_000
+
+
+def populate(rows):
+    configurations = [
+        {
+            "config_hash": LoanConfiguration.content_hash(100_000 + index * 1000, 8.5, 240),
+            "principal": 100_000 + index * 1000,
+            "annual_interest_rate": 8.5,
+            "tenure_months": 240,
+            "currency": "USD",
+            "emi": 867.82,
+            "total_interest": 108_276.8,
+            "total_payment": 208_276.8,
+            "prepayment_used": False,
+        }
+        for index in range(2000)
+    ]
+    db.session.execute(insert(LoanConfiguration), configurations)
+
+    start = datetime(2024, 1, 1)
+
+    for offset in range(0, rows, CHUNK):
+        db.session.execute(insert(Calculation), [
+            {
+                "configuration_id": index % 2000 + 1,
+                "ip_address": f"10.0.{index % 250}.{index % 7}",
+                # Several rows share a second, so id breaks ties
+                "created_at": start + timedelta(seconds=index // 3),
+            }
+            for index in range(offset, min(offset + CHUNK, rows))
+        ])
+
+    db.session.commit()
+
+
+def median_ms(client, url, repeat):
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - start)
+
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    return statistics.median(timings) * 1000, response.get_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    limiter.enabled = False
+    client = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+
+        start = time.perf_counter()
+        populate(args.rows)
+        print(f"Inserted {args.rows:,} rows in {time.perf_counter() - start:.1f} s")
+
+        start = time.perf_counter()
+        db.session.execute(select(func.count()).select_from(Calculation)).scalar_one()
+        print(f"COUNT(*)                : {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+        print(f"{'page':>10} {'offset (ms)':>12} {'cursor (ms)':>12}  same rows")
+
+        pages = args.rows // args.per_page
+        depths = sorted({1, 10, 100, 1000, 10_000, pages // 2, pages})
+
+        for page in [depth for depth in depths if 1 <= depth <= pages]:
+            offset_ms, numbered = median_ms(
+                client, f"/api/history?page={page}&per_page={args.per_page}", args.repeat
+            )
+
+            # Cursor for the same page: the key of the last row before it
+            if page == 1:
+                cursor = ""
+            else:
+                previous = Calculation.query.order_by(
+                    Calculation.created_at.desc(), Calculation.id.desc()
+                ).offset((page - 1) * args.per_page - 1).first()
+                cursor = HistoryService.encode_cursor(previous)
+
+            cursor_ms, keyset = median_ms(
+                client, f"/api/history?cursor={cursor}&per_page={args.per_page}", args.repeat
+            )
+
+            same = [row["id"] for row in numbered["results"]] == [row["id"] for row in keyset["results"]]
+            print(f"{page:>10,} {offset_ms:>12.2f} {cursor_ms:>12.2f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
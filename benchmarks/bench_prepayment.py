@@ -0,0 +1,147 @@
+"""
+Prepayment Benchmark
+---------------------
+Compares the closed-form prepayment simulations against the
+month-by-month reference loops.
+
+Checks:
+- Identical results on a random sample of lump sum / extra payment cases
+- Where they differ, which one matches the loop in exact rational
+  arithmetic (the float loop drifts at high rates / long tenures)
+- Time per simulation at max tenure
+
+Usage:
+    python benchmarks/bench_prepayment.py [--cases 500] [--repeat 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.services.emi_engine import EMIEngine
+from app.services.prepayment_service import PrepaymentService
+
+
+def exact_interest_saved(principal, annual_rate, tenure_months, lump_sum, after_month, extra):
+    """
+    The reference loop in exact rational arithmetic.
+    """
+
+    base = EMIEngine.calculate(principal, annual_rate, tenure_months)
+    emi = Fraction(base["emi"])
+    monthly_rate = Fraction(annual_rate / (12 * 100))
+
+    balance = Fraction(principal)
+    total_interest = Fraction(0)
+    month = 0
+
+    while balance > 0 and month < tenure_months:
+        month += 1
+
+        interest = balance * monthly_rate
+        balance -= emi - interest + Fraction(extra)
+        total_interest += interest
+
+        if month == after_month:
+            balance -= Fraction(lump_sum)
+
+        if balance <= 0:
+            break
+
+    return month, round(float(Fraction(base["total_interest"]) - total_interest), 2)
+
+
+def simulate(case, reference=False):
+    principal, rate, tenure, lump_sum, after_month, extra = case
+
+    if extra:
+        method = PrepaymentService.simulate_monthly_extra_reference if reference \
+            else PrepaymentService.simulate_monthly_extra
+        return method(principal, rate, tenure, extra)
+
+    method = PrepaymentService.simulate_lump_sum_reference if reference \
+        else PrepaymentService.simulate_lump_sum
+    return method(principal, rate, tenure, lump_sum, after_month)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app()
+
+    with app.app_context():
+        config = app.config
+        rng = random.Random(args.seed)
+        cases = []
+
+        for _ in range(args.cases):
+            principal = round(rng.uniform(config["MIN_LOAN_AMOUNT"], config["MAX_LOAN_AMOUNT"]), 2)
+            rate = round(rng.uniform(0, config["MAX_INTEREST_RATE"]), 2)
+            tenure = rng.randint(1, config["MAX_TENURE_MONTHS"])
+
+            if rng.random() < 0.5:
+                cases.append((principal, rate, tenure,
+                              round(rng.uniform(0, principal), 2), rng.randint(1, tenure), 0))
+            else:
+                cases.append((principal, rate, tenure, 0, 0,
+                              round(rng.uniform(0.01, principal / 20), 2)))
+
+        identical = loop_drift = mismatches = 0
+
+        for case in cases:
+            fast = simulate(case)
+            reference = simulate(case, reference=True)
+
+            if fast == reference:
+                identical += 1
+                continue
+
+            months, saved = exact_interest_saved(*case)
+
+            if fast["new_tenure_months"] == months and fast["interest_saved"] == saved:
+                loop_drift += 1
+            else:
+                mismatches += 1
+
+        print(f"Verified {len(cases)} simulations:")
+        print(f"  identical to reference loop : {identical}")
+        print(f"  exact where the loop drifts : {loop_drift}")
+        print(f"  mismatching                 : {mismatches}")
+
+        max_tenure = config["MAX_TENURE_MONTHS"]
+        base = EMIEngine.calculate(5_000_000, 8.5, max_tenure)
+
+        timings = [
+            ("lump sum, reference", lambda: PrepaymentService.simulate_lump_sum_reference(
+                5_000_000, 8.5, max_tenure, 500_000, 24)),
+            ("lump sum, closed form", lambda: PrepaymentService.simulate_lump_sum(
+                5_000_000, 8.5, max_tenure, 500_000, 24, base=base)),
+            ("extra, reference", lambda: PrepaymentService.simulate_monthly_extra_reference(
+                5_000_000, 8.5, max_tenure, 1_000)),
+            ("extra, closed form", lambda: PrepaymentService.simulate_monthly_extra(
+                5_000_000, 8.5, max_tenure, 1_000, base=base)),
+        ]
+
+        # Reference loops recompute the base EMI; closed forms reuse it
+        timings.insert(0, ("EMIEngine.calculate", lambda: EMIEngine.calculate(
+            5_000_000, 8.5, max_tenure)))
+
+        print(f"Tenure {max_tenure} months")
+
+        for label, fn in timings:
+            seconds = timeit.timeit(fn, number=args.repeat) / args.repeat
+            print(f"  {label:<22}: {seconds * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Write-Behind Benchmark
+-----------------------
+Times POST /api/calculate-emi with the calculation record written in
+the request versus queued for the write-behind recorder.
+
+A slow database is simulated by sleeping before every INSERT, so the
+gap between the two modes shows how much of the request latency is
+database write time.
+
+Checks:
+- Every recorded row reaches the table once the recorder drains
+- Median / p99 request latency in both modes
+
+Usage:
+    python benchmarks/bench_write_behind.py [--requests 500] [--write-latency-ms 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Scratch database (config reads DATABASE_URL at import)
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import numpy as np
+from sqlalchemy import event
+
+from app import create_app
+from app.core.extensions import db, limiter
+from app.core.write_behind import calculation_recorder
+from app.models.calculation import Calculation
+
+
+def run(app, requests, write_behind):
+    calculation_recorder.enabled = write_behind
+    client = app.test_client()
+    timings = []
+
+    for index in range(requests):
+        start = time.perf_counter()
+        response = client.post("/api/calculate-emi", json={
+            "principal": 100_000 + index, "rate": 8.5, "tenure": 240
+        })
+        timings.append(time.perf_counter() - start)
+
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    calculation_recorder.shutdown()
+    return np.array(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--write-latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = create_app("production")
+    limiter.enabled = False
+
+    with app.app_context():
+        db.create_all()
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def slow_insert(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("INSERT"):
+                time.sleep(args.write_latency_ms / 1000)
+
+    print(f"{args.requests} requests, {args.write_latency_ms} ms per INSERT")
+
+    for label, write_behind in (("in request", False), ("write-behind", True)):
+        timings = run(app, args.requests, write_behind)
+
+        with app.app_context():
+            rows = db.session.query(Calculation).count()
+            db.session.query(Calculation).delete()
+            db.session.commit()
+
+        print(
+            f"  {label:<14}: median {np.median(timings):7.3f} ms   "
+            f"p99 {np.percentile(timings, 99):7.3f} ms   rows {rows}"
+        )
+
+
+if __name__ == "__main__":
+    main()
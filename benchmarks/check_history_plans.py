@@ -0,0 +1,74 @@
+"""
+History Query Plan Check
+-------------------------
+Regression check for the query plans behind GET /api/history, on any
+database. The same checks run under pytest (tests/test_history_plans.py)
+against SQLite; this script is for other backends such as PostgreSQL.
+
+Builds its tables in a scratch database (a new SQLite file, or the
+database given with --database-url, which must be a throwaway one:
+tables are created and about --rows rows inserted), runs ANALYZE and
+asks the planner how it would execute each history query. Fails (exit
+code 1) when a query scans calculations without an index, sorts
+instead of reading in index order, or stops using its expected index.
+
+DATABASE_URL from the environment is never used.
+
+Usage:
+    python benchmarks/check_history_plans.py [--rows 20000] [--database-url URL]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--database-url", default=None,
+                        help="Scratch database to build in (default: a new SQLite file).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Scratch database (config reads DATABASE_URL at import)
+    os.environ["DATABASE_URL"] = args.database_url or \
+        "sqlite:///" + os.path.join(tempfile.mkdtemp(), "plans.db")
+
+    from app import create_app
+    from app.core.extensions import db
+    from test_history_plans import checks, explain, populate, problems
+
+    app = create_app()
+    failures = 0
+
+    with app.app_context():
+        db.create_all()
+        populate(args.rows)
+
+        for name, statement, index in checks():
+            plan = explain(statement)
+            found = problems(plan, index)
+            failures += bool(found)
+
+            print(f"{'FAIL' if found else 'ok':<5} {name}")
+
+            for line in plan if found else []:
+                print(f"        {line}")
+
+            for problem in found:
+                print(f"      - {problem}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -42,6 +42,13 @@ class BaseConfig:
     # Optional Redis (production scaling)
     CACHE_REDIS_URL = os.getenv("REDIS_URL")
 
+    # Echo per-request memo counters (X-Compute-Memo header)
+    REQUEST_MEMO_HEADER = os.getenv("REQUEST_MEMO_HEADER", "False") == "True"
+
+    # In-process LRU result caches (entries)
+    RESULT_CACHE_MAX_ENTRIES = 1024
+    SCHEDULE_CACHE_MAX_ENTRIES = 256
+
     # ==============================
     # RATE LIMITING
     # ==============================
@@ -57,6 +64,65 @@ class BaseConfig:
     MAX_INTEREST_RATE = 50
     DECIMAL_PRECISION = 2
 
+    # Amortization query pagination
+    SCHEDULE_PAGE_SIZE = 12
+    SCHEDULE_PAGE_MAX = 120
+
+    # Rows per chunk for streamed schedules
+    STREAM_PAGE_MONTHS = 120
+
+    # Bulk pricing (schedules make each item much larger)
+    MAX_BATCH_SIZE = 5000
+    MAX_BATCH_SCHEDULES = 100
+
+    # Max share of income for all EMIs (eligibility solvers)
+    ELIGIBILITY_FOIR = 0.5
+
+    # Max events per prepayment simulation
+    MAX_PREPAYMENT_EVENTS = 120
+
+    # Max cells in one prepayment sensitivity grid
+    PREPAYMENT_GRID_MAX_CELLS = 10000
+
+    # Max offers ranked by one comparison request
+    MAX_COMPARISON_LOANS = 5000
+
+    # Seconds before a worker rebuilds its lender-offer index
+    OFFER_INDEX_TTL = 300
+
+    # Seconds an idle what-if session lives in the shared cache (use a
+    # cross-process CACHE_TYPE, e.g. RedisCache, with several workers)
+    WHAT_IF_SESSION_TTL = 1800
+
+    # Monte Carlo stress tests (workers: 0 = one per CPU)
+    STRESS_TEST_MAX_PATHS = 100_000
+    STRESS_TEST_SHARD_PATHS = 5000
+    STRESS_TEST_WORKERS = int(os.getenv("STRESS_TEST_WORKERS", "0"))
+
+    # Calculation history: write-behind batching and sampling
+    WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "False") == "True"
+    WRITE_BEHIND_QUEUE_SIZE = 10000
+    WRITE_BEHIND_BATCH_SIZE = 500
+    WRITE_BEHIND_FLUSH_SECONDS = 2.0
+    CALCULATION_SAMPLE_RATE = float(os.getenv("CALCULATION_SAMPLE_RATE", "1.0"))
+
+    # Raw calculation rows older than this are pruned (rollups are kept)
+    CALCULATION_RETENTION_DAYS = int(os.getenv("CALCULATION_RETENTION_DAYS", "90"))
+
+    # Seconds a filtered history row count is reused
+    HISTORY_COUNT_TTL = 60
+
+    # Loan configuration ids remembered per worker (skips the lookup).
+    # Must stay well below a day: pruning deletes configurations whose
+    # last calculation is past the retention window
+    CONFIGURATION_ID_CACHE_ENTRIES = 10000
+    CONFIGURATION_ID_CACHE_SECONDS = 3600
+
+    # Precomputed annuity factors (see `flask annuity-table build`),
+    # built / mapped in the app factory (the gunicorn master, before fork)
+    ANNUITY_TABLE_PRELOAD = os.getenv("ANNUITY_TABLE_PRELOAD", "False") == "True"
+    ANNUITY_TABLE_PATH = os.getenv("ANNUITY_TABLE_PATH")
+
     # ==============================
     # FEATURE FLAGS
     # ==============================
@@ -64,6 +130,7 @@ class BaseConfig:
     ENABLE_LOAN_COMPARISON = True
     ENABLE_PREPAYMENT_SIMULATOR = True
     ENABLE_CURRENCY_CONVERSION = True
+    ENABLE_WHAT_IF_SESSIONS = os.getenv("ENABLE_WHAT_IF_SESSIONS", "True") == "True"
     ENABLE_ADS = True
 
     # ==============================
@@ -100,6 +167,7 @@ class BaseConfig:
 # ==============================
 class DevelopmentConfig(BaseConfig):
     DEBUG = True
+    REQUEST_MEMO_HEADER = True
 
 
 # ==============================
@@ -114,6 +182,13 @@ class ProductionConfig(BaseConfig):
 
     CACHE_TYPE = os.getenv("CACHE_TYPE", "SimpleCache")
 
+    # Several workers serve the same what-if sessions: startup fails
+    # on a per-process CACHE_TYPE while ENABLE_WHAT_IF_SESSIONS is on
+    REQUIRE_SHARED_SESSION_CACHE = True
+
+    # Shared copy-on-write by the gunicorn workers (preload_app)
+    ANNUITY_TABLE_PRELOAD = os.getenv("ANNUITY_TABLE_PRELOAD", "True") == "True"
+
 
 # ==============================
 # CONFIG SELECTOR
@@ -0,0 +1,38 @@
+"""
+Gunicorn Configuration
+-----------------------
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+preload_app imports wsgi.py (and runs create_app) in the master
+process, so read-only data built at startup — such as the annuity
+factor table — is shared copy-on-write by every worker.
+
+Per-user state (what-if sessions) lives in the Flask-Caching store.
+With several workers it must be a cross-process backend (RedisCache,
+FileSystemCache): the production config refuses to start on a
+per-process one (see check_session_backend), and other configs warn.
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", 4))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+
+preload_app = True
+
+
+# Backends that keep entries inside one process
+PER_PROCESS_CACHES = ("SimpleCache", "NullCache", "null", "simple")
+
+
+def on_starting(server):
+    cache_type = os.getenv("CACHE_TYPE", "SimpleCache")
+
+    if server.cfg.workers > 1 and cache_type in PER_PROCESS_CACHES:
+        server.log.warning(
+            f"CACHE_TYPE={cache_type} is per-process but {server.cfg.workers} workers "
+            "are configured: what-if sessions will only be found by the worker that "
+            "created them. Use RedisCache (REDIS_URL) or sticky routing."
+        )
@@ -0,0 +1,46 @@
+"""Add lender offers catalog
+
+Revision ID: 3c9a1f5b2d47
+Revises: 7e41cbd95d65
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a1f5b2d47'
+down_revision = '7e41cbd95d65'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('lender_offers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('lender_name', sa.String(length=120), nullable=False),
+    sa.Column('product_name', sa.String(length=120), nullable=True),
+    sa.Column('min_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('max_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('min_tenure_months', sa.Integer(), nullable=False),
+    sa.Column('max_tenure_months', sa.Integer(), nullable=False),
+    sa.Column('annual_interest_rate', sa.Numeric(precision=5, scale=2), nullable=False),
+    sa.Column('processing_fee_percent', sa.Numeric(precision=5, scale=2), nullable=False),
+    sa.Column('processing_fee_flat', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('currency', sa.String(length=10), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('lender_offers', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_lender_offers_lender_name'), ['lender_name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_lender_offers_is_active'), ['is_active'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('lender_offers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_lender_offers_is_active'))
+        batch_op.drop_index(batch_op.f('ix_lender_offers_lender_name'))
+
+    op.drop_table('lender_offers')
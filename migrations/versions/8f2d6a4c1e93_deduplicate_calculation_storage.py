@@ -0,0 +1,376 @@
+"""Deduplicate calculation storage
+
+Moves the loan columns of calculations into loan_configurations (one
+row per distinct loan, keyed by content hash), leaves calculations as
+a thin event table and stores each comparison once in
+loan_comparisons. Existing rows are backfilled in chunks: one lookup,
+one multi-row insert and one executemany update per chunk, and
+comparison groups written as soon as they are read in full.
+
+Revision ID: 8f2d6a4c1e93
+Revises: 3c9a1f5b2d47
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+import hashlib
+import json
+from decimal import Decimal, ROUND_HALF_UP
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2d6a4c1e93'
+down_revision = '3c9a1f5b2d47'
+branch_labels = None
+depends_on = None
+
+
+CHUNK_SIZE = 5000
+
+LOAN_COLUMNS = (
+    'principal', 'annual_interest_rate', 'tenure_months', 'emi',
+    'total_interest', 'total_payment', 'currency', 'prepayment_used',
+    'prepayment_data',
+)
+
+calculations = sa.table(
+    'calculations',
+    sa.column('id', sa.Integer),
+    sa.column('configuration_id', sa.Integer),
+    sa.column('principal', sa.Numeric(15, 2)),
+    sa.column('annual_interest_rate', sa.Numeric(5, 2)),
+    sa.column('tenure_months', sa.Integer),
+    sa.column('emi', sa.Numeric(15, 2)),
+    sa.column('total_interest', sa.Numeric(15, 2)),
+    sa.column('total_payment', sa.Numeric(15, 2)),
+    sa.column('currency', sa.String(10)),
+    sa.column('prepayment_used', sa.Boolean),
+    sa.column('prepayment_data', sa.JSON(none_as_null=True)),
+    sa.column('comparison_group_id', sa.String(50)),
+    sa.column('user_id', sa.Integer),
+    sa.column('ip_address', sa.String(45)),
+    sa.column('created_at', sa.DateTime),
+)
+
+configurations = sa.table(
+    'loan_configurations',
+    sa.column('id', sa.Integer),
+    sa.column('config_hash', sa.String(64)),
+    sa.column('principal', sa.Numeric(15, 2)),
+    sa.column('annual_interest_rate', sa.Numeric(5, 2)),
+    sa.column('tenure_months', sa.Integer),
+    sa.column('currency', sa.String(10)),
+    sa.column('emi', sa.Numeric(15, 2)),
+    sa.column('total_interest', sa.Numeric(15, 2)),
+    sa.column('total_payment', sa.Numeric(15, 2)),
+    sa.column('prepayment_used', sa.Boolean),
+    sa.column('prepayment_data', sa.JSON(none_as_null=True)),
+    sa.column('created_at', sa.DateTime),
+)
+
+comparisons = sa.table(
+    'loan_comparisons',
+    sa.column('id', sa.Integer),
+    sa.column('comparison_group_id', sa.String(64)),
+    sa.column('loans_data', sa.JSON),
+    sa.column('best_loan_id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('ip_address', sa.String(45)),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def content_hash(principal, annual_interest_rate, tenure_months, currency, prepayment_data):
+    # Hash as of this revision. Rows of this era kept only prepayment
+    # results (no inputs), so those stay keyed by them. Later rows use
+    # LoanConfiguration.content_hash ("v2", exact inputs) instead.
+    def amount(value):
+        return str(Decimal(str(value)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+
+    payload = '|'.join([
+        amount(principal),
+        amount(annual_interest_rate),
+        str(int(tenure_months)),
+        currency or 'USD',
+        '' if prepayment_data is None else
+        json.dumps(prepayment_data, sort_keys=True, separators=(',', ':')),
+    ])
+
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def chunks(bind, table, columns, *where):
+    # Keyset scan by id, CHUNK_SIZE rows at a time
+    last_id = 0
+
+    while True:
+        rows = bind.execute(
+            sa.select(*columns)
+            .where(table.c.id > last_id, *where)
+            .order_by(table.c.id)
+            .limit(CHUNK_SIZE)
+        ).mappings().all()
+
+        if not rows:
+            return
+
+        last_id = rows[-1]['id']
+        yield rows
+
+
+def group_chunks(bind):
+    # Comparison rows by (group, id), CHUNK_SIZE rows at a time
+    group = calculations.c.comparison_group_id
+    last_group, last_id = '', 0
+
+    while True:
+        rows = bind.execute(
+            sa.select(*calculations.c)
+            .where(group.isnot(None), sa.or_(
+                group > last_group,
+                sa.and_(group == last_group, calculations.c.id > last_id)
+            ))
+            .order_by(group, calculations.c.id)
+            .limit(CHUNK_SIZE)
+        ).mappings().all()
+
+        if not rows:
+            return
+
+        last_group, last_id = rows[-1]['comparison_group_id'], rows[-1]['id']
+        yield rows
+
+
+def lookup(bind, hashes):
+    if not hashes:
+        return {}
+
+    return dict(bind.execute(
+        sa.select(configurations.c.config_hash, configurations.c.id)
+        .where(configurations.c.config_hash.in_(hashes))
+    ).all())
+
+
+def backfill_configurations(bind):
+    # Per chunk: one lookup, one multi-row insert of the new
+    # configurations, one executemany update of the events
+    for rows in chunks(bind, calculations, calculations.c,
+                       calculations.c.comparison_group_id.is_(None)):
+        hashed = [
+            (row, content_hash(
+                row['principal'], row['annual_interest_rate'], row['tenure_months'],
+                row['currency'], row['prepayment_data']
+            ))
+            for row in rows
+        ]
+
+        config_ids = lookup(bind, {config_hash for _, config_hash in hashed})
+        new = {}
+
+        for row, config_hash in hashed:
+            if config_hash not in config_ids and config_hash not in new:
+                new[config_hash] = {
+                    'config_hash': config_hash,
+                    'principal': row['principal'],
+                    'annual_interest_rate': row['annual_interest_rate'],
+                    'tenure_months': row['tenure_months'],
+                    'currency': row['currency'] or 'USD',
+                    'emi': row['emi'],
+                    'total_interest': row['total_interest'],
+                    'total_payment': row['total_payment'],
+                    'prepayment_used': row['prepayment_data'] is not None,
+                    'prepayment_data': row['prepayment_data'],
+                    'created_at': row['created_at'],
+                }
+
+        if new:
+            bind.execute(configurations.insert(), list(new.values()))
+            config_ids.update(lookup(bind, list(new)))
+
+        bind.execute(
+            calculations.update()
+            .where(calculations.c.id == sa.bindparam('row_id'))
+            .values(configuration_id=sa.bindparam('config_id')),
+            [{'row_id': row['id'], 'config_id': config_ids[config_hash]} for row, config_hash in hashed]
+        )
+
+
+def comparison_row(group_id, rows):
+    # One loan_comparisons row per group (rows were written in rank order)
+    return {
+        'comparison_group_id': group_id,
+        'loans_data': [
+            {
+                'loan_id': rank,
+                'principal': float(row['principal']),
+                'rate': float(row['annual_interest_rate']),
+                'tenure': row['tenure_months'],
+                'emi': float(row['emi']),
+                'total_interest': float(row['total_interest']),
+                'total_payment': float(row['total_payment']),
+                'best_option': rank == 1,
+            }
+            for rank, row in enumerate(rows, start=1)
+        ],
+        'best_loan_id': 1,
+        'user_id': rows[0]['user_id'],
+        'ip_address': rows[0]['ip_address'],
+        'created_at': rows[0]['created_at'],
+    }
+
+
+def backfill_comparisons(bind):
+    # Groups arrive in order, so only the group still being read is
+    # held across chunks; the finished ones are written per chunk
+    pending = []
+
+    for rows in group_chunks(bind):
+        finished = []
+
+        for row in rows:
+            if pending and pending[0]['comparison_group_id'] != row['comparison_group_id']:
+                finished.append(comparison_row(pending[0]['comparison_group_id'], pending))
+                pending = []
+
+            pending.append(row)
+
+        if finished:
+            bind.execute(comparisons.insert(), finished)
+
+    if pending:
+        bind.execute(comparisons.insert(), [comparison_row(pending[0]['comparison_group_id'], pending)])
+
+    bind.execute(calculations.delete().where(calculations.c.comparison_group_id.isnot(None)))
+
+
+def backfill(bind):
+    backfill_configurations(bind)
+    backfill_comparisons(bind)
+
+
+def upgrade():
+    op.create_table('loan_configurations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('config_hash', sa.String(length=64), nullable=False),
+    sa.Column('principal', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('annual_interest_rate', sa.Numeric(precision=5, scale=2), nullable=False),
+    sa.Column('tenure_months', sa.Integer(), nullable=False),
+    sa.Column('currency', sa.String(length=10), nullable=False),
+    sa.Column('emi', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('total_interest', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('total_payment', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('prepayment_used', sa.Boolean(), nullable=False),
+    sa.Column('prepayment_data', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('config_hash')
+    )
+
+    op.create_table('loan_comparisons',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('comparison_group_id', sa.String(length=64), nullable=False),
+    sa.Column('loans_data', sa.JSON(), nullable=False),
+    sa.Column('best_loan_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('loan_comparisons', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_loan_comparisons_comparison_group_id'), ['comparison_group_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_loan_comparisons_user_id'), ['user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_loan_comparisons_created_at'), ['created_at'], unique=False)
+
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('configuration_id', sa.Integer(), nullable=True))
+
+    backfill(op.get_bind())
+
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.drop_index('idx_principal_rate')
+
+        for column in LOAN_COLUMNS + ('comparison_group_id',):
+            batch_op.drop_column(column)
+
+        batch_op.alter_column('configuration_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_calculations_configuration_id'), ['configuration_id'], unique=False)
+        batch_op.create_foreign_key(
+            'fk_calculations_configuration_id', 'loan_configurations', ['configuration_id'], ['id']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.alter_column('configuration_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.add_column(sa.Column('principal', sa.Numeric(precision=15, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('annual_interest_rate', sa.Numeric(precision=5, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('tenure_months', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('emi', sa.Numeric(precision=15, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('total_interest', sa.Numeric(precision=15, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('total_payment', sa.Numeric(precision=15, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('currency', sa.String(length=10), nullable=True))
+        batch_op.add_column(sa.Column('prepayment_used', sa.Boolean(), nullable=True))
+        batch_op.add_column(sa.Column('prepayment_data', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('comparison_group_id', sa.String(length=50), nullable=True))
+
+    bind = op.get_bind()
+
+    # Copy the loan columns back from each event's configuration
+    bind.execute(calculations.update().values({
+        getattr(calculations.c, column): sa.select(getattr(configurations.c, column))
+        .where(configurations.c.id == calculations.c.configuration_id)
+        .scalar_subquery()
+        for column in LOAN_COLUMNS
+    }))
+
+    # Expand each comparison back into one row per loan
+    for rows in chunks(bind, comparisons, comparisons.c):
+        expanded = [
+            {
+                'principal': loan['principal'],
+                'annual_interest_rate': loan['rate'],
+                'tenure_months': loan['tenure'],
+                'emi': loan['emi'],
+                'total_interest': loan['total_interest'],
+                'total_payment': loan['total_payment'],
+                'currency': 'USD',
+                'prepayment_used': False,
+                'prepayment_data': None,
+                'comparison_group_id': row['comparison_group_id'],
+                'user_id': row['user_id'],
+                'ip_address': row['ip_address'],
+                'created_at': row['created_at'],
+            }
+            for row in rows
+            for loan in row['loans_data']
+        ]
+
+        if expanded:
+            bind.execute(calculations.insert(), expanded)
+
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_calculations_configuration_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_calculations_configuration_id'))
+        batch_op.drop_column('configuration_id')
+
+        for column, column_type in (
+            ('principal', sa.Numeric(precision=15, scale=2)),
+            ('annual_interest_rate', sa.Numeric(precision=5, scale=2)),
+            ('tenure_months', sa.Integer()),
+            ('emi', sa.Numeric(precision=15, scale=2)),
+            ('total_interest', sa.Numeric(precision=15, scale=2)),
+            ('total_payment', sa.Numeric(precision=15, scale=2)),
+        ):
+            batch_op.alter_column(column, existing_type=column_type, nullable=False)
+
+        batch_op.create_index('idx_principal_rate', ['principal', 'annual_interest_rate'], unique=False)
+
+    with op.batch_alter_table('loan_comparisons', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_loan_comparisons_created_at'))
+        batch_op.drop_index(batch_op.f('ix_loan_comparisons_user_id'))
+        batch_op.drop_index(batch_op.f('ix_loan_comparisons_comparison_group_id'))
+
+    op.drop_table('loan_comparisons')
+    op.drop_table('loan_configurations')
@@ -0,0 +1,31 @@
+"""Add history keyset index
+
+Replaces idx_created_at (a duplicate of ix_calculations_created_at)
+with (created_at, id), the order of keyset-paginated history pages.
+
+Revision ID: b5e3c7a9d214
+Revises: 8f2d6a4c1e93
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e3c7a9d214'
+down_revision = '8f2d6a4c1e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.drop_index('idx_created_at')
+        batch_op.create_index('idx_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.drop_index('idx_created_at_id')
+        batch_op.create_index('idx_created_at', ['created_at'], unique=False)
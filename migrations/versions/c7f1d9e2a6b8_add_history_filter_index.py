@@ -0,0 +1,33 @@
+"""Add history filter index
+
+(ip_address, created_at, id) serves GET /api/history?ip= in keyset
+order without a sort. ix_calculations_created_at is dropped: it is a
+prefix of idx_created_at_id. Comparison-group lookups already use
+ix_loan_comparisons_comparison_group_id.
+
+Revision ID: c7f1d9e2a6b8
+Revises: b5e3c7a9d214
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f1d9e2a6b8'
+down_revision = 'b5e3c7a9d214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.create_index('idx_ip_created_id', ['ip_address', 'created_at', 'id'], unique=False)
+        batch_op.drop_index('ix_calculations_created_at')
+
+
+def downgrade():
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.create_index('ix_calculations_created_at', ['created_at'], unique=False)
+        batch_op.drop_index('idx_ip_created_id')
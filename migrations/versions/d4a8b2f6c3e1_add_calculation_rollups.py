@@ -0,0 +1,144 @@
+"""Add calculation rollups
+
+Daily counters per (dimension, bucket), maintained as calculations are
+written, and a sample_weight per calculation event (the calls a
+sampled row stands for). Existing calculation rows are counted into
+the rollups here, with the bucket rules as of this revision.
+
+Revision ID: d4a8b2f6c3e1
+Revises: c7f1d9e2a6b8
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+import math
+from collections import defaultdict
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8b2f6c3e1'
+down_revision = 'c7f1d9e2a6b8'
+branch_labels = None
+depends_on = None
+
+
+RATE_STEP = 0.25
+
+calculations = sa.table(
+    'calculations',
+    sa.column('configuration_id', sa.Integer),
+    sa.column('created_at', sa.DateTime),
+)
+
+configurations = sa.table(
+    'loan_configurations',
+    sa.column('id', sa.Integer),
+    sa.column('principal', sa.Numeric(15, 2)),
+    sa.column('annual_interest_rate', sa.Numeric(5, 2)),
+    sa.column('tenure_months', sa.Integer),
+    sa.column('currency', sa.String(10)),
+)
+
+
+def _amount_bucket(value):
+    if value < 1:
+        return "0"
+
+    base = 10 ** math.floor(math.log10(value))
+
+    if value >= base * 10:
+        base *= 10
+
+    for step in (5, 2, 1):
+        if value >= step * base:
+            return str(step * base)
+
+
+def _buckets(principal, annual_interest_rate, tenure_months, currency):
+    rate_band = math.floor(round(float(annual_interest_rate) / RATE_STEP, 9)) * RATE_STEP
+
+    return (
+        ("all", "all"),
+        ("principal", _amount_bucket(float(principal))),
+        ("annual_interest_rate", f"{rate_band:.2f}"),
+        ("tenure_months", str(int(tenure_months))),
+        ("currency", currency or "USD"),
+    )
+
+
+def _backfill(rollups):
+    """
+    Count the existing calculation rows into the new rollups.
+    """
+
+    day = sa.func.date(calculations.c.created_at)
+
+    result = op.get_bind().execute(
+        sa.select(
+            day, configurations.c.principal, configurations.c.annual_interest_rate,
+            configurations.c.tenure_months, configurations.c.currency, sa.func.count()
+        )
+        .select_from(calculations.join(
+            configurations, calculations.c.configuration_id == configurations.c.id
+        ))
+        .where(calculations.c.created_at.isnot(None))
+        .group_by(day, configurations.c.id)
+    )
+
+    totals = defaultdict(lambda: [0, 0.0])
+
+    for row_day, principal, rate, tenure, currency, count in result:
+        # SQLite returns date() as text, PostgreSQL as a date
+        if not isinstance(row_day, date):
+            row_day = date.fromisoformat(str(row_day))
+
+        for dimension, bucket in _buckets(principal, rate, tenure, currency):
+            total = totals[(row_day, dimension, bucket)]
+            total[0] += count
+            total[1] += float(principal) * count
+
+    rows = [
+        {
+            "day": row_day,
+            "dimension": dimension,
+            "bucket": bucket,
+            "calculations": count,
+            "principal_total": round(principal_total, 2),
+        }
+        for (row_day, dimension, bucket), (count, principal_total) in totals.items()
+    ]
+
+    if rows:
+        op.bulk_insert(rollups, rows)
+
+
+def upgrade():
+    rollups = op.create_table('calculation_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('bucket', sa.String(length=32), nullable=False),
+    sa.Column('calculations', sa.Numeric(precision=20, scale=2), nullable=False),
+    sa.Column('principal_total', sa.Numeric(precision=20, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'dimension', 'bucket', name='uq_rollup_day_dimension_bucket')
+    )
+    with op.batch_alter_table('calculation_rollups', schema=None) as batch_op:
+        batch_op.create_index('idx_rollup_dimension_day', ['dimension', 'day'], unique=False)
+
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sample_weight', sa.Float(), nullable=False, server_default='1'))
+
+    _backfill(rollups)
+
+
+def downgrade():
+    with op.batch_alter_table('calculations', schema=None) as batch_op:
+        batch_op.drop_column('sample_weight')
+
+    with op.batch_alter_table('calculation_rollups', schema=None) as batch_op:
+        batch_op.drop_index('idx_rollup_dimension_day')
+
+    op.drop_table('calculation_rollups')
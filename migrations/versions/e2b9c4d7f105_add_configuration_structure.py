@@ -0,0 +1,32 @@
+"""Add configuration structure
+
+loan_configurations.structure holds the normalized repayment structure
+(step-up, balloon, ...) that is now part of the content hash, so
+structured loans no longer share the level loan's configuration.
+Level loans keep their hashes. Structured rows written before this
+revision were stored as level loans and cannot be told apart.
+
+Revision ID: e2b9c4d7f105
+Revises: d4a8b2f6c3e1
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b9c4d7f105'
+down_revision = 'd4a8b2f6c3e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('loan_configurations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('structure', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('loan_configurations', schema=None) as batch_op:
+        batch_op.drop_column('structure')
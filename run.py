@@ -35,15 +35,21 @@ def make_shell_context():
     from app.core.extensions import db
     from app.models.user import User
     from app.models.calculation import Calculation
+    from app.models.loan_configuration import LoanConfiguration
+    from app.models.calculation_rollup import CalculationRollup
     from app.models.loan_comparison import LoanComparison
     from app.models.prepayment import PrepaymentSimulation
+    from app.models.lender_offer import LenderOffer
 
     return {
         "db": db,
         "User": User,
         "Calculation": Calculation,
+        "LoanConfiguration": LoanConfiguration,
+        "CalculationRollup": CalculationRollup,
         "LoanComparison": LoanComparison,
-        "PrepaymentSimulation": PrepaymentSimulation
+        "PrepaymentSimulation": PrepaymentSimulation,
+        "LenderOffer": LenderOffer
     }
 
 
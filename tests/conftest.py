@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+
+import pytest
+import sqlalchemy as sa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Scratch database, never the real one (config reads DATABASE_URL at import)
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+from app import create_app
+from app.core.caching import clear_cache
+from app.core.extensions import db, limiter
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app("development")
+    limiter.enabled = False
+
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def database(app):
+    """
+    Empty tables (and caches, which hold row ids) for one test.
+    """
+
+    db.create_all()
+    clear_cache()
+    yield db
+    db.session.remove()
+    db.drop_all()
+    clear_cache()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def empty_database(app):
+    """
+    A database without any table (not even alembic_version), for
+    running the migrations from scratch.
+    """
+
+    def drop_everything():
+        db.session.remove()
+        metadata = sa.MetaData()
+        metadata.reflect(db.engine)
+        metadata.drop_all(db.engine)
+        clear_cache()
+
+    drop_everything()
+    yield db
+    drop_everything()
@@ -0,0 +1,39 @@
+"""
+Closed-form annuity math against month-by-month reference loops.
+"""
+
+import numpy as np
+
+from app.services.annuity_math import AnnuityMath
+
+
+def reference_payoff_month(principal, monthly_rate, payment, tenure_months):
+    balance = principal
+
+    for month in range(1, tenure_months + 1):
+        balance = balance * (1 + monthly_rate) - payment
+
+        # Below a millionth of a unit is float noise, not a balance
+        if balance <= 1e-6:
+            return month
+
+    return tenure_months
+
+
+def test_payment_that_exactly_clears_balance():
+    # -log1p(-c) / log1p(r) evaluates to 1.0000000000000002 here
+    assert AnnuityMath.payoff_month(1000, 0.03, 1030, 303) == 1
+
+
+def test_payoff_month_matches_reference_loop():
+    rng = np.random.default_rng(11)
+
+    for _ in range(2000):
+        principal = float(rng.integers(1, 1000)) * 1000
+        monthly_rate = float(rng.integers(0, 300)) / 10000
+        months = int(rng.integers(1, 60))
+        payment = np.ceil(principal * (1 + monthly_rate) ** months / months * 100) / 100
+
+        assert AnnuityMath.payoff_month(principal, monthly_rate, payment, 360) \
+            == reference_payoff_month(principal, monthly_rate, payment, 360), \
+            (principal, monthly_rate, payment)
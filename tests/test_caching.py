@@ -0,0 +1,125 @@
+"""
+Result caches and plan checkpoints: when an entry is reused and when
+it must not be.
+"""
+
+from datetime import date
+
+import pytest
+
+from app.core.caching import (
+    ResultCache, SessionStore, calculation_cache, clear_cache, schedule_cache
+)
+from app.core.money import get_quantizer
+from app.services import calculation_cache as calculation_cache_module
+from app.services.calculation_cache import CalculationCache
+from app.services.prepayment_engine import PrepaymentEngine
+
+
+@pytest.fixture
+def caches(app):
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def counts(store, since=(0, 0)):
+    """
+    (hits, misses) since an earlier counts() reading.
+    """
+
+    stats = store.stats()
+    return stats["hits"] - since[0], stats["misses"] - since[1]
+
+
+def test_equal_inputs_share_one_entry(caches):
+    before = counts(calculation_cache)
+
+    for principal in (1e6, 1000000, 1000000.0):
+        CalculationCache.calculate(principal, 8.5, 240)
+
+    assert counts(calculation_cache, before) == (2, 1)
+
+
+def test_calculations_are_recomputed_on_a_new_day(caches, monkeypatch):
+    CalculationCache.calculate(1e6, 8.5, 240)
+    CalculationCache.generate_schedule(1e6, 8.5, 240)
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.fromordinal(date.today().toordinal() + 1)
+
+    monkeypatch.setattr(calculation_cache_module, "date", Tomorrow)
+    before = counts(calculation_cache), counts(schedule_cache)
+
+    CalculationCache.calculate(1e6, 8.5, 240)
+    CalculationCache.generate_schedule(1e6, 8.5, 240)
+
+    # loan_end_date depends on the day; the schedule does not
+    assert counts(calculation_cache, before[0]) == (0, 1)
+    assert counts(schedule_cache, before[1]) == (1, 0)
+
+
+def test_cached_results_are_not_shared_mutable_state(caches):
+    first = CalculationCache.calculate(1e6, 8.5, 240)
+    first["emi"] = 0
+
+    assert CalculationCache.calculate(1e6, 8.5, 240)["emi"] != 0
+
+
+def test_least_recently_used_entry_is_evicted(caches):
+    store = ResultCache("test", 2)
+
+    store.get_or_compute("a", lambda: 1)
+    store.get_or_compute("b", lambda: 2)
+    store.get_or_compute("a", lambda: 1)
+    store.get_or_compute("c", lambda: 3)
+
+    assert store.stats()["evictions"] == 1
+    assert set(store._entries) == {"a", "c"}
+
+
+def test_entries_expire_after_max_age(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.caching.time.monotonic", lambda: now[0])
+
+    store = SessionStore("test", 10, max_age=60)
+    store.put("config", 7)
+
+    now[0] += 60
+    assert store.get("config") == 7
+
+    now[0] += 61
+    assert store.get("config") is None
+    assert store.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("changed_month", [0, 12, 36, 59])
+def test_resumed_plan_matches_a_full_replan(app, changed_month):
+    quantizer = get_quantizer()
+    events = PrepaymentEngine.normalize_events([
+        {"month": 0, "type": "extra", "amount": 2000},
+        {"month": 12, "type": "lump_sum", "amount": 100_000},
+        {"month": 36, "type": "rate_reset", "rate": 9.25, "mode": "reduce_emi"},
+        {"month": 59, "type": "lump_sum", "amount": 50_000, "mode": "reduce_emi"},
+    ], 240, 50)
+
+    cached = PrepaymentEngine.plan(1e6, 8.5, 240, 8678.23, events, quantizer)
+
+    # Change the event at changed_month; everything before it is reused
+    edited = [
+        dict(event, amount=event["amount"] * 2) if event["month"] == changed_month and "amount" in event
+        else dict(event, rate=7.5) if event["month"] == changed_month else event
+        for event in events
+    ]
+
+    resume = PrepaymentEngine.resume_from(cached, changed_month)
+    resumed = PrepaymentEngine.plan(
+        1e6, 8.5, 240, 8678.23, [e for e in edited if e["month"] >= changed_month],
+        quantizer, resume=resume
+    )
+    full = PrepaymentEngine.plan(1e6, 8.5, 240, 8678.23, edited, quantizer)
+
+    assert resumed["segments"] == full["segments"]
+    assert PrepaymentEngine.summary(resumed) == PrepaymentEngine.summary(full)
@@ -0,0 +1,36 @@
+"""
+Deduplicated calculation history: configurations keyed by content hash.
+"""
+
+from decimal import Decimal
+
+from app.models.loan_configuration import LoanConfiguration
+
+
+def test_equal_inputs_hash_alike():
+    assert LoanConfiguration.content_hash(1e6, 8.5, 240) \
+        == LoanConfiguration.content_hash(1000000, Decimal("8.50"), 240) \
+        == LoanConfiguration.content_hash(Decimal("1000000.00"), "8.5", 240)
+
+
+def test_inputs_with_different_results_never_share_a_hash():
+    assert LoanConfiguration.content_hash(100000, 8.125, 240) \
+        != LoanConfiguration.content_hash(100000, 8.13, 240)
+
+    assert LoanConfiguration.content_hash(100000.004, 8.5, 240) \
+        != LoanConfiguration.content_hash(100000.00, 8.5, 240)
+
+
+def test_history_keeps_each_loans_emi(database, client):
+    emis = {}
+
+    for rate in (8.125, 8.13):
+        response = client.post("/api/calculate-emi", json={"principal": 100000, "rate": rate, "tenure": 240})
+        emis[rate] = response.get_json()["calculation"]["emi"]
+
+    assert emis[8.125] != emis[8.13]
+
+    rows = client.get("/api/history").get_json()["results"]
+
+    assert database.session.query(LoanConfiguration).count() == 2
+    assert sorted(row["emi"] for row in rows) == sorted(emis.values())
@@ -0,0 +1,31 @@
+"""
+Loan comparison: ranking and per-loan validation.
+"""
+
+import pytest
+
+LOAN = {"principal": 1_000_000, "rate": 8.5, "tenure": 240}
+
+
+def compare(client, loans):
+    return client.post("/api/compare-loans", json={"loans": loans})
+
+
+def test_ranks_cheapest_first(database, client):
+    response = compare(client, [LOAN, dict(LOAN, rate=8.2)])
+    results = response.get_json()["results"]
+
+    assert response.status_code == 200
+    assert [loan["loan_id"] for loan in results] == [2, 1]
+
+
+@pytest.mark.parametrize("broken, message", [
+    ({"principal": 1_000_000, "rate": 8.5}, "Loan 2: missing tenure"),
+    ({"principal": 1_000_000, "rate": "abc", "tenure": 240}, "Loan 2: principal, rate and tenure must be numbers"),
+    ({"principal": 1_000_000, "rate": -1, "tenure": 240}, "Loan 2: Invalid interest rate"),
+])
+def test_invalid_loan_is_a_400_naming_it(database, client, broken, message):
+    response = compare(client, [LOAN, broken])
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == message
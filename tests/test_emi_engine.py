@@ -0,0 +1,50 @@
+"""
+EMI engine invariants over the whole valid input range.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.amortization_service import AmortizationService
+from app.services.emi_engine import EMIEngine
+
+
+def grid(config):
+    rates = np.linspace(0, config["MAX_INTEREST_RATE"], 26)
+    tenures = np.unique(np.linspace(1, config["MAX_TENURE_MONTHS"], 31).astype(int))
+    principals = (config["MIN_LOAN_AMOUNT"], 1_234_567.89, config["MAX_LOAN_AMOUNT"])
+
+    return [
+        (float(principal), round(float(rate), 2), int(tenure))
+        for principal in principals
+        for rate in rates
+        for tenure in tenures
+    ]
+
+
+def test_final_row_never_exceeds_emi(app):
+    for principal, rate, tenure in grid(app.config):
+        calculation = EMIEngine.calculate(principal, rate, tenure)
+        rows = AmortizationService.generate_schedule(principal, rate, tenure).to_list()
+
+        assert len(rows) <= tenure
+        assert rows[-1]["emi"] <= calculation["emi"], (principal, rate, tenure)
+        assert rows[-1]["remaining_balance"] == 0
+
+
+def test_totals_match_schedule(app):
+    for principal, rate, tenure in grid(app.config):
+        calculation = EMIEngine.calculate(principal, rate, tenure)
+        rows = AmortizationService.generate_schedule(principal, rate, tenure).to_list()
+
+        assert calculation["total_payment"] == pytest.approx(
+            sum(row["emi"] for row in rows), abs=0.005
+        )
+
+
+def test_high_rate_long_tenure_has_no_balloon(app):
+    calculation = EMIEngine.calculate(1_234_567.89, 40, 531)
+    rows = AmortizationService.generate_schedule(1_234_567.89, 40, 531).to_list()
+
+    assert rows[-1]["emi"] <= calculation["emi"]
+    assert calculation["total_payment"] < calculation["emi"] * 531
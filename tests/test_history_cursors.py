@@ -0,0 +1,124 @@
+"""
+Keyset (cursor) pagination of GET /api/history.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.extensions import db
+from app.models.calculation import Calculation
+from app.models.loan_configuration import LoanConfiguration
+
+START = datetime(2024, 1, 1)
+
+
+def add_calculations(count, first_second=0):
+    """
+    count rows, four per timestamp (ties broken by id), two IPs.
+    """
+
+    db.session.execute(insert(Calculation), [
+        {
+            "configuration_id": 1,
+            "ip_address": f"10.0.0.{index % 2}",
+            "created_at": START + timedelta(seconds=first_second + index // 4),
+        }
+        for index in range(count)
+    ])
+    db.session.commit()
+
+
+@pytest.fixture
+def history(database):
+    db.session.execute(insert(LoanConfiguration), [{
+        "config_hash": LoanConfiguration.content_hash(100_000, 8.5, 240),
+        "principal": 100_000, "annual_interest_rate": 8.5, "tenure_months": 240,
+        "currency": "USD", "emi": 867.82, "total_interest": 108_276.8,
+        "total_payment": 208_276.8, "prepayment_used": False,
+    }])
+    add_calculations(23)
+
+    return database
+
+
+def newest_first(ip_address=None):
+    query = Calculation.query
+
+    if ip_address:
+        query = query.filter_by(ip_address=ip_address)
+
+    return [row.id for row in query.order_by(Calculation.created_at.desc(), Calculation.id.desc())]
+
+
+def walk(client, per_page, **params):
+    """
+    Every page from the first cursor on; returns (ids, pages).
+    """
+
+    ids, pages, cursor = [], 0, ""
+
+    while cursor is not None:
+        body = client.get("/api/history", query_string={
+            "cursor": cursor, "per_page": per_page, **params
+        }).get_json()
+
+        ids += [row["id"] for row in body["results"]]
+        pages += 1
+        cursor = body["next_cursor"]
+
+    return ids, pages
+
+
+@pytest.mark.parametrize("per_page", [1, 4, 5, 23, 50])
+def test_cursor_pages_cover_every_row_once_in_order(history, client, per_page):
+    ids, pages = walk(client, per_page)
+
+    assert ids == newest_first()
+    assert pages == max(1, -(-23 // per_page))
+
+
+def test_cursor_pages_respect_the_ip_filter(history, client):
+    ids, _ = walk(client, 3, ip="10.0.0.1")
+
+    assert ids == newest_first("10.0.0.1")
+
+
+def test_newer_rows_do_not_shift_later_pages(history, client):
+    first = client.get("/api/history", query_string={"cursor": "", "per_page": 10}).get_json()
+
+    # Rows recorded after the first page never appear on the later ones
+    add_calculations(8, first_second=3600)
+
+    rest, cursor = [], first["next_cursor"]
+
+    while cursor is not None:
+        body = client.get("/api/history", query_string={"cursor": cursor, "per_page": 10}).get_json()
+        rest += [row["id"] for row in body["results"]]
+        cursor = body["next_cursor"]
+
+    assert [row["id"] for row in first["results"]] + rest == newest_first()[8:]
+
+
+def test_offset_page_hands_over_to_cursors(history, client):
+    first = client.get("/api/history", query_string={"page": 1, "per_page": 6}).get_json()
+    second = client.get("/api/history", query_string={"cursor": first["next_cursor"], "per_page": 6}).get_json()
+
+    assert first["total_records"] == 23
+    assert [row["id"] for row in first["results"] + second["results"]] == newest_first()[:12]
+
+
+def test_cursor_total_is_opt_in(history, client):
+    plain = client.get("/api/history", query_string={"cursor": ""}).get_json()
+    counted = client.get("/api/history", query_string={"cursor": "", "include_total": 1}).get_json()
+
+    assert "total_records" not in plain
+    assert counted["total_records"] == 23
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "bm9waXBl", "!!"])
+def test_malformed_cursor_is_a_400(history, client, cursor):
+    response = client.get("/api/history", query_string={"cursor": cursor})
+
+    assert response.status_code == 400
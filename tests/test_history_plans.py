@@ -0,0 +1,131 @@
+"""
+Query plans behind GET /api/history: every history query reads
+calculations / loan_comparisons through its index, in index order.
+
+benchmarks/check_history_plans.py runs the same checks against any
+scratch database (e.g. PostgreSQL).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select, text
+
+from app.core.extensions import db
+from app.models.calculation import Calculation
+from app.models.loan_comparison import LoanComparison
+from app.models.loan_configuration import LoanConfiguration
+from app.services.history_service import HistoryService
+
+
+def populate(rows):
+    db.session.execute(insert(LoanConfiguration), [
+        {
+            "config_hash": LoanConfiguration.content_hash(100_000 + index, 8.5, 240),
+            "principal": 100_000 + index,
+            "annual_interest_rate": 8.5,
+            "tenure_months": 240,
+            "currency": "USD",
+            "emi": 867.82,
+            "total_interest": 108_276.8,
+            "total_payment": 208_276.8,
+            "prepayment_used": False,
+        }
+        for index in range(200)
+    ])
+
+    start = datetime(2024, 1, 1)
+
+    db.session.execute(insert(Calculation), [
+        {
+            "configuration_id": index % 200 + 1,
+            "ip_address": f"10.0.0.{index % 250}",
+            "created_at": start + timedelta(seconds=index),
+        }
+        for index in range(rows)
+    ])
+
+    db.session.execute(insert(LoanComparison), [
+        {
+            "comparison_group_id": f"group-{index}",
+            "loans_data": [],
+            "created_at": start + timedelta(seconds=index),
+        }
+        for index in range(rows // 10)
+    ])
+
+    db.session.commit()
+    db.session.execute(text("ANALYZE"))
+
+
+def checks():
+    """
+    (name, statement, index the plan must use)
+    """
+
+    cursor = HistoryService.encode_cursor(
+        db.session.execute(HistoryService.offset_statement(5, 50)).first()
+    )
+
+    return [
+        ("latest page", HistoryService.keyset_statement(51), "idx_created_at_id"),
+        ("page after cursor", HistoryService.keyset_statement(51, cursor), "idx_created_at_id"),
+        ("ip: latest page", HistoryService.keyset_statement(51, None, "10.0.0.7"), "idx_ip_created_id"),
+        ("ip: page after cursor", HistoryService.keyset_statement(51, cursor, "10.0.0.7"), "idx_ip_created_id"),
+        ("ip: page number", HistoryService.offset_statement(3, 50, "10.0.0.7"), "idx_ip_created_id"),
+        ("ip: total",
+         select(func.count()).select_from(Calculation).where(Calculation.ip_address == "10.0.0.7"),
+         "idx_ip_created_id"),
+        ("comparison group",
+         select(LoanComparison).where(LoanComparison.comparison_group_id == "group-7"),
+         "ix_loan_comparisons_comparison_group_id"),
+    ]
+
+
+def explain(statement):
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+    if dialect.name == "sqlite":
+        return [row[-1] for row in db.session.execute(text("EXPLAIN QUERY PLAN " + sql))]
+
+    return [row[0] for row in db.session.execute(text("EXPLAIN " + sql))]
+
+
+def problems(plan, index):
+    found = []
+    joined = "\n".join(plan)
+
+    if index not in joined:
+        found.append(f"does not use {index}")
+
+    for line in plan:
+        # SQLite: "SCAN calculations" without an index / a temp sort;
+        # PostgreSQL: "Seq Scan on calculations" / "Sort"
+        if ("SCAN calculations" in line and "INDEX" not in line) \
+                or "Seq Scan on calculations" in line:
+            found.append("full scan of calculations")
+
+        if "TEMP B-TREE" in line or line.strip().startswith("Sort"):
+            found.append("sorts rows instead of reading in index order")
+
+    return found
+
+
+@pytest.fixture
+def populated(database):
+    populate(20_000)
+    return database
+
+
+def test_history_queries_use_their_indexes(populated):
+    failures = {}
+
+    for name, statement, index in checks():
+        plan = explain(statement)
+        found = problems(plan, index)
+
+        if found:
+            failures[name] = found + plan
+
+    assert not failures
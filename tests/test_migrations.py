@@ -0,0 +1,80 @@
+"""
+Schema migrations: upgrade with data, downgrade back.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+from flask_migrate import downgrade, upgrade
+
+from app.services.rollup_service import RollupService
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+BEFORE_DEDUP = "3c9a1f5b2d47"
+
+
+def old_row(index, group=None, **extra):
+    return {
+        "principal": 100000 + (index % 50) * 1000,
+        "annual_interest_rate": 8.5,
+        "tenure_months": 240,
+        "emi": 867.82,
+        "total_interest": 108276.8,
+        "total_payment": 208276.8,
+        "currency": "USD",
+        "prepayment_used": False,
+        "prepayment_data": None,
+        "comparison_group_id": group,
+        "user_id": None,
+        "ip_address": "127.0.0.1",
+        "created_at": datetime(2026, 10, 1) + timedelta(minutes=index),
+        **extra,
+    }
+
+
+def count(database, table):
+    return database.session.execute(sa.text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def test_dedup_backfill_round_trip(empty_database):
+    database = empty_database
+    upgrade(MIGRATIONS, BEFORE_DEDUP)
+
+    # More rows than one backfill chunk; comparison groups interleaved
+    # so each one spans several chunks of ids
+    level = [old_row(index) for index in range(6000)]
+    groups = [
+        old_row(index, group=f"group-{index % 40:02d}", principal=200000 + index)
+        for index in range(6000, 6000 + 40 * 3)
+    ]
+
+    calculations = sa.table("calculations", *[sa.column(name) for name in level[0]])
+    database.session.execute(sa.insert(calculations), level + groups)
+    database.session.commit()
+
+    upgrade(MIGRATIONS, "8f2d6a4c1e93")
+
+    assert count(database, "calculations") == 6000
+    assert count(database, "loan_configurations") == 50
+    assert count(database, "loan_comparisons") == 40
+
+    loans = database.session.execute(sa.text(
+        "SELECT loans_data FROM loan_comparisons WHERE comparison_group_id = 'group-07'"
+    )).scalar()
+    loans = loans if isinstance(loans, list) else json.loads(loans)
+
+    assert [loan["principal"] for loan in loans] == [200000 + 6007, 200000 + 6047, 200000 + 6087]
+
+    # Rollup backfill counts every event once
+    upgrade(MIGRATIONS)
+    day = datetime(2026, 10, 1).date()
+    totals = RollupService.daily_totals(day, day + timedelta(days=5))
+
+    assert sum(row["calculations"] for row in totals) == 6000
+
+    downgrade(MIGRATIONS, BEFORE_DEDUP)
+
+    assert count(database, "calculations") == 6000 + 40 * 3
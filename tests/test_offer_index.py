@@ -0,0 +1,46 @@
+"""
+Offer index eligibility against a brute-force scan.
+"""
+
+import numpy as np
+
+from app.services.offer_index import OfferIndex
+
+
+def catalog(count, seed=7):
+    rng = np.random.default_rng(seed)
+    rows = []
+
+    for offer_id in range(1, count + 1):
+        low = float(rng.choice([10_000, 50_000, 100_000, 500_000]) * rng.integers(1, 5))
+        high = low * float(rng.choice([1, 2, 10]))
+        tenures = sorted(rng.integers(6, 361, size=2).tolist())
+        currency = ["USD", "INR", "EUR", None][offer_id % 4]
+
+        rows.append((offer_id, low, high, *tenures, 8.5, 1.0, 0.0, f"Lender {offer_id}", "Home", currency))
+
+    return rows
+
+
+def brute_force(rows, principal, tenure, currency):
+    return sorted(
+        row[0] for row in rows
+        if row[1] <= principal <= row[2] and row[3] <= tenure <= row[4] and (row[10] or "USD") == currency
+    )
+
+
+def test_eligible_matches_a_full_scan():
+    rows = catalog(2000)
+    index = OfferIndex(rows)
+
+    for principal in (10_000, 49_999.99, 100_000, 400_000, 2_000_000, 20_000_000, 1):
+        for tenure in (6, 120, 240, 360):
+            for currency in ("USD", "INR", "EUR", "JPY"):
+                positions = index.eligible(principal, tenure, currency)
+
+                assert np.all(np.diff(positions) > 0)
+                assert sorted(index.ids[positions].tolist()) == brute_force(rows, principal, tenure, currency)
+
+
+def test_empty_catalog():
+    assert OfferIndex([]).eligible(100_000, 120).size == 0
@@ -0,0 +1,83 @@
+"""
+Rollup counters, retention pruning and rebuild.
+"""
+
+from datetime import datetime, time, timedelta
+
+from app.models.calculation import Calculation
+from app.models.loan_configuration import LoanConfiguration
+from app.services.calculation_store import CalculationStore
+from app.services.rollup_service import RollupService
+
+
+def calculation_row(principal, created_at, **extra):
+    return {
+        "principal": principal,
+        "annual_interest_rate": 8.5,
+        "tenure_months": 240,
+        "currency": "USD",
+        "emi": 1.0,
+        "total_interest": 1.0,
+        "total_payment": 1.0,
+        "created_at": created_at,
+        **extra,
+    }
+
+
+def populate(days):
+    """
+    Rows every 6 hours over the last `days` days (today included).
+    """
+
+    today = datetime.utcnow().date()
+    rows = [
+        calculation_row(100_000 + day * 1000, datetime.combine(today - timedelta(days=day), time(hour)))
+        for day in range(days)
+        for hour in (0, 6, 12, 18)
+    ]
+    CalculationStore.save_calculations(rows)
+
+    return today - timedelta(days=days - 1), today
+
+
+def test_prune_then_rebuild_keeps_boundary_day_totals(database):
+    since, until = populate(10)
+    before = RollupService.daily_totals(since, until)
+
+    RollupService.prune(4)
+
+    # Whole days only: 4 pruned-to days + today, 4 rows each
+    assert database.session.query(Calculation).count() == 5 * 4
+
+    today = datetime.utcnow().date()
+    RollupService.rebuild(today - timedelta(days=4))
+    RollupService.rebuild(today - timedelta(days=30))
+
+    assert RollupService.daily_totals(since, until) == before
+
+
+def test_prune_deletes_orphaned_configurations(database):
+    populate(10)
+
+    RollupService.prune(4)
+
+    referenced = {row.configuration_id for row in database.session.query(Calculation)}
+    stored = {row.id for row in database.session.query(LoanConfiguration)}
+
+    assert stored == referenced
+
+
+def test_sampled_rows_are_weighted(database):
+    now = datetime.utcnow()
+    CalculationStore.save_calculations([
+        calculation_row(100_000, now, sample_weight=4.0) for _ in range(3)
+    ])
+
+    today = now.date()
+    totals = RollupService.daily_totals(today, today)
+
+    assert totals[0]["calculations"] == 12
+    assert totals[0]["principal_total"] == 1_200_000
+
+    RollupService.rebuild(today)
+    assert RollupService.daily_totals(today, today) == totals
@@ -0,0 +1,50 @@
+"""
+Stress test shards agree with FloatingRateService on a known rate path.
+"""
+
+import math
+
+import pytest
+
+from app.services.floating_rate_service import FloatingRateService
+from app.services.stress_test_service import StressTestService
+
+
+def deterministic_path(annual_rate, theta, kappa, reset_every, maturity):
+    """
+    The sigma = 0 rate path: each reset decays toward theta.
+    """
+
+    decay = math.exp(-kappa * reset_every / 12)
+    path, rate = [], annual_rate
+
+    for month in range(reset_every, maturity, reset_every):
+        rate = theta + (rate - theta) * decay + 0.0
+        path.append([month, rate])
+
+    return path
+
+
+@pytest.mark.parametrize("recompute", ["emi", "tenure"])
+def test_zero_volatility_matches_floating_rate_service(app, recompute):
+    loan = {"principal": 1_000_000, "annual_rate": 8.5, "tenure_months": 240}
+    model = {"theta": 12.0, "kappa": 0.7, "sigma": 0.0, "reset_every": 12}
+    maturity = 360 if recompute == "tenure" else 240
+
+    result = StressTestService.run(
+        **loan, paths=4, recompute=recompute, seed=1, max_tenure_months=maturity, **model
+    )
+    expected, _ = FloatingRateService.simulate(
+        **loan, recompute=recompute, max_tenure_months=maturity,
+        rate_path=deterministic_path(8.5, model["theta"], model["kappa"], 12, maturity)
+    )
+
+    peak = max(segment["emi"] for segment in expected["segments"])
+
+    assert result["peak_emi"]["p50"] == result["peak_emi"]["p99"] == peak
+    assert result["total_interest"]["p50"] == result["total_interest"]["p5"] == expected["total_interest"]
+    assert result["tenure_change_months"]["p50"] == expected["tenure_change"]
+
+    if recompute == "emi":
+        # The EMI peaks a cent above where it ends (rounding up at each reset)
+        assert (peak, expected["final_emi"], expected["total_interest"]) == (10854.58, 10854.57, 1554311.42)
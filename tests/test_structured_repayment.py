@@ -0,0 +1,108 @@
+"""
+Structured repayment: phase payments, totals and the recorded EMI.
+"""
+
+import json
+
+import pytest
+
+from app.core.money import get_quantizer
+from app.services.structured_repayment import StructuredRepayment
+
+PRINCIPAL, RATE, TENURE = 1_000_000, 8.5, 240
+
+MONTHLY_INTEREST = PRINCIPAL * RATE / 1200
+
+
+def calculate(structure):
+    return StructuredRepayment.calculate(PRINCIPAL, RATE, TENURE, structure)
+
+
+def test_bullet_pays_interest_only_until_maturity(app):
+    calculation, schedule = calculate({"type": "bullet"})
+    rows = schedule.to_list()
+
+    assert calculation["emi"] == get_quantizer().round(MONTHLY_INTEREST)
+    assert all(row["emi"] == calculation["emi"] for row in rows[:-1])
+
+    # Half-up rounding: the sub-cent shortfall compounds to about 2
+    # over 20 years, instead of repaying principal every month
+    assert all(abs(row["remaining_balance"] - PRINCIPAL) < 3 for row in rows[:-1])
+    assert calculation["total_interest"] == pytest.approx(MONTHLY_INTEREST * TENURE, abs=2)
+
+
+def test_interest_only_then_amortizes(app):
+    calculation, schedule = calculate({"type": "interest_only", "months": 24})
+
+    assert calculation["payments"][0]["emi"] == get_quantizer().round(MONTHLY_INTEREST)
+    assert calculation["payments"][1]["from_month"] == 25
+    assert schedule[-1]["remaining_balance"] == 0
+    assert schedule[-1]["emi"] <= calculation["payments"][1]["emi"]
+
+
+def test_moratorium_reports_emi_after_it(app):
+    calculation, schedule = calculate({"type": "moratorium", "months": 6})
+
+    assert calculation["moratorium_months"] == 6
+    assert calculation["emi"] == calculation["payments"][1]["emi"] > 0
+    assert all(row["emi"] == 0 for row in schedule[:6])
+
+
+@pytest.mark.parametrize("structure", [
+    {"type": "step_up", "step_percent": 5, "step_every": 12},
+    {"type": "step_down", "step_percent": 5, "step_every": 12},
+    {"type": "balloon", "balloon_percent": 20},
+])
+def test_amortizing_structures_close_within_one_payment(app, structure):
+    calculation, schedule = calculate(structure)
+    rows = schedule.to_list()
+    last_payment = calculation["payments"][-1]["emi"] + calculation["balloon"]
+
+    assert rows[-1]["remaining_balance"] == 0
+    assert rows[-1]["emi"] <= last_payment + 0.005
+    assert calculation["total_payment"] == pytest.approx(sum(row["emi"] for row in rows), abs=0.005)
+
+
+def test_step_down_to_zero_is_rejected(app):
+    with pytest.raises(ValueError):
+        calculate({"type": "step_down", "step_percent": 99, "step_every": 1})
+
+
+def test_moratorium_emi_is_recorded(database, client):
+    response = client.post("/api/calculate-emi", json={
+        "principal": PRINCIPAL, "rate": RATE, "tenure": TENURE,
+        "structure": {"type": "moratorium", "months": 6},
+    })
+    emi = response.get_json()["calculation"]["emi"]
+
+    history = client.get("/api/history").get_json()["results"]
+
+    assert emi > 0
+    assert [row["emi"] for row in history] == [emi]
+
+
+@pytest.mark.parametrize("structure", [
+    {"type": "step_up", "step_percent": 5, "step_every": 12},
+    {"type": "balloon", "balloon_percent": 20},
+    {"type": "bullet"},
+    {"type": "interest_only", "months": 24},
+    {"type": "moratorium", "months": 6},
+])
+def test_paged_schedule_matches_the_full_one(app, structure):
+    _, schedule = calculate(structure)
+    pages = list(StructuredRepayment.pages(PRINCIPAL, RATE, TENURE, structure, 7))
+
+    assert all(len(page) <= 7 for page in pages)
+    assert [row for page in pages for row in page.to_list()] == schedule.to_list()
+
+
+def test_stream_sends_the_structured_schedule(app, client, monkeypatch):
+    structure = {"type": "step_up", "step_percent": 5, "step_every": 12}
+    monkeypatch.setitem(app.config, "STREAM_PAGE_MONTHS", 50)
+
+    response = client.post("/api/calculate-emi/stream", json={
+        "principal": PRINCIPAL, "rate": RATE, "tenure": TENURE, "structure": structure
+    })
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert rows == calculate(structure)[1].to_list()
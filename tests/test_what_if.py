@@ -0,0 +1,63 @@
+"""
+What-if sessions: open, incremental updates resumed from a
+checkpoint, close; and the shared-cache requirement in production.
+"""
+
+import pytest
+from flask import Flask
+
+from app.core.caching import check_session_backend
+from config import ProductionConfig
+
+LOAN = {"principal": 1_000_000, "rate": 8.5, "tenure": 240}
+
+
+def lump_sum(month, amount):
+    return {"month": month, "type": "lump_sum", "amount": amount}
+
+
+def open_session(client, events):
+    response = client.post("/api/what-if", json=dict(LOAN, events=events))
+    assert response.status_code == 201
+    return response.get_json()
+
+
+def test_create_update_close(client):
+    opened = open_session(client, [lump_sum(24, 100_000)])
+    session_id = opened["session_id"]
+
+    # Only month 60 changes: planning resumes from its checkpoint
+    events = [lump_sum(24, 100_000), lump_sum(60, 50_000)]
+    updated = client.patch(f"/api/what-if/{session_id}", json={"events": events}).get_json()
+
+    assert updated["from_month"] == 60
+    assert updated["rows"][0]["month"] == 60
+
+    # Same rows and result as planning the new events from month 1
+    rebuilt = open_session(client, events)
+
+    assert updated["result"] == rebuilt["result"]
+    assert updated["rows"] == rebuilt["rows"][59:]
+    assert updated["last_month"] == rebuilt["rows"][-1]["month"]
+
+    # Unchanged events: nothing to resend
+    unchanged = client.patch(f"/api/what-if/{session_id}", json={"events": events}).get_json()
+    assert unchanged["rows"] == []
+
+    assert client.delete(f"/api/what-if/{session_id}").status_code == 200
+    assert client.patch(f"/api/what-if/{session_id}", json={"events": []}).status_code == 404
+
+
+def production_app(**overrides):
+    app = Flask(__name__)
+    app.config.from_object(ProductionConfig)
+    app.config.update(overrides)
+    return app
+
+
+def test_production_refuses_per_process_session_cache():
+    with pytest.raises(RuntimeError):
+        check_session_backend(production_app(CACHE_TYPE="SimpleCache"))
+
+    check_session_backend(production_app(CACHE_TYPE="RedisCache"))
+    check_session_backend(production_app(CACHE_TYPE="SimpleCache", ENABLE_WHAT_IF_SESSIONS=False))
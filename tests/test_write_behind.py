@@ -0,0 +1,145 @@
+"""
+Write-behind recorder: sampling, batching, back-pressure and shutdown.
+"""
+
+import atexit
+import os
+import queue
+
+import pytest
+
+from app.core.write_behind import WriteBehindRecorder, comparison_recorder
+from app.models.loan_comparison import LoanComparison
+
+LOAN = {"principal": 1_000_000, "rate": 8.5, "tenure": 240}
+
+
+@pytest.fixture
+def settings(app):
+    """
+    Recorder settings on the shared app, restored afterwards.
+    """
+
+    keys = ("WRITE_BEHIND_ENABLED", "CALCULATION_SAMPLE_RATE", "WRITE_BEHIND_BATCH_SIZE",
+            "WRITE_BEHIND_FLUSH_SECONDS", "WRITE_BEHIND_QUEUE_SIZE")
+    saved = {key: app.config.get(key) for key in keys}
+
+    yield app.config
+
+    app.config.update(saved)
+
+
+def recorder(app, writer, sampled=True):
+    instance = WriteBehindRecorder("test", sampled=sampled)
+    instance.init_app(app, writer)
+    return instance
+
+
+def test_shutdown_is_registered_once(app, monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+
+    instance = WriteBehindRecorder("test")
+
+    for _ in range(3):
+        instance.init_app(app, list)
+
+    assert registered == [instance.shutdown]
+
+
+def test_sampled_rows_carry_their_weight(app, settings, monkeypatch):
+    written = []
+    settings["CALCULATION_SAMPLE_RATE"] = 0.25
+
+    instance = recorder(app, written.extend)
+
+    monkeypatch.setattr("random.random", lambda: 0.5)
+    assert instance.record([{"id": 1}, {"id": 2}]) == 0
+
+    monkeypatch.setattr("random.random", lambda: 0.1)
+    assert instance.record([{"id": 3}]) == 1
+
+    assert [(row["id"], row["sample_weight"]) for row in written] == [(3, 4.0)]
+    assert instance.stats()["sampled_out"] == 2
+
+
+def test_unsampled_recorder_keeps_every_row(app, settings):
+    written = []
+    settings["CALCULATION_SAMPLE_RATE"] = 0.0
+
+    instance = recorder(app, written.extend, sampled=False)
+
+    assert instance.record([{"id": 1}]) == 1
+    assert written[0]["sample_weight"] == 1.0
+
+
+def test_returned_comparison_group_is_stored_whatever_the_sample_rate(database, client, settings):
+    settings["CALCULATION_SAMPLE_RATE"] = 0.0
+    comparison_recorder.init_app(client.application, comparison_recorder.writer)
+
+    try:
+        for _ in range(5):
+            response = client.post("/api/compare-loans", json={"loans": [LOAN, dict(LOAN, rate=8.2)]})
+            group_id = response.get_json()["comparison_group_id"]
+
+            assert database.session.query(LoanComparison).filter_by(comparison_group_id=group_id).count() == 1
+    finally:
+        settings["CALCULATION_SAMPLE_RATE"] = 1.0
+        comparison_recorder.init_app(client.application, comparison_recorder.writer)
+
+
+def test_background_batches_drain_on_shutdown(app, settings):
+    batches = []
+    settings.update(WRITE_BEHIND_ENABLED=True, WRITE_BEHIND_BATCH_SIZE=2, WRITE_BEHIND_FLUSH_SECONDS=0.05)
+
+    instance = recorder(app, batches.append)
+
+    for number in range(5):
+        instance.record([{"id": number}])
+
+    instance.shutdown()
+
+    assert sorted(row["id"] for batch in batches for row in batch) == list(range(5))
+    assert max(len(batch) for batch in batches) <= 2
+    assert instance.stats()["flushed"] == 5
+
+
+def test_full_queue_writes_in_the_request(app, settings):
+    written = []
+    settings.update(WRITE_BEHIND_ENABLED=True, WRITE_BEHIND_QUEUE_SIZE=1, WRITE_BEHIND_FLUSH_SECONDS=5)
+
+    instance = recorder(app, written.extend)
+
+    # No worker: the queue only empties at shutdown
+    instance._queue, instance._pid = queue.Queue(maxsize=1), os.getpid()
+    instance._ensure_worker = lambda: None
+
+    assert instance.record([{"id": 1}, {"id": 2}, {"id": 3}]) == 3
+
+    assert [row["id"] for row in written] == [2, 3]
+    assert instance.stats()["overflow"] == 2
+
+    instance.shutdown()
+    assert [row["id"] for row in written] == [2, 3, 1]
+
+
+def test_failed_batch_is_counted_and_later_rows_still_flush(app, settings):
+    written = []
+    settings.update(WRITE_BEHIND_ENABLED=True, WRITE_BEHIND_FLUSH_SECONDS=0.05)
+
+    def writer(rows):
+        if any(row["id"] == "bad" for row in rows):
+            raise RuntimeError("boom")
+        written.extend(rows)
+
+    instance = recorder(app, writer)
+
+    instance.record([{"id": "bad"}])
+    instance.flush()
+    instance.record([{"id": 1}])
+    instance.shutdown()
+
+    stats = instance.stats()
+
+    assert stats["failed"] == 1
+    assert [row["id"] for row in written] == [1]
@@ -7,6 +7,8 @@ from app import create_app
 load_dotenv()
 
 # Create app instance
+# (with gunicorn.conf.py preload_app, this runs once in the master
+#  before workers fork, so startup tables are shared copy-on-write)
 app = create_app()
 
 # Optional: Attach Gunicorn logging in production